@@ -0,0 +1,76 @@
+"""
+Measures answer evaluation latency against the number of questions.
+
+The model is simulated: a call takes a fixed round trip plus a delay per
+evaluated answer, since latency grows with the length of the output. Each
+question count is evaluated once in a single call and once chunked.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.answer_evaluation --chunk-size 4
+"""
+import json
+import asyncio
+import argparse
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from app.services import interview_service
+
+
+def make_answers(count: int) -> list:
+    return [
+        SimpleNamespace(
+            question_id=i,
+            user_answer="I would profile first, then fix the slowest query.",
+            question=SimpleNamespace(content=f"Question {i}?", max_score=10.0, type="TECHNICAL"),
+            score=None,
+            feedback=None,
+        )
+        for i in range(count)
+    ]
+
+
+def make_fake_model(round_trip: float, per_answer: float):
+    async def fake_run_agent(agent, query, user_id, **kwargs):
+        transcript = json.loads(query)
+        await asyncio.sleep(round_trip + per_answer * len(transcript))
+        return json.dumps({
+            "answers": [
+                {"question_id": item["question_id"], "score": 7.0, "feedback": "Good."}
+                for item in transcript
+            ]
+        })
+    return fake_run_agent
+
+
+async def time_evaluation(count: int, chunk_size: int) -> float:
+    settings = SimpleNamespace(EVALUATION_CHUNK_SIZE=chunk_size, EVALUATION_CHUNK_RETRIES=0)
+    answers = make_answers(count)
+    with mock.patch.object(interview_service, "get_settings", return_value=settings):
+        started = time.perf_counter()
+        await interview_service.evaluate_answers(db=mock.Mock(), user_id=0, db_answers=answers)
+        elapsed = time.perf_counter() - started
+    assert all(answer.score is not None for answer in answers)
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=4)
+    parser.add_argument("--round-trip", type=float, default=0.8, help="Seconds per model call")
+    parser.add_argument("--per-answer", type=float, default=0.35, help="Seconds per evaluated answer")
+    args = parser.parse_args()
+
+    fake_model = make_fake_model(args.round_trip, args.per_answer)
+    print(f"{'questions':>9} {'single call (s)':>16} {'chunked (s)':>12}")
+    with mock.patch.object(interview_service, "run_agent", fake_model):
+        for count in (3, 5, 8, 10, 12, 15):
+            single = await time_evaluation(count, chunk_size=count)
+            chunked = await time_evaluation(count, chunk_size=args.chunk_size)
+            print(f"{count:>9} {single:>16.2f} {chunked:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
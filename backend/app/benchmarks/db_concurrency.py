@@ -0,0 +1,199 @@
+"""
+Latency of the interactive interview calls under mixed read/write load, sync vs async engine.
+
+Requests arrive at a steady `--rate` per second, each fetching the next
+question of a random interview (read) or also submitting an answer to it
+(write), on a throwaway SQLite database. They go through
+`AsyncInterviewService` on the async engine, the way the routes call it, or
+make the same queries and insert on the sync engine. Meanwhile a separate connection keeps running a slow write
+transaction, holding the write lock for `--slow-write-ms` at a time.
+
+A sync call that waits for that lock blocks the event loop, so every other
+request waits too; an async call waits off the loop and only delays itself.
+Latencies are measured from when each request was due, so the time spent
+queued behind a blocked event loop is included. The event loop lag (how
+late a 10 ms timer fires) shows the blocking directly.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.db_concurrency --rate 200 --seconds 10
+"""
+import os
+import math
+import time
+import random
+import sqlite3
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import defaultdict
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--rate", type=float, default=200, help="Requests per second")
+parser.add_argument("--interviews", type=int, default=50)
+parser.add_argument("--seconds", type=float, default=10, help="Duration of each run")
+parser.add_argument("--write-share", type=float, default=0.3, help="Share of the calls that submit an answer")
+parser.add_argument("--slow-write-ms", type=float, default=200, help="How long each slow write holds the lock")
+parser.add_argument("--slow-write-every-ms", type=float, default=1000)
+parser.add_argument("--engine", default="both", choices=["sync", "async", "both"])
+args = parser.parse_args()
+
+# The settings are read at import time, so configure them before importing the app
+_db_dir = tempfile.mkdtemp(prefix="entervu_db_bench_")
+_db_path = f"{_db_dir}/db_concurrency.db"
+os.environ.update({
+    "AGENT_BACKEND": "fake",
+    "DATABASE_URL": f"sqlite+pysqlite:///{_db_path}",
+    "AGENT_CACHE_DB_PATH": "",
+})
+for name, value in {"APP_NAME": "db-benchmark", "APP_VERSION": "0", "FILE_MAX_SIZE": "10",
+                    "FILE_ALLOWED_TYPES": '["application/pdf"]', "MAX_PAGES": "5"}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.models.db_schemes import User, Cv, Interview, Question  # noqa: E402
+from app.models.enums.InterviewEnums import InterviewMode  # noqa: E402
+from app.models.enums.QuestionEnums import QuestionType  # noqa: E402
+from app.schemes.answers_schemes import AnswerCreate  # noqa: E402
+from app.services import question_service, answer_service  # noqa: E402
+from app.services.async_interview_service import AsyncInterviewService  # noqa: E402
+
+
+def seed(interviews: int, questions_per_interview: int) -> list:
+    """Creates the interviews and their questions, returns the interview ids."""
+    session = db.SessionLocal()
+    try:
+        interview_ids = []
+        for i in range(interviews):
+            user = User(email=f"bench_{i}_{time.time_ns()}@example.com", name=f"User {i}")
+            session.add(user)
+            session.flush()
+            cv = Cv(user_id=user.id, raw_text="{}", file_path="", file_name="cv")
+            session.add(cv)
+            session.flush()
+            interview = Interview(user_id=user.id, cv_id=cv.id, job_title="Backend Engineer", mode=InterviewMode.HARD)
+            session.add(interview)
+            session.flush()
+            session.add_all([
+                Question(interview_id=interview.id, content=f"Question {order}", order=order,
+                         type=QuestionType.TECHNICAL, max_score=10)
+                for order in range(1, questions_per_interview + 1)
+            ])
+            interview_ids.append(interview.id)
+        session.commit()
+        return interview_ids
+    finally:
+        session.close()
+
+
+def slow_writer(stop: threading.Event):
+    connection = sqlite3.connect(_db_path, timeout=30, isolation_level=None)
+    try:
+        while not stop.wait(args.slow_write_every_ms / 1000):
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("UPDATE users SET name = name WHERE id = 1")
+            time.sleep(args.slow_write_ms / 1000)
+            connection.execute("COMMIT")
+    finally:
+        connection.close()
+
+
+async def sync_call(interview_id: int, write: bool):
+    session = db.SessionLocal()
+    try:
+        question = question_service.get_next_unanswered_question(db=session, interview_id=interview_id)
+        if write and question is not None:
+            answer_service.create_answer(
+                db=session, question_id=question.id, user_answer="I would measure first.", score=None, feedback=None
+            )
+            session.commit()
+    finally:
+        session.close()
+
+
+async def async_call(interview_id: int, write: bool):
+    async with db.AsyncSessionLocal() as session:
+        service = AsyncInterviewService(session)
+        response = await service.get_next_question(interview_id)
+        if write and "question" in response:
+            await service.submit_answer(interview_id, AnswerCreate(
+                question_id=response["question"].id, user_answer="I would measure first."
+            ))
+
+
+async def request(call, interview_id: int, write: bool, due: float, latencies: dict):
+    try:
+        await call(interview_id, write)
+    except (HTTPException, IntegrityError):
+        # A concurrent request answered the same question first, which still counts as served
+        pass
+    latencies["write" if write else "read"].append(time.perf_counter() - due)
+
+
+async def arrivals(call, interview_ids: list, deadline: float, latencies: dict):
+    """Starts each request when it is due, whether or not the earlier ones are done."""
+    rng = random.Random(0)
+    started = time.perf_counter()
+    tasks = []
+    for i in range(int(args.rate * args.seconds)):
+        due = started + i / args.rate
+        await asyncio.sleep(max(due - time.perf_counter(), 0))
+        write = rng.random() < args.write_share
+        tasks.append(asyncio.create_task(request(call, rng.choice(interview_ids), write, due, latencies)))
+    await asyncio.gather(*tasks)
+
+
+async def loop_lag(deadline: float, lags: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - started - 0.01)
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+async def run(name: str, call, interview_ids: list):
+    latencies, lags = defaultdict(list), []
+    stop = threading.Event()
+    writer = threading.Thread(target=slow_writer, args=(stop,), daemon=True)
+    writer.start()
+
+    deadline = time.perf_counter() + args.seconds
+    await asyncio.gather(loop_lag(deadline, lags), arrivals(call, interview_ids, deadline, latencies))
+    stop.set()
+    writer.join()
+
+    print(f"{name}:")
+    for kind in ("read", "write"):
+        values = latencies[kind]
+        print(
+            f"  {kind:<6} {len(values):>6} calls  p50 {percentile(values, 0.50) * 1000:>7.1f} ms  "
+            f"p95 {percentile(values, 0.95) * 1000:>7.1f} ms  p99 {percentile(values, 0.99) * 1000:>7.1f} ms"
+        )
+    print(f"  event loop lag  p99 {percentile(lags, 0.99) * 1000:.1f} ms  max {max(lags, default=0) * 1000:.1f} ms")
+
+
+async def main():
+    db.Base.metadata.create_all(bind=db.engine)
+    # Enough questions that no interview runs out of unanswered ones in either run
+    writes_per_interview = args.rate * args.seconds * args.write_share / args.interviews
+    interview_ids = seed(args.interviews, questions_per_interview=math.ceil(writes_per_interview * 4) + 10)
+    print(f"{args.rate:.0f} requests/s over {args.interviews} interviews, {args.write_share:.0%} writes, "
+          f"a {args.slow_write_ms:.0f} ms write every {args.slow_write_every_ms:.0f} ms")
+
+    if args.engine in ("sync", "both"):
+        await run("sync engine", sync_call, interview_ids)
+    if args.engine in ("async", "both"):
+        await run("async engine", async_call, interview_ids)
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
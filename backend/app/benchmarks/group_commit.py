@@ -0,0 +1,130 @@
+"""
+Answer write throughput with a commit per request vs group commit, as concurrency grows.
+
+At each concurrency level, that many clients keep saving answers for
+`--seconds` against a throwaway SQLite database. Per-request commits open a
+session and commit on a worker thread, so they queue for SQLite's write lock;
+group commit sends the same writes through `write_coordinator`, which commits
+whatever is queued together.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.group_commit --concurrency 1 8 32 128 --synchronous FULL
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+parser.add_argument("--seconds", type=float, default=5, help="Duration of each run")
+parser.add_argument("--synchronous", default="NORMAL", help="SQLite synchronous pragma, FULL syncs every commit")
+args = parser.parse_args()
+
+# The settings are read at import time, so configure them before importing the app
+_db_dir = tempfile.mkdtemp(prefix="entervu_group_commit_")
+os.environ.update({
+    "DATABASE_URL": f"sqlite+pysqlite:///{_db_dir}/group_commit.db",
+    "SQLITE_SYNCHRONOUS": args.synchronous,
+    "AGENT_CACHE_DB_PATH": "",
+})
+for name, value in {"APP_NAME": "group-commit-benchmark", "APP_VERSION": "0", "FILE_MAX_SIZE": "10",
+                    "FILE_ALLOWED_TYPES": '["application/pdf"]', "MAX_PAGES": "5"}.items():
+    os.environ.setdefault(name, value)
+
+from app.core import db  # noqa: E402
+from app.models.db_schemes import User, Cv, Interview, Question  # noqa: E402
+from app.models.enums.InterviewEnums import InterviewMode  # noqa: E402
+from app.models.enums.QuestionEnums import QuestionType  # noqa: E402
+from app.services import answer_service  # noqa: E402
+from app.services.write_service import write_coordinator  # noqa: E402
+
+QUESTIONS = 1000
+
+
+def seed() -> list:
+    session = db.SessionLocal()
+    try:
+        user = User(email="bench@example.com", name="Bench")
+        session.add(user)
+        session.flush()
+        cv = Cv(user_id=user.id, raw_text="{}", file_path="", file_name="cv")
+        session.add(cv)
+        session.flush()
+        interview = Interview(user_id=user.id, cv_id=cv.id, job_title="Backend Engineer", mode=InterviewMode.HARD)
+        session.add(interview)
+        session.flush()
+        questions = [
+            Question(interview_id=interview.id, content=f"Question {order}", order=order,
+                     type=QuestionType.TECHNICAL, max_score=10)
+            for order in range(1, QUESTIONS + 1)
+        ]
+        session.add_all(questions)
+        session.commit()
+        return [question.id for question in questions]
+    finally:
+        session.close()
+
+
+def save_answer(session, question_id: int):
+    return answer_service.create_answer(session, question_id, "I would measure first.", None, None)
+
+
+def commit_on_its_own(question_id: int):
+    session = db.SessionLocal()
+    try:
+        save_answer(session, question_id)
+        session.commit()
+    finally:
+        session.close()
+
+
+async def per_request_commit(question_id: int):
+    await asyncio.to_thread(commit_on_its_own, question_id)
+
+
+async def group_commit(question_id: int):
+    await write_coordinator.run(lambda session: save_answer(session, question_id))
+
+
+async def client(write, question_ids: list, deadline: float, latencies: list, rng: random.Random):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await write(rng.choice(question_ids))
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(write, concurrency: int, question_ids: list) -> tuple:
+    latencies = []
+    rng = random.Random(concurrency)
+    deadline = time.perf_counter() + args.seconds
+    await asyncio.gather(*[client(write, question_ids, deadline, latencies, rng) for _ in range(concurrency)])
+    latencies.sort()
+    return len(latencies) / args.seconds, latencies[min(int(0.99 * len(latencies)), len(latencies) - 1)]
+
+
+async def main():
+    db.Base.metadata.create_all(bind=db.engine)
+    with db.engine.begin() as connection:
+        # The same questions are answered over and over, which the unique index would refuse
+        connection.exec_driver_sql("DROP INDEX ix_answers_question_id")
+        connection.exec_driver_sql("CREATE INDEX ix_answers_question_id ON answers (question_id)")
+    question_ids = seed()
+    print(f"synchronous={args.synchronous}, {args.seconds:.0f} s per run")
+    print(f"{'clients':>8} {'per-request writes/s':>21} {'p99 (ms)':>9} {'group commit writes/s':>22} {'p99 (ms)':>9}")
+    for concurrency in args.concurrency:
+        own_rate, own_p99 = await run(per_request_commit, concurrency, question_ids)
+        group_rate, group_p99 = await run(group_commit, concurrency, question_ids)
+        print(f"{concurrency:>8} {own_rate:>21.0f} {own_p99 * 1000:>9.1f} {group_rate:>22.0f} {group_p99 * 1000:>9.1f}")
+
+    writes = write_coordinator.stats()
+    print(f"group commit: {writes['writes']} writes in {writes['commits']} commits, "
+          f"avg batch {writes['avg_batch_size']:.1f}, largest {writes['largest_batch']}")
+    await write_coordinator.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+"""
+Offline load test of the whole FastAPI app on the fake model backend.
+
+Each virtual user creates an account, starts an interview, answers every
+question and finishes it, all in-process through httpx and a throwaway
+SQLite database. No network access or API key is needed. The model latency
+and error rate come from the FAKE_BACKEND_* settings, every other setting
+(scheduler limits, caches...) from the environment as usual.
+
+With `--backend record` the run calls Gemini and saves every agent call to
+`--cassette`; `--backend replay` then runs the same scenario from that
+cassette without network, at zero latency unless `--replay-latency` is given,
+so the timings cover only the code around the model. Question ids end up in
+the evaluation prompts, so replay with the same `--users` as the recording;
+a single user replays exactly.
+
+httpx's ASGI transport returns once the background tasks of a request are
+done, so `submit_answer` timings include the answer's evaluation.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.interview_load --users 50 --latency-ms 800
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from collections import defaultdict
+
+import httpx
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--mode", default="medium", choices=["easy", "medium", "hard"])
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--distribution", default="lognormal", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of fenced or truncated responses")
+    parser.add_argument("--backend", default="fake", choices=["fake", "record", "replay"])
+    parser.add_argument("--cassette", default="./cassettes/load_test.jsonl")
+    parser.add_argument("--replay-latency", action="store_true", help="Sleep for the recorded model latency")
+    return parser.parse_args()
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """The settings are read at import time, so this runs before anything imports the app."""
+    db_dir = tempfile.mkdtemp(prefix="entervu_load_")
+    os.environ.update({
+        "AGENT_BACKEND": args.backend,
+        "AGENT_CASSETTE_PATH": args.cassette,
+        "AGENT_REPLAY_LATENCY": str(args.replay_latency).lower(),
+        "FAKE_BACKEND_LATENCY_MS": str(args.latency_ms),
+        "FAKE_BACKEND_LATENCY_DISTRIBUTION": args.distribution,
+        "FAKE_BACKEND_ERROR_RATE": str(args.error_rate),
+        "FAKE_BACKEND_MALFORMED_RATE": str(args.malformed_rate),
+        "DATABASE_URL": f"sqlite+pysqlite:///{db_dir}/interview_load.db",
+        "AGENT_CACHE_DB_PATH": "",
+    })
+    for name, value in {"APP_NAME": "load-test", "APP_VERSION": "0", "FILE_MAX_SIZE": "10",
+                        "FILE_ALLOWED_TYPES": '["application/pdf"]', "MAX_PAGES": "5"}.items():
+        os.environ.setdefault(name, value)
+
+
+class NullEmailService:
+    """Skips the Gmail OAuth flow and drops the emails."""
+
+    def send_email(self, user_email: str, subject: str, body: str):
+        return True
+
+
+def create_cv(user_id: int) -> int:
+    from app.core import db
+    from app.models.db_schemes import Cv
+
+    # Uploading needs a real PDF, the parsed CV is all the interview uses
+    session = db.SessionLocal()
+    try:
+        cv = Cv(user_id=user_id, raw_text='{"skills": ["python", "sql"]}', file_path="", file_name="cv")
+        session.add(cv)
+        session.commit()
+        return cv.id
+    finally:
+        session.close()
+
+
+async def timed(latencies: dict, name: str, request):
+    started = time.perf_counter()
+    response = await request
+    latencies[name].append(time.perf_counter() - started)
+    response.raise_for_status()
+    return response.json()
+
+
+async def virtual_user(client: httpx.AsyncClient, index: int, mode: str, latencies: dict):
+    user = await timed(latencies, "create_user", client.post(
+        "/api/v2/users/", json={"email": f"load_{index}_{time.time_ns()}@example.com", "name": f"User {index}"}
+    ))
+    cv_id = await asyncio.to_thread(create_cv, user["id"])
+
+    interview = await timed(latencies, "start_interview", client.post("/api/v2/interviews/start", json={
+        "user_id": user["id"],
+        "cv_id": cv_id,
+        "job_title": "Backend Engineer",
+        "job_description": "Build and operate Python APIs.",
+        "skills_to_foucs": ["python", "sql"],
+        "mode": mode,
+    }))
+
+    while True:
+        next_question = await timed(
+            latencies, "next_question", client.get(f"/api/v2/interviews/{interview['id']}/next-question")
+        )
+        if "question" not in next_question:
+            break
+        await timed(latencies, "submit_answer", client.post(
+            f"/api/v2/interviews/{interview['id']}/answer",
+            json={"question_id": next_question["question"]["id"], "user_answer": "I would measure first."}
+        ))
+
+    await timed(latencies, "finish_interview", client.post(f"/api/v2/interviews/{interview['id']}/finish"))
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.main import app
+    from app.core import db
+    from app.services import EmailService
+    from app.integrations.google_adk.client import agent_stats
+    from app.services.interview_service import question_generation_stats
+    from app.services.question_bank_service import question_bank
+    from app.services.write_service import write_coordinator
+
+    db.Base.metadata.create_all(bind=db.engine)
+    app.dependency_overrides[EmailService] = NullEmailService
+
+    latencies = defaultdict(list)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[virtual_user(client, i, args.mode, latencies) for i in range(args.users)], return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+    await db.async_engine.dispose()
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    print(f"users: {args.users}  failed: {len(failures)}  wall time: {elapsed:.2f}s")
+    print(f"{'endpoint':<18} {'count':>6} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} {'mean (s)':>9}")
+    for name, values in latencies.items():
+        print(
+            f"{name:<18} {len(values):>6} {percentile(values, 0.50):>8.3f} {percentile(values, 0.95):>8.3f} "
+            f"{percentile(values, 0.99):>8.3f} {statistics.mean(values):>9.3f}"
+        )
+    if failures:
+        print(f"first failure: {failures[0]!r}")
+
+    stats = agent_stats()
+    print(f"model calls: {stats['backend']['calls']}  errors: {stats['backend']['errors']}")
+    print(f"coalesced: {stats['single_flight']['coalesced']}  scheduler wait: {stats['scheduler']['wait']}")
+    for agent_name, parsing in stats["output_parsing"].items():
+        print(
+            f"{agent_name} outputs: clean {parsing['clean']}  repaired {parsing['repaired']}  "
+            f"salvaged {parsing['salvaged']}  failed {parsing['failed']}  re-calls {parsing['recalls']}"
+        )
+    generation = question_generation_stats()
+    print(
+        f"time to first question: avg {generation['avg_time_to_first_question_seconds']:.3f}s "
+        f"max {generation['max_time_to_first_question_seconds']:.3f}s  "
+        f"all questions: avg {generation['avg_time_to_all_questions_seconds']:.3f}s  streamed: {generation['streamed']}"
+    )
+    bank = question_bank.stats()
+    if bank["lookups"]:
+        print(f"question bank: {bank['questions']} questions  served {bank['served']}/{bank['requested']} "
+              f"({bank['fill_rate']:.0%})")
+    writes = write_coordinator.stats()
+    print(f"group commit: {writes['writes']} writes in {writes['commits']} commits  "
+          f"avg batch {writes['avg_batch_size']:.2f}  largest {writes['largest_batch']}  "
+          f"avg commit {writes['avg_commit_ms']:.1f} ms")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments)
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,107 @@
+"""
+Prompt-size regression benchmark for the evaluation and report transcripts.
+
+Encodes a synthetic interview with the shared transcript encoder and
+compares it with the pretty-printed JSON of the same fields. Exits with a
+non-zero status when a transcript grows past its budget, so it can guard
+prompt size in CI.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.prompt_size --questions 15
+"""
+import sys
+import json
+import argparse
+from types import SimpleNamespace
+
+from app.services.transcript_service import encode_evaluation_transcript, encode_report_transcript
+
+# Characters per question, the encoded transcripts must stay under these
+EVALUATION_BUDGET_PER_QUESTION = 450
+REPORT_BUDGET_PER_QUESTION = 550
+
+ANSWER_TEXT = (
+    "In my last project I profiled the API with py-spy, found that most of the time\n"
+    "was spent serializing ORM objects, and replaced the lazy relationships with\n"
+    "selectinload. P99 latency went from 1.2s to 180ms.    "
+)
+FEEDBACK_TEXT = "Clear, structured answer with a concrete, measured result. Mention trade-offs next time."
+
+
+def make_interview(question_count: int) -> list:
+    questions = []
+    for i in range(question_count):
+        question = SimpleNamespace(
+            id=i + 1,
+            order=i + 1,
+            content=f"Tell me about a time you had to improve the performance of a service ({i}).",
+            max_score=10.0,
+            type="TECHNICAL",
+        )
+        question.answer = SimpleNamespace(
+            question_id=question.id,
+            question=question,
+            user_answer=ANSWER_TEXT,
+            score=7.5,
+            feedback=FEEDBACK_TEXT,
+        )
+        questions.append(question)
+    return questions
+
+
+def naive_evaluation_transcript(questions: list) -> str:
+    return json.dumps([
+        {
+            "question_id": q.id,
+            "question_text": q.content,
+            "user_answer": q.answer.user_answer,
+            "max_score": q.max_score,
+            "type": q.type,
+        }
+        for q in questions
+    ], indent=4)
+
+
+def naive_report_transcript(questions: list) -> str:
+    return json.dumps([
+        {
+            "question": q.content,
+            "type": q.type,
+            "max_score": q.max_score,
+            "answer": q.answer.user_answer,
+            "score": q.answer.score,
+            "feedback": q.answer.feedback,
+        }
+        for q in questions
+    ], indent=4)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=15)
+    args = parser.parse_args()
+
+    questions = make_interview(args.questions)
+    answers = [q.answer for q in questions]
+
+    rows = [
+        ("evaluation", naive_evaluation_transcript(questions), encode_evaluation_transcript(answers),
+         EVALUATION_BUDGET_PER_QUESTION * args.questions),
+        ("report", naive_report_transcript(questions), encode_report_transcript(questions),
+         REPORT_BUDGET_PER_QUESTION * args.questions),
+    ]
+
+    failed = False
+    print(f"{'transcript':<12} {'naive chars':>12} {'compact chars':>14} {'~tokens':>8} {'budget':>8}")
+    for name, naive, compact, budget in rows:
+        print(f"{name:<12} {len(naive):>12} {len(compact):>14} {len(compact) // 4:>8} {budget:>8}")
+        if len(compact) > budget:
+            print(f"  {name} transcript is over budget by {len(compact) - budget} chars")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
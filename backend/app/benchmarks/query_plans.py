@@ -0,0 +1,247 @@
+"""
+Query plans and latency of the hot queries on a large synthetic database, before and after the indexes.
+
+Fills a throwaway SQLite database with `--interviews` interviews of ten
+questions each (two million questions by default, most of them answered,
+with their users, CVs, reports and topics). Each hot query then runs through
+the service code that issues it, first without the indexes added by
+migration b51f0d7e2c94 and then with them. For every SQL statement a query
+emits, the benchmark prints SQLite's EXPLAIN QUERY PLAN and the query's
+latency. A SCAN of a large table is a missing index.
+
+Run from the `backend` directory (building the database takes a minute or two):
+
+    python -m app.benchmarks.query_plans --interviews 200000
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--interviews", type=int, default=200_000)
+parser.add_argument("--topics", type=int, default=5_000)
+parser.add_argument("--repeats", type=int, default=200, help="Runs of each query, with random arguments")
+parser.add_argument("--budget-seconds", type=float, default=5, help="Stops repeating a query after this long")
+args = parser.parse_args()
+
+# The settings are read at import time, so configure them before importing the app
+_db_dir = tempfile.mkdtemp(prefix="entervu_query_plans_")
+os.environ.update({
+    "DATABASE_URL": f"sqlite+pysqlite:///{_db_dir}/query_plans.db",
+    "AGENT_CACHE_DB_PATH": "",
+})
+for name, value in {"APP_NAME": "query-plan-benchmark", "APP_VERSION": "0", "FILE_MAX_SIZE": "10",
+                    "FILE_ALLOWED_TYPES": '["application/pdf"]', "MAX_PAGES": "5"}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.models.db_schemes import User, Cv, Interview, Question, Answer, Report, Topic, question_topic_table  # noqa: E402
+from app.models.enums.InterviewEnums import InterviewMode, InterviewStatus  # noqa: E402
+from app.models.enums.QuestionEnums import QuestionType  # noqa: E402
+from app.services import question_service  # noqa: E402
+from app.services.interview_service import build_interview_service  # noqa: E402
+
+QUESTIONS_PER_INTERVIEW = 10
+INTERVIEWS_PER_USER = 4
+CVS_PER_USER = 2
+CHUNK = 50_000
+
+# Added by migration b51f0d7e2c94_add_indexes_for_the_hot_queries
+NEW_INDEXES = {
+    "ix_questions_interview_id_order", "ix_answers_question_id", "ix_interviews_user_id_created_at",
+    "ix_interviews_cv_id", "ix_cvs_user_id", "ix_reports_interview_id", "ix_topics_lower_name",
+}
+
+
+def insert_rows(table, rows) -> None:
+    """Inserts the rows a chunk at a time, in one transaction."""
+    with db.engine.begin() as connection:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == CHUNK:
+                connection.execute(insert(table), chunk)
+                chunk = []
+        if chunk:
+            connection.execute(insert(table), chunk)
+
+
+def build_database() -> dict:
+    """Creates the synthetic data and returns the id ranges the queries draw their arguments from."""
+    rng = random.Random(0)
+    n_users = max(args.interviews // INTERVIEWS_PER_USER, 1)
+    n_questions = args.interviews * QUESTIONS_PER_INTERVIEW
+    started_at = datetime(2025, 1, 1)
+
+    insert_rows(User.__table__, (
+        {"id": i, "email": f"user{i}@example.com", "name": f"User {i}"} for i in range(1, n_users + 1)
+    ))
+    insert_rows(Cv.__table__, (
+        {"id": i, "user_id": (i - 1) // CVS_PER_USER + 1, "raw_text": "{}", "file_path": "", "file_name": "cv.pdf"}
+        for i in range(1, n_users * CVS_PER_USER + 1)
+    ))
+    insert_rows(Topic.__table__, ({"id": i, "name": f"Topic {i}"} for i in range(1, args.topics + 1)))
+
+    # Interviews are spread over the users in creation order, like real traffic
+    completed = set()
+
+    def interviews():
+        for i in range(1, args.interviews + 1):
+            user_id = rng.randint(1, n_users)
+            done = rng.random() < 0.7
+            if done:
+                completed.add(i)
+            yield {
+                "id": i, "user_id": user_id, "cv_id": (user_id - 1) * CVS_PER_USER + rng.randint(1, CVS_PER_USER),
+                "job_title": "Backend Engineer", "mode": InterviewMode.HARD,
+                "status": InterviewStatus.COMPLETED if done else InterviewStatus.IN_PROGRESS,
+                "created_at": started_at + timedelta(minutes=i),
+            }
+
+    insert_rows(Interview.__table__, interviews())
+    insert_rows(Question.__table__, (
+        {"id": i, "interview_id": (i - 1) // QUESTIONS_PER_INTERVIEW + 1, "content": f"Question {i}",
+         "type": QuestionType.TECHNICAL, "max_score": 10, "order": (i - 1) % QUESTIONS_PER_INTERVIEW + 1}
+        for i in range(1, n_questions + 1)
+    ))
+    insert_rows(question_topic_table, (
+        {"question_id": i, "topic_id": rng.randint(1, args.topics)} for i in range(1, n_questions + 1)
+    ))
+    # Completed interviews are fully answered, the others half way
+    insert_rows(Answer.__table__, (
+        {"question_id": i, "user_answer": "I would measure first.", "score": 7}
+        for i in range(1, n_questions + 1)
+        if (i - 1) // QUESTIONS_PER_INTERVIEW + 1 in completed or (i - 1) % QUESTIONS_PER_INTERVIEW < 5
+    ))
+    insert_rows(Report.__table__, (
+        {"interview_id": i, "content": "Report", "file_path": "", "sent_to_email": True} for i in sorted(completed)
+    ))
+    return {"users": n_users, "interviews": args.interviews, "questions": n_questions, "topics": args.topics}
+
+
+def hot_queries(sizes: dict) -> dict:
+    """Each hot query as the app issues it, with random arguments, given an InterviewService."""
+    def next_unanswered_question(service, rng):
+        question_service.get_next_unanswered_question(service.db, rng.randint(1, sizes["interviews"]))
+
+    def question_by_id(service, rng):
+        question_id = rng.randint(1, sizes["questions"])
+        interview_id = (question_id - 1) // QUESTIONS_PER_INTERVIEW + 1
+        question_service.get_question_by_id(service.db, question_id=question_id, interview_id=interview_id)
+
+    def interview_by_id(service, rng):
+        service.get_interview_by_id(rng.randint(1, sizes["interviews"]))
+
+    def interviews_of_a_user(service, rng):
+        service.get_all_interviews_for_user(rng.randint(1, sizes["users"]))
+
+    def cvs_of_a_user(service, rng):
+        service.cv_service.get_all_user_cvs(rng.randint(1, sizes["users"]))
+
+    def interviews_using_a_cv(service, rng):
+        # As CVService.delete_cv looks them up
+        service.db.query(Interview).filter(Interview.cv_id == rng.randint(1, sizes["users"] * CVS_PER_USER)).all()
+
+    def topics_by_name(service, rng):
+        names = [f"topic {rng.randint(1, sizes['topics'])}" for _ in range(3)]
+        service._get_or_create_topics(names, cache={})
+
+    return {
+        "next unanswered question": next_unanswered_question,
+        "question by id": question_by_id,
+        "interview by id": interview_by_id,
+        "interviews of a user": interviews_of_a_user,
+        "cvs of a user": cvs_of_a_user,
+        "interviews using a cv": interviews_using_a_cv,
+        "topics by name": topics_by_name,
+    }
+
+
+def query_plans(query) -> list:
+    """The EXPLAIN QUERY PLAN of every statement the query emits."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    session = db.SessionLocal()
+    try:
+        query(build_interview_service(session), random.Random(0))
+    finally:
+        session.rollback()
+        session.close()
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    plans = []
+    with db.engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append([row[-1] for row in rows])
+    return plans
+
+
+def measure(query) -> list:
+    rng = random.Random(1)
+    latencies = []
+    deadline = time.perf_counter() + args.budget_seconds
+    while len(latencies) < args.repeats and (not latencies or time.perf_counter() < deadline):
+        session = db.SessionLocal()
+        try:
+            service = build_interview_service(session)
+            started = time.perf_counter()
+            query(service, rng)
+            latencies.append(time.perf_counter() - started)
+        finally:
+            session.rollback()
+            session.close()
+    return latencies
+
+
+def run(label: str, queries: dict) -> dict:
+    print(f"\n=== {label} ===")
+    medians = {}
+    for name, query in queries.items():
+        latencies = measure(query)
+        medians[name] = statistics.median(latencies)
+        print(f"{name}: p50 {medians[name] * 1000:.2f} ms  max {max(latencies) * 1000:.2f} ms  ({len(latencies)} runs)")
+        for plan in query_plans(query):
+            print("    " + " | ".join(plan))
+    return medians
+
+
+def main():
+    db.Base.metadata.create_all(bind=db.engine)
+    new_indexes = [index for table in db.Base.metadata.sorted_tables
+                   for index in table.indexes if index.name in NEW_INDEXES]
+    for index in new_indexes:
+        index.drop(bind=db.engine)
+
+    started = time.perf_counter()
+    sizes = build_database()
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    print(f"built {sizes} in {time.perf_counter() - started:.0f} s")
+
+    queries = hot_queries(sizes)
+    before = run("without the indexes", queries)
+
+    for index in new_indexes:
+        index.create(bind=db.engine)
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    after = run("with the indexes", queries)
+
+    print(f"\n{'query':<26} {'before p50 (ms)':>16} {'after p50 (ms)':>15} {'speedup':>9}")
+    for name in queries:
+        print(f"{name:<26} {before[name] * 1000:>16.2f} {after[name] * 1000:>15.2f} {before[name] / after[name]:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures the per-call runner setup cost of `run_agent`.
+
+Compares building a fresh `Runner` on every call (the old behaviour) with a
+lookup in the shared `RunnerRegistry`. No model calls are made.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.runner_setup --calls 2000
+"""
+import argparse
+import time
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from app.integrations.google_adk.agents import ALL_AGENTS
+from app.integrations.google_adk.runners import RunnerRegistry
+
+
+def bench_fresh_runners(calls: int) -> float:
+    session_service = InMemorySessionService()
+    started = time.perf_counter()
+    for i in range(calls):
+        Runner(
+            agent=ALL_AGENTS[i % len(ALL_AGENTS)],
+            app_name="benchmark",
+            session_service=session_service
+        )
+    return time.perf_counter() - started
+
+
+def bench_registry(calls: int) -> float:
+    registry = RunnerRegistry(app_name="benchmark", session_service=InMemorySessionService())
+    registry.warm_up(ALL_AGENTS)
+    started = time.perf_counter()
+    for i in range(calls):
+        registry.get(ALL_AGENTS[i % len(ALL_AGENTS)])
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    fresh = bench_fresh_runners(args.calls)
+    pooled = bench_registry(args.calls)
+
+    print(f"calls:            {args.calls}")
+    print(f"fresh runner:     {fresh / args.calls * 1e6:10.2f} us/call")
+    print(f"pooled runner:    {pooled / args.calls * 1e6:10.2f} us/call")
+    print(f"speedup:          {fresh / pooled if pooled else float('inf'):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Concurrent read and write throughput of SQLite's defaults vs the tuned runtime profile.
+
+Reader threads keep fetching the next unanswered question of a random
+interview while writer threads keep saving answers, each on its own pooled
+session, for `--seconds` against a throwaway database file. The same workload
+runs once with SQLite's defaults (rollback journal, synchronous=FULL, 2 MB
+cache) and once with the profile from the settings that `app.core.db` applies
+to every connection.
+
+Run from the `backend` directory:
+
+    python -m app.benchmarks.sqlite_profile --readers 8 --writers 2 --seconds 10
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import Counter
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--readers", type=int, default=8)
+parser.add_argument("--writers", type=int, default=2)
+parser.add_argument("--seconds", type=float, default=10, help="Duration of each run")
+parser.add_argument("--interviews", type=int, default=200)
+parser.add_argument("--questions", type=int, default=15, help="Questions per interview")
+args = parser.parse_args()
+
+for name, value in {"APP_NAME": "sqlite-benchmark", "APP_VERSION": "0", "FILE_MAX_SIZE": "10",
+                    "FILE_ALLOWED_TYPES": '["application/pdf"]', "MAX_PAGES": "5",
+                    "DATABASE_URL": "sqlite://", "AGENT_CACHE_DB_PATH": ""}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.models.db_schemes import User, Cv, Interview, Question  # noqa: E402
+from app.models.enums.InterviewEnums import InterviewMode  # noqa: E402
+from app.models.enums.QuestionEnums import QuestionType  # noqa: E402
+from app.services import question_service, answer_service  # noqa: E402
+
+# What a connection gets without any PRAGMA, made explicit since WAL sticks to the file
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL", "cache_size": -2000,
+                   "mmap_size": 0, "temp_store": "DEFAULT"}
+
+
+def make_sessionmaker(path: str, pragmas: dict):
+    engine = create_engine(
+        f"sqlite+pysqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=args.readers + args.writers
+    )
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine, sessionmaker(autoflush=False, autocommit=False, bind=engine)
+
+
+def seed(Session) -> list:
+    session = Session()
+    try:
+        user = User(email="bench@example.com", name="Bench")
+        session.add(user)
+        session.flush()
+        cv = Cv(user_id=user.id, raw_text="{}", file_path="", file_name="cv")
+        session.add(cv)
+        session.flush()
+        interview_ids = []
+        for _ in range(args.interviews):
+            interview = Interview(user_id=user.id, cv_id=cv.id, job_title="Backend Engineer", mode=InterviewMode.HARD)
+            session.add(interview)
+            session.flush()
+            session.add_all([
+                Question(interview_id=interview.id, content=f"Question {order}", order=order,
+                         type=QuestionType.TECHNICAL, max_score=10)
+                for order in range(1, args.questions + 1)
+            ])
+            interview_ids.append(interview.id)
+        session.commit()
+        return interview_ids
+    finally:
+        session.close()
+
+
+def worker(Session, interview_ids: list, write: bool, deadline: float, counts: Counter, seed_: int):
+    rng = random.Random(seed_)
+    while time.perf_counter() < deadline:
+        session = Session()
+        try:
+            question = question_service.get_next_unanswered_question(session, rng.choice(interview_ids))
+            if write and question is not None:
+                answer_service.create_answer(session, question.id, "I would measure first.", None, None)
+                session.commit()
+            counts["writes" if write else "reads"] += 1
+        except OperationalError:
+            session.rollback()
+            counts["locked"] += 1
+        finally:
+            session.close()
+
+
+def run(name: str, pragmas: dict):
+    path = f"{tempfile.mkdtemp(prefix='entervu_sqlite_bench_')}/profile.db"
+    engine, Session = make_sessionmaker(path, pragmas)
+    db.Base.metadata.create_all(bind=engine)
+    interview_ids = seed(Session)
+
+    counts = Counter()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(Session, interview_ids, i < args.writers, deadline, counts, i))
+        for i in range(args.readers + args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(f"{name:<16} reads/s {counts['reads'] / args.seconds:>8.0f}  writes/s {counts['writes'] / args.seconds:>7.0f}"
+          f"  'database is locked' {counts['locked']}")
+
+
+def main():
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f} s per profile")
+    run("sqlite defaults", DEFAULT_PRAGMAS)
+    run("tuned profile", db._sqlite_pragmas())
+
+
+if __name__ == "__main__":
+    main()
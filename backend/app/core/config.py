@@ -11,6 +11,115 @@ class Settings(BaseSettings):
     FILE_ALLOWED_TYPES: list
     MAX_PAGES: int
 
+    DATABASE_URL: str = "sqlite+pysqlite:////data/ai_interview.db"
+    # Defaults to DATABASE_URL through its asyncio driver (aiosqlite for SQLite)
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool of each engine, DB_MAX_OVERFLOW=-1 for no limit on extra connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = -1
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+
+    # SQLite runtime profile, applied to every connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_JOURNAL_SIZE_LIMIT_MB: int = 64
+    # WAL checkpoint and PRAGMA optimize, 0 disables
+    SQLITE_MAINTENANCE_INTERVAL_SECONDS: float = 600
+
+    # Group commit of the answer, interview and report writes, through one task that batches them.
+    # Batches fill up while the previous commit runs, the window only adds a wait on top.
+    GROUP_COMMIT_WINDOW_MS: float = 0
+    GROUP_COMMIT_MAX_BATCH: int = 64
+
+    # Model backend behind run_agent: "adk" calls Gemini, "fake" answers locally,
+    # "record" calls Gemini and saves each call to the cassette, "replay" answers from it
+    AGENT_BACKEND: str = "adk"
+    AGENT_CASSETTE_PATH: str = "./cassettes/agents.jsonl"
+    AGENT_REPLAY_LATENCY: bool = False
+    FAKE_BACKEND_LATENCY_MS: float = 800
+    FAKE_BACKEND_LATENCY_DISTRIBUTION: str = "lognormal"  # "fixed", "uniform" or "lognormal"
+    FAKE_BACKEND_LATENCY_SIGMA: float = 0.5
+    FAKE_BACKEND_ERROR_RATE: float = 0.0
+    FAKE_BACKEND_MALFORMED_RATE: float = 0.0
+    FAKE_BACKEND_SEED: int = 0
+
+    # Agent sessions
+    AGENT_SESSION_MAX_SESSIONS: int = 1000
+    AGENT_SESSION_IDLE_TTL_SECONDS: int = 900
+
+    # Agent response cache, agent name -> TTL in seconds
+    AGENT_CACHE_TTLS: dict = {}
+    AGENT_CACHE_MEMORY_SIZE: int = 512
+    AGENT_CACHE_DB_PATH: str = "/data/agent_cache.db"
+
+    # Model call scheduling, AGENT_CONCURRENCY_LIMITS maps agent name -> max concurrent calls
+    AGENT_MAX_CONCURRENCY: int = 8
+    AGENT_CONCURRENCY_LIMITS: dict = {}
+    AGENT_RATE_LIMIT_PER_SECOND: float = 5.0
+    AGENT_RATE_LIMIT_BURST: int = 10
+
+    # Model outages: per-agent timeouts in seconds, hedge delays (agent name -> seconds
+    # before a second concurrent attempt) and the circuit breaker
+    AGENT_TIMEOUT_SECONDS: float = 90
+    AGENT_TIMEOUTS: dict = {}
+    AGENT_HEDGE_DELAYS: dict = {}
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30
+
+    # Prompt token budgets, agent name -> max estimated tokens of the query
+    AGENT_PROMPT_TOKEN_BUDGETS: dict = {}
+    AGENT_PROMPT_DEFAULT_TOKEN_BUDGET: int = 8000
+
+    # Answer evaluation
+    EVALUATE_ANSWERS_ON_SUBMIT: bool = True
+    EVALUATION_WAIT_SECONDS: float = 30
+    EVALUATION_CHUNK_SIZE: int = 4
+    EVALUATION_CHUNK_RETRIES: int = 2
+
+    # Question generation, QUESTION_GENERATION_SHARDING is one of "none", "type" or "skill"
+    QUESTION_GENERATION_SHARDING: str = "none"
+    QUESTION_GENERATION_SHARD_THRESHOLD: int = 8
+    # Return the interview once its first question is saved, the rest are saved as they stream in
+    QUESTION_STREAMING: bool = False
+    QUESTION_STREAMING_WAIT_SECONDS: float = 10
+
+    # Question bank: share of each interview that may be filled with past questions,
+    # the similarity they need to the role and the MMR relevance/diversity trade-off
+    QUESTION_BANK_ENABLED: bool = False
+    QUESTION_BANK_MAX_SHARE: float = 0.5
+    QUESTION_BANK_MIN_SIMILARITY: float = 0.35
+    QUESTION_BANK_DIVERSITY: float = 0.7
+
+    # Speculative question generation after a CV upload, for the declared or last used role
+    QUESTION_PREGENERATION: bool = False
+    QUESTION_PREGENERATION_BUDGET_PER_HOUR: int = 30
+    QUESTION_PREGENERATION_TTL_SECONDS: int = 1800
+    QUESTION_PREGENERATION_MAX_SETS: int = 200
+    QUESTION_PREGENERATION_WAIT_SECONDS: float = 5
+
+    # Role research shared across candidates, stored next to the agent response cache
+    RESEARCH_CACHE_ENABLED: bool = True
+    RESEARCH_CACHE_TTL_SECONDS: int = 604800
+    RESEARCH_CACHE_MEMORY_SIZE: int = 256
+
+    # Background jobs for the long agent workflows
+    JOB_WORKERS: int = 2
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 2.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_WAIT_MAX_SECONDS: float = 30
+
+    # Job progress events, kept in memory after the job finished for late subscribers
+    PROGRESS_RETENTION_SECONDS: float = 300
+    PROGRESS_KEEPALIVE_SECONDS: float = 15
+    # An event stream is closed after this long, the client reconnects if the job is still running
+    PROGRESS_STREAM_MAX_SECONDS: float = 900
+
     class Config:
         env_file = "./app/.env"
 
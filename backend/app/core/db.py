@@ -1,20 +1,130 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from app.core.config import get_settings
+
+
+logger = logging.getLogger('uvicorn.error')
+
+settings = get_settings()
+
+DATABASE_URL = settings.DATABASE_URL
+
+_IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+
 
+def _pool_options(url: str) -> dict:
+    """
+    Pool sizing from the settings. Sessions keep their connection across awaits,
+    and a checkout waiting on a drained pool blocks the event loop those
+    sessions need to give theirs back. Hence no overflow limit by default:
+    SQLite connections are cheap.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory databases live in a single connection, there is no pool to size
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
 
-DATABASE_URL = "sqlite+pysqlite:////data/ai_interview.db"
 
 engine = create_engine(
     DATABASE_URL, 
     # It allows the app to make multiple calls at the same time
-    connect_args={"check_same_thread": False} 
+    connect_args={"check_same_thread": False},
+    **_pool_options(DATABASE_URL)
 )
 
 SessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=engine)
 
+
+def _sqlite_pragmas() -> dict:
+    """The SQLite runtime profile applied to every connection, from the settings."""
+    return {
+        # Readers and the writer must not block each other: the sync sessions block
+        # the event loop while they wait, and the async ones need it to finish a read
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        # In WAL mode a crash can lose the last commits but never corrupts the database
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        # Negative means KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        # Size the WAL file is truncated back to after a checkpoint
+        "journal_size_limit": settings.SQLITE_JOURNAL_SIZE_LIMIT_MB * 1024 * 1024,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in _sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+if _IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+
+def _async_database_url(url: str) -> str:
+    """The same database through its asyncio driver, aiosqlite for SQLite."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = get_settings().ASYNC_DATABASE_URL or _async_database_url(DATABASE_URL)
+
+# Queries on this engine run off the event loop, so a slow write only holds up its own request.
+# On SQLite each statement commits by itself: a transaction left open across an await would hold
+# the write lock while the sync sessions, still used on the loop, block the loop waiting for it.
+# The async services only ever write a single statement at a time.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_pool_options(ASYNC_DATABASE_URL),
+    **({"isolation_level": "AUTOCOMMIT"} if make_url(ASYNC_DATABASE_URL).get_backend_name() == "sqlite" else {})
+)
+
+if async_engine.dialect.name == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+# Nothing is lazy loaded in async code, keep the loaded attributes after a commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
 Base = declarative_base()
 
+
+def run_sqlite_maintenance() -> None:
+    """
+    Checkpoints the WAL into the database file and lets SQLite refresh the
+    statistics its query planner relies on. The checkpoint is passive: it copies
+    what it can without waiting on readers or the writer.
+    """
+    with engine.connect() as connection:
+        busy, wal_pages, checkpointed = connection.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)").one()
+        connection.exec_driver_sql("PRAGMA optimize")
+    logger.debug(f"SQLite checkpoint: {checkpointed}/{wal_pages} WAL pages copied, busy={busy}")
+
+
+async def sqlite_maintenance_loop(interval_seconds: float) -> None:
+    """Runs `run_sqlite_maintenance` every `interval_seconds` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_sqlite_maintenance)
+        except Exception as e:
+            logger.warning(f"SQLite maintenance failed: {e}")
+
 def get_db():
 
     db = SessionLocal()
@@ -23,4 +133,9 @@ def get_db():
         yield db
 
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+
+    async with AsyncSessionLocal() as db:
+        yield db
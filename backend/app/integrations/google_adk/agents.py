@@ -54,6 +54,22 @@ question_generation_agent = LlmAgent(
     disallow_transfer_to_peers=True,
 )
 
+# Same generator, but the research is done up front and passed in the prompt,
+# so a cached research context skips the `google_search` round trip entirely.
+question_generation_with_research_agent = LlmAgent(
+    name="ResearchedGeneratorAgent",
+    instruction=prompts.GENERATOR_WITH_RESEARCH_INSTRUCTION,
+    model=MODEL,
+    generate_content_config=types.GenerateContentConfig(
+        response_mime_type="application/json",
+        temperature=0.3,
+    ),
+    output_schema=QuestionOutAgent,
+    output_key="final_questions",
+    disallow_transfer_to_parent=True, 
+    disallow_transfer_to_peers=True,
+)
+
 answer_evaluation_agent = LlmAgent(
     name="answer_evaluation_agent",
     model=MODEL,
@@ -78,4 +94,14 @@ final_report_agent = LlmAgent(
     ),
     disallow_transfer_to_parent=True, 
     disallow_transfer_to_peers=True,
-)
\ No newline at end of file
+)
+
+# Every agent `run_agent` is called with, used to warm up the runner registry
+ALL_AGENTS = (
+    cv_parsing_agent,
+    researcher_agent,
+    question_generation_agent,
+    question_generation_with_research_agent,
+    answer_evaluation_agent,
+    final_report_agent,
+)
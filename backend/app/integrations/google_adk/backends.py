@@ -0,0 +1,289 @@
+import re
+import abc
+import json
+import math
+import uuid
+import random
+import asyncio
+from collections import defaultdict
+from typing import AsyncIterator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
+
+from app.schemes.questions_schemes import QuestionCreate, QuestionOutAgent
+from app.schemes.answers_schemes import AnswerEvaluation, AnswerEvaluationAgent
+from app.schemes.report_schemas import FinalReportOutput
+from .runners import RunnerRegistry
+from .sessions import BoundedSessionService
+
+
+class ModelBackend(abc.ABC):
+    """
+    Where `run_agent` sends a call once it got through the cache and the scheduler.
+    Selected with the AGENT_BACKEND setting.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._calls = defaultdict(int)
+        self._errors = defaultdict(int)
+
+    async def run(self, agent: BaseAgent, query: str, user_id: str) -> str:
+        self._calls[agent.name] += 1
+        try:
+            return await self._run(agent=agent, query=query, user_id=user_id)
+        except Exception:
+            self._errors[agent.name] += 1
+            raise
+
+    async def stream(self, agent: BaseAgent, query: str, user_id: str) -> AsyncIterator[str]:
+        """Yields the response text in chunks, as the model writes it."""
+        self._calls[agent.name] += 1
+        try:
+            async for chunk in self._stream(agent=agent, query=query, user_id=user_id):
+                yield chunk
+        except Exception:
+            self._errors[agent.name] += 1
+            raise
+
+    @abc.abstractmethod
+    async def _run(self, agent: BaseAgent, query: str, user_id: str) -> str:
+        """Returns the agent's whole response to the query."""
+
+    async def _stream(self, agent: BaseAgent, query: str, user_id: str) -> AsyncIterator[str]:
+        # Backends that cannot stream yield the whole response at once
+        yield await self._run(agent=agent, query=query, user_id=user_id)
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "calls": dict(self._calls), "errors": dict(self._errors)}
+
+
+class AdkBackend(ModelBackend):
+    """Runs the agent against Gemini through the shared ADK runners."""
+
+    name = "adk"
+
+    def __init__(self, runner_registry: RunnerRegistry, session_service: BoundedSessionService, app_name: str):
+        super().__init__()
+        self.runner_registry = runner_registry
+        self.session_service = session_service
+        self.app_name = app_name
+
+    # TODO: Add a session states to each agent and make them run all in the same session
+    async def _run(self, agent: BaseAgent, query: str, user_id: str) -> str:
+        session_id = str(uuid.uuid4()) # Create a new session for each distinct task
+        user_id = str(user_id)
+        runner = self.runner_registry.get(agent)
+
+        await self.session_service.create_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        )
+
+        content = types.Content(role='user', parts=[types.Part(text=query)])
+
+        try:
+            # The async loop to get the final response
+            async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        final_response_text = event.content.parts[0].text
+                        return final_response_text
+
+            # Fallback in case the loop finishes without a final response
+            return ""
+        finally:
+            # The session holds the whole prompt and response, drop it right away
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+
+    async def _stream(self, agent: BaseAgent, query: str, user_id: str) -> AsyncIterator[str]:
+        session_id = str(uuid.uuid4())
+        user_id = str(user_id)
+        runner = self.runner_registry.get(agent)
+
+        await self.session_service.create_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        )
+
+        content = types.Content(role='user', parts=[types.Part(text=query)])
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+
+        try:
+            streamed = False
+            async for event in runner.run_async(
+                user_id=user_id, session_id=session_id, new_message=content, run_config=run_config
+            ):
+                if not (event.content and event.content.parts and event.content.parts[0].text):
+                    continue
+                if event.partial:
+                    streamed = True
+                    yield event.content.parts[0].text
+                elif event.is_final_response():
+                    # The final event repeats the whole text, only needed if nothing was streamed
+                    if not streamed:
+                        yield event.content.parts[0].text
+                    return
+        finally:
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+
+
+class FakeModelError(RuntimeError):
+    """A simulated model failure, raised at the configured error rate."""
+
+
+class FakeBackend(ModelBackend):
+    """
+    A deterministic local stand-in for the model, for load and latency tests.
+
+    Returns schema-valid output for every agent without any network access.
+    The latency is drawn from a fixed, uniform or lognormal distribution
+    around `latency_ms`, and calls fail with `FakeModelError` at `error_rate`.
+    At `malformed_rate` the response comes back fenced in markdown or truncated,
+    like real model output sometimes does.
+    The same seed, agent and query always produce the same latency, outcome
+    and response.
+    """
+
+    name = "fake"
+
+    SKILLS = ["python", "sql", "fastapi", "docker", "git", "system design", "testing", "communication"]
+    QUESTION_TYPES = ["TECHNICAL", "BEHAVIORAL", "SITUATIONAL"]
+
+    def __init__(self, latency_ms: float = 800, distribution: str = "lognormal",
+                 sigma: float = 0.5, error_rate: float = 0.0, malformed_rate: float = 0.0, seed: int = 0):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+
+    # Share of the latency spent before the first streamed chunk, and the chunk size
+    FIRST_CHUNK_SHARE = 0.2
+    CHUNK_CHARS = 64
+
+    async def _run(self, agent: BaseAgent, query: str, user_id: str) -> str:
+        rng = random.Random(f"{self.seed}:{agent.name}:{query}")
+
+        await asyncio.sleep(self._sample_latency(rng))
+        if rng.random() < self.error_rate:
+            raise FakeModelError(f"Simulated failure of {agent.name}")
+        return self._respond(agent, query, rng)
+
+    async def _stream(self, agent: BaseAgent, query: str, user_id: str) -> AsyncIterator[str]:
+        rng = random.Random(f"{self.seed}:{agent.name}:{query}")
+        latency = self._sample_latency(rng)
+
+        await asyncio.sleep(latency * self.FIRST_CHUNK_SHARE)
+        if rng.random() < self.error_rate:
+            raise FakeModelError(f"Simulated failure of {agent.name}")
+
+        # The same response as `run`, spread over the rest of the latency
+        response = self._respond(agent, query, rng)
+        chunks = [response[i:i + self.CHUNK_CHARS] for i in range(0, len(response), self.CHUNK_CHARS)] or [""]
+        delay = latency * (1 - self.FIRST_CHUNK_SHARE) / len(chunks)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def _respond(self, agent: BaseAgent, query: str, rng: random.Random) -> str:
+        responders = {
+            "cv_parsing_agent": self._parse_cv,
+            "ResearcherAgent": self._research,
+            "GeneratorAgent": self._generate_questions,
+            "ResearchedGeneratorAgent": self._generate_questions,
+            "answer_evaluation_agent": self._evaluate_answers,
+            "final_report_agent": self._write_report,
+        }
+        responder = responders.get(agent.name)
+        response = responder(query, rng) if responder else "{}"
+        return self._malform(response, rng) if rng.random() < self.malformed_rate else response
+
+    @staticmethod
+    def _malform(response: str, rng: random.Random) -> str:
+        if rng.random() < 0.5:
+            return f"```json\n{response}\n```"
+        return response[:int(len(response) * rng.uniform(0.6, 0.95))]
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        mean = self.latency_ms / 1000
+        if self.distribution == "fixed":
+            return mean
+        if self.distribution == "uniform":
+            return rng.uniform(0.5 * mean, 1.5 * mean)
+        # Lognormal with the configured mean, model latencies have a long right tail
+        mu = math.log(mean) - self.sigma ** 2 / 2 if mean > 0 else 0
+        return rng.lognormvariate(mu, self.sigma) if mean > 0 else 0
+
+    @staticmethod
+    def _find(pattern: str, text: str, default: str) -> str:
+        match = re.search(pattern, text)
+        return match.group(1).strip() if match else default
+
+    def _parse_cv(self, query: str, rng: random.Random) -> str:
+        return json.dumps({
+            "profile": "Software engineer with experience building web services.",
+            "education": [{"institution": "State University", "degree": "BSc Computer Science", "period": "2016 - 2020"}],
+            "experience": [{"title": "Backend Engineer", "company": "Acme", "description": "Built and operated REST APIs."}],
+            "projects": [{"title": "Interview Bot", "description": "An AI interview practice tool."}],
+            "skills": rng.sample(self.SKILLS, 4),
+        })
+
+    def _research(self, query: str, rng: random.Random) -> str:
+        job_title = self._find(r"Job Title:\s*(.+)", query, "the role")
+        return json.dumps({
+            "research_summary": f"Interviews for {job_title} focus on fundamentals, past projects and teamwork."
+        })
+
+    def _generate_questions(self, query: str, rng: random.Random) -> str:
+        job_title = self._find(r"Job Title:\s*(.+)", query, "the role")
+        n_questions = int(self._find(r"Number of Questions to Generate:\s*(\d+)", query, "5"))
+        only_type = self._find(r"Only generate questions of type:\s*(\w+)", query, "")
+
+        questions = []
+        for i in range(n_questions):
+            question_type = only_type or self.QUESTION_TYPES[i % len(self.QUESTION_TYPES)]
+            skill = rng.choice(self.SKILLS)
+            questions.append(QuestionCreate(
+                content=f"As a {job_title}, how have you applied {skill}? ({question_type.lower()} #{i + 1})",
+                max_score=rng.randint(5, 10),
+                type=question_type,
+                topics=[skill],
+            ))
+        return QuestionOutAgent(questions=questions).model_dump_json()
+
+    def _evaluate_answers(self, query: str, rng: random.Random) -> str:
+        try:
+            transcript = json.loads(query)
+        except json.JSONDecodeError:
+            transcript = []
+
+        evaluations = [
+            AnswerEvaluation(
+                question_id=item["question_id"],
+                score=round(rng.uniform(0, min(float(item.get("max_score") or 10), 10)), 1),
+                feedback="A reasonable answer. Add a concrete example to make it stronger.",
+            )
+            for item in transcript if isinstance(item, dict) and "question_id" in item
+        ]
+        return AnswerEvaluationAgent(answers=evaluations).model_dump_json()
+
+    def _write_report(self, query: str, rng: random.Random) -> str:
+        user_name = self._find(r"User Name:\s*(.+)", query, "Candidate")
+        decision = rng.choice(["accepted", "rejected", "needs_improvement"])
+        return FinalReportOutput(
+            final_decision=decision,
+            strengths=["Clear communication", "Solid fundamentals"],
+            areas_for_improvement=["Give more concrete examples"],
+            content=f"{user_name} showed a solid understanding of the role.",
+            email_subject=f"Interview Feedback - {user_name}",
+            email_body=f"<p>Dear {user_name},</p><p>Thank you for your time. Decision: {decision}.</p>",
+        ).model_dump_json()
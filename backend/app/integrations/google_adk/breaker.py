@@ -0,0 +1,207 @@
+import time
+import asyncio
+import logging
+import contextlib
+from collections import defaultdict
+from typing import AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger('uvicorn.error')
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ModelUnavailableError(RuntimeError):
+    """The model could not answer in time, callers should degrade rather than wait."""
+
+    retry_after: float = 0
+
+
+class CircuitOpenError(ModelUnavailableError):
+    """Raised without calling the model while an agent's circuit is open."""
+
+    def __init__(self, agent_name: str, retry_after: float):
+        super().__init__(f"The circuit of {agent_name} is open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class AgentTimeoutError(ModelUnavailableError):
+    """Raised when a call, including its hedges, did not finish within the agent's timeout."""
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class CircuitBreaker:
+    """
+    Per-agent circuit breakers, timeouts and hedged calls around the model.
+
+    After `failure_threshold` consecutive failures an agent's circuit opens
+    and its calls fail right away with `CircuitOpenError`. After
+    `reset_seconds` a single probe call is let through; its outcome closes
+    the circuit again or keeps it open. Every call is bounded by the agent's
+    timeout. Agents listed in `hedge_delays` get a second, concurrent attempt
+    when the first has not answered after that many seconds, and the first
+    answer wins.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, default_timeout: float,
+                 timeouts: Dict[str, float], hedge_delays: Dict[str, float]):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts
+        self.hedge_delays = hedge_delays
+
+        self._circuits: Dict[str, _Circuit] = defaultdict(_Circuit)
+        self._stats = defaultdict(lambda: {
+            "calls": 0, "failures": 0, "timeouts": 0, "short_circuited": 0,
+            "opened": 0, "hedges": 0, "hedges_skipped": 0, "hedge_wins": 0,
+        })
+
+    def before_call(self, agent_name: str) -> None:
+        """Raises `CircuitOpenError` when the agent's circuit does not let a call through."""
+        circuit = self._circuits[agent_name]
+        if circuit.state == CLOSED:
+            return
+
+        retry_after = circuit.opened_at + self.reset_seconds - time.monotonic()
+        if circuit.state == OPEN and retry_after <= 0:
+            circuit.state = HALF_OPEN
+        if circuit.state == HALF_OPEN and not circuit.probing:
+            circuit.probing = True
+            return
+
+        self._stats[agent_name]["short_circuited"] += 1
+        raise CircuitOpenError(agent_name, retry_after=max(retry_after, 1.0))
+
+    def record_call(self, agent_name: str) -> None:
+        """Counts a call that was let through and admitted, whatever its outcome."""
+        self._stats[agent_name]["calls"] += 1
+
+    def record_success(self, agent_name: str) -> None:
+        circuit = self._circuits[agent_name]
+        if circuit.state != CLOSED:
+            logger.info(f"Circuit of {agent_name} closed")
+        circuit.state = CLOSED
+        circuit.consecutive_failures = 0
+        circuit.probing = False
+
+    def record_failure(self, agent_name: str) -> None:
+        circuit = self._circuits[agent_name]
+        stats = self._stats[agent_name]
+        stats["failures"] += 1
+        circuit.consecutive_failures += 1
+        circuit.probing = False
+
+        if circuit.state == HALF_OPEN or circuit.consecutive_failures >= self.failure_threshold:
+            if circuit.state != OPEN:
+                stats["opened"] += 1
+                logger.warning(f"Circuit of {agent_name} opened after {circuit.consecutive_failures} failures")
+            circuit.state = OPEN
+            circuit.opened_at = time.monotonic()
+
+    def record_timeout(self, agent_name: str) -> None:
+        self._stats[agent_name]["timeouts"] += 1
+        self.record_failure(agent_name)
+
+    def record_abandoned(self, agent_name: str) -> None:
+        """
+        The caller gave up on the call, e.g. it was cancelled. That says nothing
+        about the model, but a probe must not stay in flight forever.
+        """
+        self._circuits[agent_name].probing = False
+
+    def timeout_for(self, agent_name: str) -> float:
+        return self.timeouts.get(agent_name, self.default_timeout)
+
+    def is_open(self, agent_name: str) -> bool:
+        circuit = self._circuits.get(agent_name)
+        return circuit is not None and circuit.state == OPEN \
+            and time.monotonic() - circuit.opened_at < self.reset_seconds
+
+    async def call(self, agent_name: str, attempt: Callable[[], Awaitable[str]],
+                   admission: Optional[Callable[[], AsyncContextManager]] = None,
+                   hedge_admission: Optional[Callable[[], Optional[Callable[[], None]]]] = None) -> str:
+        """
+        Runs `attempt` through the agent's circuit, timeout and hedging.
+
+        `admission`, e.g. a scheduler slot, is entered before the timeout
+        starts, so time spent queued for it is not taken for a slow model.
+        A hedge is extra load on a model that is already slow, so it needs a
+        slot of its own: `hedge_admission` takes one without waiting and
+        returns the function releasing it, or None and the hedge is skipped.
+        """
+        self.before_call(agent_name)
+
+        try:
+            async with admission() if admission is not None else contextlib.nullcontext():
+                self.record_call(agent_name)
+                response = await asyncio.wait_for(
+                    self._hedged(agent_name, attempt, hedge_admission),
+                    timeout=self.timeout_for(agent_name)
+                )
+        except asyncio.TimeoutError:
+            self.record_timeout(agent_name)
+            raise AgentTimeoutError(f"{agent_name} did not answer in time")
+        except asyncio.CancelledError:
+            self.record_abandoned(agent_name)
+            raise
+        except Exception:
+            self.record_failure(agent_name)
+            raise
+
+        self.record_success(agent_name)
+        return response
+
+    async def _hedged(self, agent_name: str, attempt: Callable[[], Awaitable[str]],
+                      hedge_admission: Optional[Callable[[], Optional[Callable[[], None]]]]) -> str:
+        hedge_delay = self.hedge_delays.get(agent_name)
+        if not hedge_delay:
+            return await attempt()
+
+        first = asyncio.create_task(attempt())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                release = hedge_admission() if hedge_admission is not None else (lambda: None)
+                if release is None:
+                    self._stats[agent_name]["hedges_skipped"] += 1
+                else:
+                    self._stats[agent_name]["hedges"] += 1
+                    hedge = asyncio.create_task(attempt())
+                    # Also runs when the hedge is cancelled before it started
+                    hedge.add_done_callback(lambda _: release())
+                    tasks.add(hedge)
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._stats[agent_name]["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        """Returns each agent's circuit state and call outcome counters."""
+        return {
+            agent_name: {
+                "state": self._circuits[agent_name].state,
+                "consecutive_failures": self._circuits[agent_name].consecutive_failures,
+                **stats,
+            }
+            for agent_name, stats in self._stats.items()
+        }
@@ -0,0 +1,152 @@
+import json
+import math
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List
+
+logger = logging.getLogger('uvicorn.error')
+
+# Gemini tokenizes English prose at roughly four characters per token
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the token count of `text` locally, without calling the model."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _drop_empty(value: Any) -> Any:
+    """Recursively removes null, empty string, empty list and empty dict values."""
+    if isinstance(value, dict):
+        cleaned = {key: _drop_empty(item) for key, item in value.items()}
+        return {key: item for key, item in cleaned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        cleaned = [_drop_empty(item) for item in value]
+        return [item for item in cleaned if item not in (None, "", [], {})]
+    return value
+
+
+def _truncate_strings(value: Any, max_chars: int) -> Any:
+    """Cuts every string longer than `max_chars`, keeping the JSON structure valid."""
+    if isinstance(value, dict):
+        return {key: _truncate_strings(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate_strings(item, max_chars) for item in value]
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + TRUNCATION_MARK
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class PromptField:
+    """
+    One variable part of a prompt.
+
+    Fields with the lowest `priority` are trimmed first, and never below
+    `min_chars`. JSON fields are minified and stripped of empty values up
+    front, and trimmed by shortening their longest strings so they stay valid.
+    """
+
+    def __init__(self, name: str, text: str | None, priority: int = 0,
+                 is_json: bool = False, min_chars: int = 200):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.is_json = is_json
+        self.min_chars = min_chars
+
+    def compact(self) -> None:
+        if not self.is_json:
+            self.text = " ".join(self.text.split())
+            return
+        try:
+            self.text = _dumps(_drop_empty(json.loads(self.text)))
+        except (json.JSONDecodeError, TypeError):
+            # Not JSON after all, e.g. a CV the parser failed to structure
+            self.is_json = False
+            self.compact()
+
+    def trim_to(self, max_chars: int) -> None:
+        max_chars = max(max_chars, self.min_chars)
+        if len(self.text) <= max_chars:
+            return
+
+        if not self.is_json:
+            self.text = self.text[:max_chars - len(TRUNCATION_MARK)] + TRUNCATION_MARK
+            return
+
+        # Binary search the longest string length that still fits
+        data = json.loads(self.text)
+        low, high = 20, max(len(self.text), 20)
+        best = _dumps(_truncate_strings(data, low))
+        while low <= high:
+            middle = (low + high) // 2
+            candidate = _dumps(_truncate_strings(data, middle))
+            if len(candidate) <= max_chars:
+                best = candidate
+                low = middle + 1
+            else:
+                high = middle - 1
+        self.text = best
+
+
+class PromptBudgeter:
+    """
+    Keeps the variable parts of each agent's prompt under a token budget.
+
+    `budgets` maps an agent name to its budget in tokens; agents that are not
+    listed get `default_budget`. The sizes before and after fitting are logged
+    when something had to be trimmed and are exported through `stats`.
+    """
+
+    def __init__(self, budgets: Dict[str, int], default_budget: int):
+        self.budgets = budgets
+        self.default_budget = default_budget
+
+        self._stats = defaultdict(lambda: {
+            "calls": 0, "reduced_calls": 0, "tokens_before": 0, "tokens_after": 0
+        })
+
+    def fit(self, agent_name: str, fields: List[PromptField], overhead: str = "") -> Dict[str, str]:
+        """
+        Compacts and, if needed, trims `fields` so that they plus the fixed
+        `overhead` text fit the agent's budget. Returns the fitted text by field name.
+        """
+        budget_chars = self.budgets.get(agent_name, self.default_budget) * CHARS_PER_TOKEN
+        tokens_before = estimate_tokens(overhead + "".join(field.text for field in fields))
+
+        for field in fields:
+            field.compact()
+
+        over_budget = len(overhead) + sum(len(field.text) for field in fields) - budget_chars
+        for field in sorted(fields, key=lambda f: f.priority):
+            if over_budget <= 0:
+                break
+            length = len(field.text)
+            field.trim_to(length - over_budget)
+            over_budget -= length - len(field.text)
+
+        tokens_after = estimate_tokens(overhead + "".join(field.text for field in fields))
+        self._record(agent_name, tokens_before, tokens_after)
+        if over_budget > 0:
+            logger.warning(
+                f"Prompt for {agent_name} is still ~{math.ceil(over_budget / CHARS_PER_TOKEN)} tokens over budget"
+            )
+        return {field.name: field.text for field in fields}
+
+    def _record(self, agent_name: str, tokens_before: int, tokens_after: int) -> None:
+        stats = self._stats[agent_name]
+        stats["calls"] += 1
+        stats["tokens_before"] += tokens_before
+        stats["tokens_after"] += tokens_after
+        if tokens_after < tokens_before:
+            stats["reduced_calls"] += 1
+            logger.info(f"Prompt for {agent_name} fitted from ~{tokens_before} to ~{tokens_after} tokens")
+
+    def stats(self) -> dict:
+        """Returns the estimated prompt sizes before and after fitting, per agent."""
+        return {agent_name: dict(stats) for agent_name, stats in self._stats.items()}
@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import logging
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def make_cache_key(agent: BaseAgent, query: str) -> str:
+    """
+    Content-addressed key of an agent call.
+
+    Hashes everything that decides the model output: the agent name, its model,
+    its instruction and the query. Changing a prompt therefore never serves a
+    stale response.
+    """
+    payload = json.dumps(
+        [
+            agent.name,
+            str(getattr(agent, "model", "")),
+            str(getattr(agent, "instruction", "")),
+            query,
+        ],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of agent responses.
+
+    The first tier is an in-memory LRU of `memory_size` entries, the second a
+    SQLite table that survives restarts and is shared by every worker. Each
+    entry stores how long the original call took, so a hit can report the
+    time it saved. An empty `db_path` disables the SQLite tier.
+    """
+
+    def __init__(self, memory_size: int = 512, db_path: str = "", table: str = "agent_responses"):
+        self.memory_size = memory_size
+        self.db_path = db_path
+        self.table = table
+
+        # key -> (value, expires_at, elapsed_seconds)
+        self._memory: "OrderedDict[str, Tuple[str, float, float]]" = OrderedDict()
+        self._db_ready = False
+
+        self._hits = defaultdict(lambda: {"memory": 0, "sqlite": 0})
+        self._misses = defaultdict(int)
+        self._seconds_saved = defaultdict(float)
+
+    async def get(self, key: str, agent_name: str) -> Optional[str]:
+        """Returns the cached response for `key`, or None on a miss."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at, elapsed = entry
+            if expires_at > time.time():
+                self._memory.move_to_end(key)
+                self._record_hit(agent_name, "memory", elapsed)
+                return value
+            del self._memory[key]
+
+        if self.db_path:
+            entry = await asyncio.to_thread(self._db_get, key)
+            if entry is not None:
+                self._remember(key, entry)
+                self._record_hit(agent_name, "sqlite", entry[2])
+                return entry[0]
+
+        self._misses[agent_name] += 1
+        return None
+
+    async def set(self, key: str, agent_name: str, value: str, ttl: float, elapsed: float = 0.0) -> None:
+        """Stores `value` in both tiers for `ttl` seconds."""
+        entry = (value, time.time() + ttl, elapsed)
+        self._remember(key, entry)
+        if self.db_path:
+            await asyncio.to_thread(self._db_set, key, agent_name, entry)
+
+    def _remember(self, key: str, entry: Tuple[str, float, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _record_hit(self, agent_name: str, tier: str, elapsed: float) -> None:
+        self._hits[agent_name][tier] += 1
+        self._seconds_saved[agent_name] += elapsed
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a short-lived connection and commits on exit."""
+        connection = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with connection:
+                if not self._db_ready:
+                    connection.execute(
+                        f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                        "key TEXT PRIMARY KEY, agent TEXT NOT NULL, value TEXT NOT NULL, "
+                        "expires_at REAL NOT NULL, elapsed REAL NOT NULL)"
+                    )
+                    self._db_ready = True
+                yield connection
+        finally:
+            connection.close()
+
+    def _db_get(self, key: str) -> Optional[Tuple[str, float, float]]:
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    f"SELECT value, expires_at, elapsed FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= time.time():
+                    connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    return None
+                return row
+        except sqlite3.Error as e:
+            logger.warning(f"Agent cache read failed, skipping the SQLite tier: {e}")
+            return None
+
+    def _db_set(self, key: str, agent_name: str, entry: Tuple[str, float, float]) -> None:
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, agent, value, expires_at, elapsed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, agent_name, *entry)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Agent cache write failed, skipping the SQLite tier: {e}")
+
+    def stats(self) -> dict:
+        """Returns the hit/miss counters per agent."""
+        agents = {}
+        for agent_name in set(self._hits) | set(self._misses):
+            hits = self._hits[agent_name]
+            total_hits = hits["memory"] + hits["sqlite"]
+            lookups = total_hits + self._misses[agent_name]
+            agents[agent_name] = {
+                "memory_hits": hits["memory"],
+                "sqlite_hits": hits["sqlite"],
+                "misses": self._misses[agent_name],
+                "hit_rate": total_hits / lookups if lookups else 0.0,
+                "seconds_saved": round(self._seconds_saved[agent_name], 3),
+            }
+        return {
+            "memory_entries": len(self._memory),
+            "persistent": bool(self.db_path) and os.path.exists(self.db_path),
+            "agents": agents,
+        }
@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict
+
+from google.adk.agents import BaseAgent
+
+from .backends import ModelBackend
+from .cache import make_cache_key
+
+
+class CassetteMissError(LookupError):
+    """Raised on replay when the cassette has no recording for a call."""
+
+
+class RecordingBackend(ModelBackend):
+    """
+    Passes every call through to `inner` and appends the request, the response
+    (or the error) and the timing to a JSON-lines cassette file.
+    """
+
+    name = "record"
+
+    def __init__(self, inner: ModelBackend, path: str):
+        super().__init__()
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def _run(self, agent: BaseAgent, query: str, user_id: str) -> str:
+        entry = {
+            "key": make_cache_key(agent, query),
+            "agent": agent.name,
+            "query": query,
+            "recorded_at": time.time(),
+        }
+        started = time.perf_counter()
+        try:
+            response = await self.inner.run(agent=agent, query=query, user_id=user_id)
+            entry["response"] = response
+            return response
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            entry["elapsed"] = time.perf_counter() - started
+            await asyncio.to_thread(self._append, entry)
+
+    def _append(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as cassette:
+            cassette.write(line + "\n")
+
+    def stats(self) -> dict:
+        return {**super().stats(), "cassette": self.path, "inner": self.inner.stats()}
+
+
+class ReplayBackend(ModelBackend):
+    """
+    Answers calls from a cassette written by `RecordingBackend`, without any network access.
+
+    Calls are matched by the same content hash as the response cache. When a
+    call was recorded several times the recordings are replayed in order, the
+    last one repeating. With `keep_latency` each replay sleeps for the recorded
+    duration, otherwise it returns immediately so only the code around the
+    model is timed. Recorded errors are raised again.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, keep_latency: bool = False):
+        super().__init__()
+        self.path = path
+        self.keep_latency = keep_latency
+        self._recordings: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._misses = 0
+
+        with open(path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recordings[entry["key"]].append(entry)
+
+    async def _run(self, agent: BaseAgent, query: str, user_id: str) -> str:
+        recordings = self._recordings.get(make_cache_key(agent, query))
+        if not recordings:
+            self._misses += 1
+            raise CassetteMissError(f"No recording of this {agent.name} call in {self.path}")
+
+        entry = recordings.popleft() if len(recordings) > 1 else recordings[0]
+        if self.keep_latency:
+            await asyncio.sleep(entry.get("elapsed", 0))
+        if "error" in entry:
+            raise RuntimeError(f"Replayed error: {entry['error']}")
+        return entry["response"]
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "cassette": self.path,
+            "recorded_calls": sum(len(entries) for entries in self._recordings.values()),
+            "misses": self._misses,
+        }
@@ -1,47 +1,237 @@
-import uuid
+import json
+import time
+import asyncio
+from typing import AsyncIterator
 
 from google.adk.agents import Agent
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
 
-from google.genai import types
+from app.core.config import get_settings
+from .backends import AdkBackend, FakeBackend, ModelBackend
+from .breaker import AgentTimeoutError, CircuitBreaker
+from .budget import PromptBudgeter
+from .cache import ResponseCache, make_cache_key
+from .cassettes import RecordingBackend, ReplayBackend
+from .parsing import output_parser
+from .runners import RunnerRegistry
+from .scheduler import AgentScheduler, CallPriority
+from .sessions import BoundedSessionService
+from .singleflight import SingleFlight
 
 from dotenv import load_dotenv
 load_dotenv()
 
 
-_session_service = InMemorySessionService()
+settings = get_settings()
+
+_session_service = BoundedSessionService(
+    max_sessions=settings.AGENT_SESSION_MAX_SESSIONS,
+    idle_ttl_seconds=settings.AGENT_SESSION_IDLE_TTL_SECONDS
+)
 APP_NAME = "ai_interview_app"
 
-# TODO: Add a session states to each agent and make them run all in the same session
-async def run_agent(agent: Agent, query: str, user_id: int) -> str:
+# One long-lived runner per agent, shared by every call
+runner_registry = RunnerRegistry(app_name=APP_NAME, session_service=_session_service)
+
+
+def _create_backend() -> ModelBackend:
+    """Builds the model backend selected by AGENT_BACKEND."""
+    if settings.AGENT_BACKEND == "fake":
+        return FakeBackend(
+            latency_ms=settings.FAKE_BACKEND_LATENCY_MS,
+            distribution=settings.FAKE_BACKEND_LATENCY_DISTRIBUTION,
+            sigma=settings.FAKE_BACKEND_LATENCY_SIGMA,
+            error_rate=settings.FAKE_BACKEND_ERROR_RATE,
+            malformed_rate=settings.FAKE_BACKEND_MALFORMED_RATE,
+            seed=settings.FAKE_BACKEND_SEED
+        )
+    if settings.AGENT_BACKEND == "replay":
+        return ReplayBackend(path=settings.AGENT_CASSETTE_PATH, keep_latency=settings.AGENT_REPLAY_LATENCY)
+
+    adk_backend = AdkBackend(runner_registry=runner_registry, session_service=_session_service, app_name=APP_NAME)
+    if settings.AGENT_BACKEND == "record":
+        return RecordingBackend(inner=adk_backend, path=settings.AGENT_CASSETTE_PATH)
+    return adk_backend
+
+
+model_backend = _create_backend()
+
+# Opt-in per agent: only agents listed in AGENT_CACHE_TTLS are cached
+response_cache = ResponseCache(
+    memory_size=settings.AGENT_CACHE_MEMORY_SIZE,
+    db_path=settings.AGENT_CACHE_DB_PATH
+)
+
+# Concurrent identical calls share one in-flight model call
+_single_flight = SingleFlight()
+
+# Limits how many model calls run at once and in which order they are admitted
+scheduler = AgentScheduler(
+    max_concurrency=settings.AGENT_MAX_CONCURRENCY,
+    agent_limits=settings.AGENT_CONCURRENCY_LIMITS,
+    rate_per_second=settings.AGENT_RATE_LIMIT_PER_SECOND,
+    burst=settings.AGENT_RATE_LIMIT_BURST
+)
+
+
+# Fails fast while the model is down, and bounds every call by a timeout
+circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+    reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+    default_timeout=settings.AGENT_TIMEOUT_SECONDS,
+    timeouts=settings.AGENT_TIMEOUTS,
+    hedge_delays=settings.AGENT_HEDGE_DELAYS
+)
+
+
+# Keeps each agent's prompt under its token budget, applied by the callers building the prompts
+prompt_budget = PromptBudgeter(
+    budgets=settings.AGENT_PROMPT_TOKEN_BUDGETS,
+    default_budget=settings.AGENT_PROMPT_DEFAULT_TOKEN_BUDGET
+)
+
+
+async def run_agent(agent: Agent, query: str, user_id: int,
+                    priority: CallPriority = CallPriority.INTERACTIVE) -> str:
     """
     A reusable async function to run any ADK agent.
 
-    Handles session creation and the async iteration loop.
+    Concurrent callers with the same agent and query await a single call,
+    e.g. a double-clicked "finish" or a retried request. `priority` decides
+    the order in which the scheduler admits calls once it is saturated.
     """
-    
-    session_id = str(uuid.uuid4()) # Create a new session for each distinct task
-    user_id = str(user_id)
-    # The runner is created on-the-fly for the specific agent
-    runner = Runner(
-        agent=agent,
-        app_name=APP_NAME,
-        session_service=_session_service
+    cache_key = make_cache_key(agent, query)
+    return await _single_flight.do(
+        cache_key,
+        lambda: _run_agent_cached(
+            agent=agent, query=query, user_id=user_id, cache_key=cache_key, priority=priority
+        )
     )
 
-    await _session_service.create_session(
-        app_name=APP_NAME, user_id=user_id, session_id=session_id
+
+async def _run_agent_cached(agent: Agent, query: str, user_id: int, cache_key: str,
+                            priority: CallPriority) -> str:
+    """
+    Serves the response from the cache when the agent has caching enabled
+    and the exact same call was answered before.
+    """
+    ttl = settings.AGENT_CACHE_TTLS.get(agent.name)
+    if not ttl:
+        return await _call_agent(agent=agent, query=query, user_id=user_id, priority=priority)
+
+    cached_response = await response_cache.get(cache_key, agent.name)
+    if cached_response is not None:
+        return cached_response
+
+    started = time.perf_counter()
+    response = await _call_agent(agent=agent, query=query, user_id=user_id, priority=priority)
+
+    if _is_cacheable(agent, response):
+        await response_cache.set(
+            cache_key, agent.name, response, ttl=ttl, elapsed=time.perf_counter() - started
+        )
+    return response
+
+
+async def stream_agent(agent: Agent, query: str, user_id: int,
+                       priority: CallPriority = CallPriority.INTERACTIVE) -> AsyncIterator[str]:
+    """
+    Like `run_agent`, but yields the response in chunks as the model writes it.
+
+    Streams are not shared between concurrent identical calls. A cached
+    response is yielded whole, and a complete response is cached like
+    `run_agent` would. The stream goes through the agent's circuit and
+    must end within the agent's timeout.
+    """
+    cache_key = make_cache_key(agent, query)
+    ttl = settings.AGENT_CACHE_TTLS.get(agent.name)
+    if ttl:
+        cached_response = await response_cache.get(cache_key, agent.name)
+        if cached_response is not None:
+            yield cached_response
+            return
+
+    started = time.perf_counter()
+    chunks = []
+    circuit_breaker.before_call(agent.name)
+    try:
+        async with scheduler.slot(agent.name, priority):
+            circuit_breaker.record_call(agent.name)
+            # The agent's timeout bounds the whole stream, from the moment it got its slot
+            deadline = asyncio.get_running_loop().time() + circuit_breaker.timeout_for(agent.name)
+            stream = model_backend.stream(agent=agent, query=query, user_id=user_id)
+            try:
+                while True:
+                    # Only the wait on the model is under the timeout, never the consumer's code
+                    async with asyncio.timeout_at(deadline):
+                        chunk = await anext(stream, None)
+                    if chunk is None:
+                        break
+                    chunks.append(chunk)
+                    yield chunk
+            finally:
+                await stream.aclose()
+    except TimeoutError:
+        circuit_breaker.record_timeout(agent.name)
+        raise AgentTimeoutError(f"{agent.name} did not finish streaming in time")
+    except Exception:
+        circuit_breaker.record_failure(agent.name)
+        raise
+    except BaseException:
+        # The consumer was cancelled or closed the stream early, e.g. a client disconnect
+        circuit_breaker.record_abandoned(agent.name)
+        raise
+    circuit_breaker.record_success(agent.name)
+
+    response = "".join(chunks)
+    if ttl and _is_cacheable(agent, response):
+        await response_cache.set(
+            cache_key, agent.name, response, ttl=ttl, elapsed=time.perf_counter() - started
+        )
+
+
+def _is_cacheable(agent: Agent, response: str) -> bool:
+    """Never cache empty responses, nor broken JSON from an agent that must return JSON."""
+    if not response:
+        return False
+
+    config = getattr(agent, "generate_content_config", None)
+    if config is None or config.response_mime_type != "application/json":
+        return True
+    try:
+        json.loads(response)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+async def _call_agent(agent: Agent, query: str, user_id: int, priority: CallPriority) -> str:
+    """
+    Runs the agent on the configured model backend once the scheduler admits the call.
+    The circuit breaker rejects the call up front while the agent is failing, and
+    its timeout starts once the call got its slot. A hedge only runs on a slot
+    that is free right away.
+    """
+    async def attempt() -> str:
+        return await model_backend.run(agent=agent, query=query, user_id=user_id)
+
+    return await circuit_breaker.call(
+        agent.name, attempt,
+        admission=lambda: scheduler.slot(agent.name, priority),
+        hedge_admission=lambda: scheduler.try_slot(agent.name)
     )
 
-    content = types.Content(role='user', parts=[types.Part(text=query)])
-
-    # The async loop to get the final response
-    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
-        if event.is_final_response():
-            if event.content and event.content.parts:
-                final_response_text = event.content.parts[0].text
-                return final_response_text
-    
-    # Fallback in case the loop finishes without a final response
-    return ""
+
+def agent_stats() -> dict:
+    """Returns the counters of every layer `run_agent` goes through."""
+    return {
+        "backend": model_backend.stats(),
+        "runners": runner_registry.stats(),
+        "sessions": _session_service.stats(),
+        "cache": response_cache.stats(),
+        "single_flight": _single_flight.stats(),
+        "scheduler": scheduler.stats(),
+        "prompt_budget": prompt_budget.stats(),
+        "output_parsing": output_parser.stats(),
+        "circuit_breaker": circuit_breaker.stats(),
+    }
+
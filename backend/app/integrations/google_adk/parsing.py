@@ -0,0 +1,257 @@
+import re
+import json
+import logging
+from collections import defaultdict
+from typing import List, Optional, Type, TypeVar, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger('uvicorn.error')
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+
+class JsonArrayStreamParser:
+    """
+    Picks the complete items of a JSON array out of a response that is still
+    being streamed, e.g. each question of `{"questions": [{...}, {...`.
+
+    Feed it the chunks in order; each call returns the objects that were
+    completed by that chunk. The items are those of the first array nested
+    directly in the top-level object (or of a top-level array). Text around
+    the JSON, like markdown fences, is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._item_start = None
+        self._position = 0
+        self._array_depth = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        items = []
+        for char in chunk:
+            self._buffer.append(char)
+            item = self._step(char)
+            if item is not None:
+                items.append(item)
+            self._position += 1
+        return items
+
+    def _step(self, char: str):
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+            return None
+
+        if char == '"':
+            self._in_string = True
+        elif char in "{[":
+            if char == "[" and self._array_depth is None and self._stack in ([], ["{"]):
+                self._array_depth = len(self._stack) + 1
+            elif char == "{" and self._array_depth == len(self._stack) and self._stack[-1] == "[":
+                self._item_start = self._position
+            self._stack.append(char)
+        elif char in "}]" and self._stack:
+            self._stack.pop()
+            if char == "}" and self._item_start is not None and len(self._stack) == self._array_depth:
+                text = "".join(self._buffer[self._item_start:self._position + 1])
+                self._item_start = None
+                return self._load(text)
+        return None
+
+    @staticmethod
+    def _load(text: str):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping a streamed item that is not valid JSON: {e}")
+            return None
+        return item if isinstance(item, dict) else None
+
+
+class AgentOutputError(ValueError):
+    """Raised when an agent's output cannot be parsed, repaired nor salvaged."""
+
+
+def extract_json_text(text: str) -> str:
+    """Strips markdown fences and any prose before the first JSON object or array."""
+    text = (text or "").strip()
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    return text[min(starts):] if starts else text
+
+
+def _closing(stack: List[str]) -> str:
+    return "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+
+
+def repair_json(text: str) -> str:
+    """
+    Best-effort repair of a JSON document: drops trailing commas and any text
+    after the document, and closes what a truncated document left open. An
+    incomplete last member is dropped when closing it is not enough.
+    """
+    out = []
+    stack: List[str] = []
+    in_string = escaped = False
+    # The last point where the text can be cut and closed: (length of out, open containers)
+    cut = None
+
+    for char in text:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "{[":
+            stack.append(char)
+            out.append(char)
+            cut = (len(out), list(stack))
+        elif char in "}]":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                return "".join(out)
+            cut = (len(out), list(stack))
+        elif char == ",":
+            cut = (len(out), list(stack))
+            out.append(char)
+        else:
+            out.append(char)
+
+    # Truncated: first try to simply close everything, else fall back to the last cut
+    tail = "".join(out).rstrip().rstrip(",")
+    candidate = tail + ('"' if in_string else "") + _closing(stack)
+    try:
+        json.loads(candidate)
+        return candidate
+    except json.JSONDecodeError:
+        pass
+    if cut is None:
+        return candidate
+    length, open_stack = cut
+    return "".join(out[:length]).rstrip().rstrip(",") + _closing(open_stack)
+
+
+def _list_fields(schema: Type[BaseModel]) -> List[tuple]:
+    """Returns (name, item schema) for the fields of `schema` that are lists of models."""
+    fields = []
+    for name, field in schema.model_fields.items():
+        args = get_args(field.annotation)
+        if get_origin(field.annotation) in (list, List) and args \
+                and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            fields.append((name, args[0]))
+    return fields
+
+
+class AgentOutputParser:
+    """
+    Parses agent outputs into their pydantic output schemas, repairing them
+    when needed instead of failing the request.
+
+    Tries, in order: the raw text; the text without fences and closed if it was
+    truncated; and for schemas holding a list of items, the items that are
+    complete and valid on their own. Counts per agent how often each step was
+    needed, and how often a caller had to call the model again anyway.
+    """
+
+    def __init__(self):
+        self._stats = defaultdict(lambda: {"clean": 0, "repaired": 0, "salvaged": 0, "failed": 0, "recalls": 0})
+
+    def parse(self, agent_name: str, text: str, schema: Type[SchemaT]) -> SchemaT:
+        stats = self._stats[agent_name]
+        try:
+            parsed = schema.model_validate(json.loads(text))
+            stats["clean"] += 1
+            return parsed
+        except (json.JSONDecodeError, TypeError, ValidationError):
+            pass
+
+        candidate = extract_json_text(text)
+        data = None
+        try:
+            data = json.loads(repair_json(candidate))
+            parsed = schema.model_validate(data)
+            stats["repaired"] += 1
+            logger.info(f"Repaired the output of {agent_name}")
+            return parsed
+        except (json.JSONDecodeError, ValidationError):
+            pass
+
+        salvaged = self._salvage(candidate, data, schema)
+        if salvaged is not None:
+            stats["salvaged"] += 1
+            logger.info(f"Salvaged the complete items of a broken {agent_name} output")
+            return salvaged
+
+        stats["failed"] += 1
+        raise AgentOutputError(f"The output of {agent_name} could not be parsed nor repaired")
+
+    @staticmethod
+    def _salvage(candidate: str, data, schema: Type[SchemaT]) -> Optional[SchemaT]:
+        """Keeps the valid items of the first list field, when that is all the schema needs."""
+        list_fields = _list_fields(schema)
+        if len(list_fields) != 1:
+            return None
+        name, item_schema = list_fields[0]
+
+        if isinstance(data, dict) and isinstance(data.get(name), list):
+            items = data[name]
+        else:
+            items = JsonArrayStreamParser().feed(candidate)
+
+        valid_items = []
+        for item in items:
+            try:
+                valid_items.append(item_schema.model_validate(item))
+            except ValidationError:
+                continue
+        if not valid_items:
+            return None
+        try:
+            return schema.model_validate({name: [item.model_dump() for item in valid_items]})
+        except ValidationError:
+            return None
+
+    def record_recall(self, agent_name: str) -> None:
+        """Counts a model call repeated because the previous output could not be used."""
+        self._stats[agent_name]["recalls"] += 1
+
+    def stats(self) -> dict:
+        """Returns the parse outcomes per agent and the share of broken outputs saved without a new call."""
+        result = {}
+        for agent_name, stats in self._stats.items():
+            broken = stats["repaired"] + stats["salvaged"] + stats["failed"]
+            result[agent_name] = {
+                **stats,
+                "repair_rate": (stats["repaired"] + stats["salvaged"]) / broken if broken else 0.0,
+            }
+        return result
+
+
+output_parser = AgentOutputParser()
@@ -0,0 +1,70 @@
+import time
+import threading
+from typing import Dict, Iterable
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+
+
+class RunnerRegistry:
+    """
+    Keeps one long-lived `Runner` per agent.
+
+    A `Runner` holds no per-invocation state (that lives in the session), so a
+    single instance can be shared by every coroutine that runs the same agent.
+    Runners are built once, either eagerly through `warm_up` at startup or
+    lazily on the first call for an agent.
+    """
+
+    def __init__(self, app_name: str, session_service: BaseSessionService):
+        self.app_name = app_name
+        self.session_service = session_service
+
+        self._runners: Dict[str, Runner] = {}
+        # Guards the build step so two threads never build the same runner twice.
+        self._lock = threading.Lock()
+
+        self._build_seconds: Dict[str, float] = {}
+        self._lookups = 0
+        self._lookup_seconds = 0.0
+
+    def get(self, agent: BaseAgent) -> Runner:
+        """Returns the shared runner for `agent`, building it on first use."""
+        started = time.perf_counter()
+
+        runner = self._runners.get(agent.name)
+        if runner is None:
+            with self._lock:
+                runner = self._runners.get(agent.name)
+                if runner is None:
+                    runner = self._build(agent)
+
+        self._lookups += 1
+        self._lookup_seconds += time.perf_counter() - started
+        return runner
+
+    def warm_up(self, agents: Iterable[BaseAgent]) -> None:
+        """Builds the runners for `agents` ahead of the first request."""
+        for agent in agents:
+            self.get(agent)
+
+    def _build(self, agent: BaseAgent) -> Runner:
+        started = time.perf_counter()
+        runner = Runner(
+            agent=agent,
+            app_name=self.app_name,
+            session_service=self.session_service
+        )
+        self._build_seconds[agent.name] = time.perf_counter() - started
+        self._runners[agent.name] = runner
+        return runner
+
+    def stats(self) -> dict:
+        """Returns the registry counters, used by the benchmarks and health checks."""
+        return {
+            "runners": len(self._runners),
+            "build_seconds": dict(self._build_seconds),
+            "lookups": self._lookups,
+            "avg_lookup_seconds": self._lookup_seconds / self._lookups if self._lookups else 0.0,
+        }
@@ -0,0 +1,198 @@
+import time
+import heapq
+import asyncio
+import itertools
+from enum import IntEnum
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+
+class CallPriority(IntEnum):
+    """
+    Priority classes of model calls, lower values are served first.
+    """
+    INTERACTIVE = 0   # A user is waiting on the response, e.g. starting or finishing an interview
+    BACKGROUND = 1    # Nobody is blocked on it, e.g. CV parsing or speculative work
+
+
+class _PriorityLimiter:
+    """A semaphore whose waiters are woken up by priority, then in arrival order."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    def queued(self, priority: Optional[int] = None) -> int:
+        return sum(
+            1 for p, _, future in self._waiters
+            if not future.done() and (priority is None or p == priority)
+        )
+
+    def try_acquire(self) -> bool:
+        """Takes a slot if one is free and nobody is waiting for it."""
+        if self.active < self.limit and not self.queued():
+            self.active += 1
+            return True
+        return False
+
+    async def acquire(self, priority: int) -> None:
+        if self.try_acquire():
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the cancellation
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter so nobody can jump the queue
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class _TokenBucket:
+    """Allows `rate` calls per second on average with bursts of up to `burst` calls."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available right now."""
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AgentScheduler:
+    """
+    Admission control for model calls.
+
+    A call first waits for a slot under its agent's concurrency limit, then
+    for a slot under the global limit, then for a rate-limit token. Both
+    limits serve waiting calls by priority, so a burst of background CV
+    parsing can't starve interactive calls.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        agent_limits: Optional[Dict[str, int]] = None,
+        rate_per_second: float = 0.0,
+        burst: int = 1,
+    ):
+        self._global = _PriorityLimiter(max_concurrency)
+        self._agent_limits = agent_limits or {}
+        self._agents: Dict[str, _PriorityLimiter] = {}
+        self._bucket = _TokenBucket(rate=rate_per_second, burst=burst)
+
+        self._waits: Dict[str, Dict[str, float]] = {
+            priority.name: {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            for priority in CallPriority
+        }
+
+    def _agent_limiter(self, agent_name: str) -> Optional[_PriorityLimiter]:
+        limit = self._agent_limits.get(agent_name)
+        if not limit:
+            return None
+        if agent_name not in self._agents:
+            self._agents[agent_name] = _PriorityLimiter(limit)
+        return self._agents[agent_name]
+
+    @asynccontextmanager
+    async def slot(self, agent_name: str, priority: CallPriority = CallPriority.INTERACTIVE) -> AsyncIterator[None]:
+        """Waits until the call is allowed to run and holds its slots for the duration."""
+        started = time.monotonic()
+        agent_limiter = self._agent_limiter(agent_name)
+
+        if agent_limiter:
+            await agent_limiter.acquire(priority)
+        try:
+            await self._global.acquire(priority)
+            try:
+                await self._bucket.acquire()
+                self._record_wait(priority, time.monotonic() - started)
+                yield
+            finally:
+                self._global.release()
+        finally:
+            if agent_limiter:
+                agent_limiter.release()
+
+    def try_slot(self, agent_name: str) -> Optional[Callable[[], None]]:
+        """
+        Takes the agent's slots if they are free right now and no call is queued
+        for them, and returns the function that releases them, else None.
+        For extra work that should only run on spare capacity, e.g. a hedge.
+        """
+        agent_limiter = self._agent_limiter(agent_name)
+        if agent_limiter and not agent_limiter.try_acquire():
+            return None
+
+        def release() -> None:
+            self._global.release()
+            if agent_limiter:
+                agent_limiter.release()
+
+        if not self._global.try_acquire():
+            if agent_limiter:
+                agent_limiter.release()
+            return None
+        if not self._bucket.try_acquire():
+            release()
+            return None
+        return release
+
+    def _record_wait(self, priority: CallPriority, seconds: float) -> None:
+        waits = self._waits[priority.name]
+        waits["calls"] += 1
+        waits["total_seconds"] += seconds
+        waits["max_seconds"] = max(waits["max_seconds"], seconds)
+
+    def stats(self) -> dict:
+        """Returns queue depth, in-flight calls and wait times per priority."""
+        return {
+            "in_flight": self._global.active,
+            "max_concurrency": self._global.limit,
+            "queue_depth": {
+                priority.name: self._global.queued(priority) + sum(
+                    limiter.queued(priority) for limiter in self._agents.values()
+                )
+                for priority in CallPriority
+            },
+            "agents": {
+                name: {"in_flight": limiter.active, "limit": limiter.limit, "queued": limiter.queued()}
+                for name, limiter in self._agents.items()
+            },
+            "wait": {
+                name: {
+                    "calls": waits["calls"],
+                    "avg_seconds": waits["total_seconds"] / waits["calls"] if waits["calls"] else 0.0,
+                    "max_seconds": waits["max_seconds"],
+                }
+                for name, waits in self._waits.items()
+            },
+        }
@@ -0,0 +1,134 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+SessionKey = Tuple[str, str, str]
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    An in-memory session service with a size limit and an idle TTL.
+
+    Sessions are kept in least-recently-used order. Creating a session first
+    drops every session idle for longer than `idle_ttl_seconds`, then evicts
+    the least recently used ones until there is room for the new one.
+    One-shot callers should still delete their session once they are done.
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl_seconds: float = 900):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+
+        # (app_name, user_id, session_id) -> last access time, oldest first
+        self._last_access: "OrderedDict[SessionKey, float]" = OrderedDict()
+        self._bytes: dict[SessionKey, int] = {}
+
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+        self._deleted = 0
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        self._evict(room_for=1)
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._touch(key)
+        self._bytes[key] = 0
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        if self._is_expired(key):
+            self._drop(key)
+            self._evicted_ttl += 1
+            return None
+
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch(key)
+        return session
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        if key in self._last_access:
+            self._deleted += 1
+        self._drop(key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+
+        key = (session.app_name, session.user_id, session.id)
+        if key in self._last_access:
+            self._touch(key)
+            self._bytes[key] += len(event.model_dump_json(exclude_none=True))
+        return event
+
+    def _touch(self, key: SessionKey) -> None:
+        self._last_access[key] = time.monotonic()
+        self._last_access.move_to_end(key)
+
+    def _is_expired(self, key: SessionKey) -> bool:
+        last_access = self._last_access.get(key)
+        return last_access is not None and time.monotonic() - last_access > self.idle_ttl_seconds
+
+    def _evict(self, room_for: int = 0) -> None:
+        """Drops idle sessions, then the least recently used ones if still over the limit."""
+        now = time.monotonic()
+        while self._last_access:
+            key, last_access = next(iter(self._last_access.items()))
+            if now - last_access <= self.idle_ttl_seconds:
+                break
+            self._drop(key)
+            self._evicted_ttl += 1
+
+        while self._last_access and len(self._last_access) + room_for > self.max_sessions:
+            key = next(iter(self._last_access))
+            self._drop(key)
+            self._evicted_lru += 1
+
+    def _drop(self, key: SessionKey) -> None:
+        app_name, user_id, session_id = key
+        self._last_access.pop(key, None)
+        self._bytes.pop(key, None)
+
+        user_sessions = self.sessions.get(app_name, {}).get(user_id)
+        if user_sessions is None:
+            return
+        user_sessions.pop(session_id, None)
+        # Don't leave an empty dict behind for every user that ever called an agent
+        if not user_sessions:
+            self.sessions[app_name].pop(user_id, None)
+
+    def stats(self) -> dict:
+        """Returns the live session and memory counters."""
+        return {
+            "live_sessions": len(self._last_access),
+            "bytes_held": sum(self._bytes.values()),
+            "max_sessions": self.max_sessions,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "evicted_lru": self._evicted_lru,
+            "evicted_ttl": self._evicted_ttl,
+            "deleted": self._deleted,
+        }
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """One in-flight call and the number of callers still waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key.
+
+    The first caller for a key starts the call as a separate task, and every
+    caller that arrives while it runs awaits that same task. A caller that gets
+    cancelled (e.g. its client disconnected) only stops waiting; the shared
+    call keeps running for the others and is cancelled only once nobody is
+    left waiting for it.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+        self._calls = 0
+        self._coalesced = 0
+        self._abandoned = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Runs `fn` once for all concurrent callers of `key` and returns its result."""
+        self._calls += 1
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self._coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # The shield keeps a cancelled caller from cancelling the shared task
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+                # Right away rather than once the task is done, a caller arriving meanwhile would join a cancelled call
+                self._forget(key, flight)
+                self._abandoned += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        # A newer flight may already be registered under the same key
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict:
+        """Returns how many calls were made and how many of them were coalesced."""
+        return {
+            "calls": self._calls,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._flights),
+            "abandoned": self._abandoned,
+        }
@@ -15,9 +15,17 @@ from app.routes.v2 import base as base_v2
 from app.routes.v2 import users as users_v2
 from app.routes.v2 import cvs as cvs_v2
 from app.routes.v2 import interviews as interviews_v2
+from app.routes.v2 import jobs as jobs_v2
 
 from app.core import db
+from app.integrations.google_adk.agents import ALL_AGENTS
+from app.integrations.google_adk.client import runner_registry
+from app.services.job_service import job_queue
+from app.services.interview_service import clear_interrupted_question_streams
+from app.services.question_bank_service import question_bank
+from app.services.write_service import write_coordinator
 from app.core.config import get_settings
+import asyncio
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -34,8 +42,37 @@ async def lifespan(app: FastAPI):
 
     logger.info("Connected to database")
 
+    cleared = clear_interrupted_question_streams()
+    if cleared:
+        logger.info(f"Stopped waiting for the questions of {cleared} interviews interrupted by the last shutdown")
+
+    runner_registry.warm_up(ALL_AGENTS)
+    logger.info("Agent runners are ready")
+
+    await job_queue.start()
+    logger.info("Job workers started")
+
+    bank_warm_up = None
+    if get_settings().QUESTION_BANK_ENABLED:
+        # Indexes the past questions in the background, not on the first interview that needs them
+        bank_warm_up = asyncio.create_task(question_bank.sync())
+
+    maintenance = None
+    interval = get_settings().SQLITE_MAINTENANCE_INTERVAL_SECONDS
+    if db.engine.dialect.name == "sqlite" and interval > 0:
+        maintenance = asyncio.create_task(db.sqlite_maintenance_loop(interval))
+
     yield
 
+    for task in (maintenance, bank_warm_up):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    await job_queue.stop()
+    await write_coordinator.stop()
+    # aiosqlite connections run on their own threads, which would keep the process alive
+    await db.async_engine.dispose()
+
     
 
 app = FastAPI(
@@ -87,4 +124,5 @@ app.include_router(interviews_v1.interviews_router, prefix="/api/v1")
 app.include_router(base_v2.base_router, prefix="/api/v2")
 app.include_router(users_v2.users_router, prefix="/api/v2")
 app.include_router(cvs_v2.cvs_router, prefix="/api/v2")
-app.include_router(interviews_v2.interviews_router, prefix="/api/v2")
\ No newline at end of file
+app.include_router(interviews_v2.interviews_router, prefix="/api/v2")
+app.include_router(jobs_v2.jobs_router, prefix="/api/v2")
\ No newline at end of file
@@ -1,4 +1,5 @@
 from app.models.db_schemes.interview.schemes import (
     User, Cv, Interview,
-    Question, Answer, Report, Base, Topic, question_topic_table
+    Question, Answer, Report, Base, Topic, question_topic_table,
+    Job
 )
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""Add indexes for the hot queries
+
+Revision ID: b51f0d7e2c94
+Revises: a3c9e41f7b20
+Create Date: 2025-10-19 11:24:37.812540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b51f0d7e2c94'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e41f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_questions_interview_id_order', 'questions', ['interview_id', 'order'], unique=False)
+    op.create_index(op.f('ix_answers_question_id'), 'answers', ['question_id'], unique=False)
+    op.create_index('ix_interviews_user_id_created_at', 'interviews', ['user_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_interviews_cv_id'), 'interviews', ['cv_id'], unique=False)
+    op.create_index(op.f('ix_cvs_user_id'), 'cvs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_reports_interview_id'), 'reports', ['interview_id'], unique=False)
+    op.create_index('ix_topics_lower_name', 'topics', [sa.text('lower(name)')], unique=False)
+    # Let the query planner see the new indexes' statistics
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_topics_lower_name', table_name='topics')
+    op.drop_index(op.f('ix_reports_interview_id'), table_name='reports')
+    op.drop_index(op.f('ix_cvs_user_id'), table_name='cvs')
+    op.drop_index(op.f('ix_interviews_cv_id'), table_name='interviews')
+    op.drop_index('ix_interviews_user_id_created_at', table_name='interviews')
+    op.drop_index(op.f('ix_answers_question_id'), table_name='answers')
+    op.drop_index('ix_questions_interview_id_order', table_name='questions')
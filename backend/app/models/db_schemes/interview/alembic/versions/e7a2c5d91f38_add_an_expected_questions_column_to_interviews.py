@@ -0,0 +1,28 @@
+"""Add an expected_questions column to the interviews table
+
+Revision ID: e7a2c5d91f38
+Revises: b51f0d7e2c94
+Create Date: 2025-10-20 09:41:12.305718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c5d91f38'
+down_revision: Union[str, Sequence[str], None] = 'b51f0d7e2c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('interviews', sa.Column('expected_questions', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('interviews', 'expected_questions')
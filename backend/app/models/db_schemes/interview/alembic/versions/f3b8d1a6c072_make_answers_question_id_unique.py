@@ -0,0 +1,32 @@
+"""Make answers.question_id unique
+
+Revision ID: f3b8d1a6c072
+Revises: e7a2c5d91f38
+Create Date: 2025-10-20 14:06:53.218447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1a6c072'
+down_revision: Union[str, Sequence[str], None] = 'e7a2c5d91f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the first answer of the questions that were answered twice
+    op.execute("DELETE FROM answers WHERE id NOT IN (SELECT MIN(id) FROM answers GROUP BY question_id)")
+    op.drop_index(op.f('ix_answers_question_id'), table_name='answers')
+    op.create_index(op.f('ix_answers_question_id'), 'answers', ['question_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_answers_question_id'), table_name='answers')
+    op.create_index(op.f('ix_answers_question_id'), 'answers', ['question_id'], unique=False)
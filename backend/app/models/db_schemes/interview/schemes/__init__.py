@@ -6,4 +6,5 @@ from .question import Question
 from .report import Report
 from .answer import Answer
 from .topic import Topic
-from .question_topic_association import question_topic_table
\ No newline at end of file
+from .question_topic_association import question_topic_table
+from .job import Job
\ No newline at end of file
@@ -8,7 +8,8 @@ class Answer(Base):
     __tablename__ = "answers"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    # A question is answered once
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True, unique=True)
 
     user_answer = Column(Text, nullable=False)
     audio_path = Column(String, nullable=True)
@@ -8,7 +8,7 @@ class Cv(Base):
     __tablename__ = "cvs"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     raw_text = Column(Text, nullable=False)
     file_path = Column(String)
@@ -1,5 +1,5 @@
 from sqlalchemy import (Column, Integer, DateTime, func,
-                         String, ForeignKey, Enum, Float, JSON)
+                         String, ForeignKey, Enum, Float, JSON, Index)
 from sqlalchemy.orm import relationship
 
 from app.models.enums.InterviewEnums import InterviewStatus, InterviewDecision, InterviewMode
@@ -8,10 +8,14 @@ from app.core.db import Base
 class Interview(Base):
     
     __tablename__ = "interviews"
+    __table_args__ = (
+        # A user's interviews, newest last
+        Index("ix_interviews_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="CASCADE"), nullable=False)
+    cv_id = Column(Integer, ForeignKey("cvs.id", ondelete="CASCADE"), nullable=False, index=True)
 
     job_title = Column(String, nullable=False)
     job_description = Column(String, nullable=True)
@@ -20,6 +24,8 @@ class Interview(Base):
     final_score = Column(Float, nullable=True)
     decision = Column(Enum(InterviewDecision), nullable=True)
     status = Column(Enum(InterviewStatus), default=InterviewStatus.IN_PROGRESS.value, nullable=False)
+    # How many questions the interview will have while they are still being generated, NULL once they all are
+    expected_questions = Column(Integer, nullable=True)
 
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
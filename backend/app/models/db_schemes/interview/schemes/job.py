@@ -0,0 +1,25 @@
+from sqlalchemy import (Column, Integer, DateTime, func,
+                         String, Enum, Text, JSON)
+
+from app.models.enums.JobEnums import JobStatus
+from app.core.db import Base
+
+class Job(Base):
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED.value, nullable=False, index=True)
+
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
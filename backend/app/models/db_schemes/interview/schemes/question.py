@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text, Float, Enum
+from sqlalchemy import Column, Integer, ForeignKey, Text, Float, Enum, Index
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -8,6 +8,10 @@ from .question_topic_association import question_topic_table
 class Question(Base):
     
     __tablename__ = "questions"
+    __table_args__ = (
+        # An interview's questions in order, e.g. its next unanswered one
+        Index("ix_questions_interview_id_order", "interview_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
@@ -12,7 +12,7 @@ class Report(Base):
     __tablename__ = "reports"
 
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
+    interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False, index=True)
 
     content = Column(Text, nullable=False)
     strengths = Column(JSON, nullable=True)
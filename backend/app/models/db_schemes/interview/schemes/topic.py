@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index, func
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -11,4 +11,9 @@ class Topic(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
 
+    __table_args__ = (
+        # Topics are looked up by func.lower(Topic.name), which the unique index on name can't serve
+        Index("ix_topics_lower_name", func.lower(name)),
+    )
+
     questions = relationship("Question", secondary=question_topic_table, back_populates="topics")
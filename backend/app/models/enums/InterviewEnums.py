@@ -30,3 +30,14 @@ class InterviewMode(str, Enum):
             return random.randint(6, 10)
         elif self == self.HARD:
             return random.randint(11, 15)
+
+    def get_max_question_count(self) -> int:
+        """
+        Returns the largest number of questions the mode can ask.
+        """
+        if self == self.EASY:
+            return 5
+        elif self == self.MEDIUM:
+            return 10
+        elif self == self.HARD:
+            return 15
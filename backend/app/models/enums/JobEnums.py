@@ -0,0 +1,11 @@
+from enum import Enum
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class JobKind(str, Enum):
+    START_INTERVIEW = "start_interview"
+    FINISH_INTERVIEW = "finish_interview"
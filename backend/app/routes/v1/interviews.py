@@ -8,6 +8,7 @@ from app.schemes.answers_schemes import AnswerOut, AnswerCreate
 
 
 from app.services.interview_service import InterviewService
+from app.services.async_interview_service import AsyncInterviewService
 
 
 interviews_router = APIRouter(
@@ -30,19 +31,19 @@ async def start_interview(
 @interviews_router.get("/{interview_id}/next-question", response_model=Union[QuestionOut, dict])
 async def get_next_question(
     interview_id: int,
-    interview_service: InterviewService = Depends()
+    interview_service: AsyncInterviewService = Depends()
 ):
     """
     Retrieves the next unanswered question for an ongoing interview.
     """
-    return interview_service.get_next_question(interview_id=interview_id)
+    return await interview_service.get_next_question(interview_id=interview_id)
 
 
 @interviews_router.post("/{interview_id}/answers", response_model=AnswerOut)
 async def submit_answer(
     interview_id: int,
     answer_data: AnswerCreate,
-    interview_service: InterviewService = Depends()
+    interview_service: AsyncInterviewService = Depends()
 ):
     """
     Submits a user's answer for a specific question.
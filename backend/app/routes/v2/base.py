@@ -1,6 +1,14 @@
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from app.core.config import get_settings, Settings
+from app.integrations.google_adk.client import agent_stats
+from app.services.research_service import research_stats
+from app.services.job_service import job_queue
+from app.services.progress_service import progress_broker
+from app.services.interview_service import question_generation_stats
+from app.services.question_bank_service import question_bank
+from app.services.pregeneration_service import question_pregenerator
+from app.services.write_service import write_coordinator
 
 class RootResponse(BaseModel):
     app_name: str
@@ -19,6 +27,18 @@ def health_check():
     """Confirms the API is alive and responding."""
     return {"status": "ok"}
 
+@base_router.get(
+    "/health/agents",
+    summary="Agent Client Metrics",
+    description="Returns the runner, session, call, circuit breaker, research cache, job queue, job stage, question generation, question bank, pre-generation and group commit counters of the AI agent client."
+)
+def agent_health():
+    """Exposes the agent client counters so they can be scraped and sized."""
+    return {**agent_stats(), "research_cache": research_stats(), "jobs": job_queue.stats(),
+            "progress": progress_broker.stats(), "question_generation": question_generation_stats(),
+            "question_bank": question_bank.stats(), "question_pregeneration": question_pregenerator.stats(),
+            "writes": write_coordinator.stats()}
+
 @base_router.get(
     "/",
     response_model=RootResponse,
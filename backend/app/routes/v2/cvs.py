@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, File, UploadFile, status, Query
 from app.schemes.cv_schemes import CvOut
 from app.services.cv_service import CVService
+from app.services.interview_service import speculate_interview_questions
+from app.models.enums.InterviewEnums import InterviewMode
+from app.core.config import get_settings
 from app.schemes.response_schemes import OperationResponse
 from app.models.enums.ResponseEnums import OperationStatus
 from typing import List
@@ -12,8 +15,13 @@ cvs_router = APIRouter(
 
 @cvs_router.post("/upload", response_model=CvOut, status_code=status.HTTP_201_CREATED)
 async def upload_cv(
+    background_tasks: BackgroundTasks,
     user_id: int = Form(...),
     file: UploadFile = File(...),
+    job_title: str | None = Form(None),
+    job_description: str | None = Form(None),
+    skills_to_foucs: List[str] | None = Form(None),
+    mode: InterviewMode | None = Form(None),
     cv_service: CVService = Depends()
 ):
     """
@@ -21,9 +29,24 @@ async def upload_cv(
 
     The CVService orchestrates the entire process of validation, storage,
     text parsing, and database record creation, including cleanup on failure.
+
+    With QUESTION_PREGENERATION enabled, the questions of the next interview
+    are generated in the background for the target role given here, or for
+    the role of the user's last interview.
     """
     new_cv = await cv_service.process_and_create_cv(user_id=user_id, file=file)
 
+    if get_settings().QUESTION_PREGENERATION:
+        background_tasks.add_task(
+            speculate_interview_questions,
+            user_id=user_id,
+            cv_id=new_cv.id,
+            job_title=job_title,
+            job_description=job_description,
+            skills_to_foucs=skills_to_foucs,
+            mode=mode
+        )
+
     return new_cv
 
 @cvs_router.get("/user", response_model=List[CvOut])
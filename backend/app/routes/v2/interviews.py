@@ -1,15 +1,26 @@
+import json
+import time
+from contextlib import aclosing
 from typing import Union, List
 
-from fastapi import APIRouter, Depends, status, BackgroundTasks
+from fastapi import APIRouter, Depends, status, BackgroundTasks, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 
 from app.schemes.interview_schemes import InterviewCreate, InterviewOut
 from app.schemes.questions_schemes import NextQuestionResponse
 from app.schemes.response_schemes import OperationResponse
 from app.schemes.answers_schemes import AnswerOut, AnswerCreate
+from app.schemes.job_schemes import JobOut
 
 from app.models.enums.ResponseEnums import OperationStatus
 
 from app.services.interview_service import InterviewService
+from app.services.async_interview_service import AsyncInterviewService
+from app.services.job_service import get_job_by_id, get_job_by_id_async, finished_job_event
+from app.services.progress_service import progress_broker
+from app.core.config import get_settings
+from app.core.db import get_db, AsyncSessionLocal
 
 
 interviews_router = APIRouter(
@@ -28,49 +39,124 @@ async def start_interview(
     """
     return await interview_service.start_new_interview(interview_data=interview_data)
 
+@interviews_router.post("/start/async", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+async def start_interview_async(
+    interview_data: InterviewCreate,
+    response: Response,
+    interview_service: InterviewService = Depends()
+):
+    """
+    Validates the inputs and queues the question generation. Poll the returned
+    job for the new interview's id.
+    """
+    job = interview_service.queue_new_interview(interview_data=interview_data)
+    response.headers["Location"] = f"/api/v2/jobs/{job.id}"
+    return job
+
+@interviews_router.get("/jobs/{job_id}/events")
+async def stream_job_progress(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Streams the stages of an interview start or finish job as Server-Sent Events,
+    from cv_loaded to email_queued, each with its own and the total elapsed time.
+    The stream ends with a succeeded or failed event, or after
+    PROGRESS_STREAM_MAX_SECONDS, when the client should reconnect.
+    """
+    job = get_job_by_id(db, job_id)
+    channel = progress_broker.get(job_id)
+    finished_event = finished_job_event(job)
+
+    if channel is None and finished_event is not None:
+        # Finished before this process started, or long enough ago to be forgotten
+        async def event_generator():
+            yield _format_sse(finished_event)
+    else:
+        channel = channel or progress_broker.open(job_id)
+        settings = get_settings()
+        deadline = time.monotonic() + settings.PROGRESS_STREAM_MAX_SECONDS
+
+        async def event_generator():
+            async with aclosing(channel.subscribe(keepalive=settings.PROGRESS_KEEPALIVE_SECONDS)) as events:
+                async for event in events:
+                    if event is not None:
+                        yield _format_sse(event)
+                        continue
+
+                    # A quiet channel may miss the end of the job, e.g. when another
+                    # process worked it, so look at the stored status as well
+                    async with AsyncSessionLocal() as async_db:
+                        stored_job = await get_job_by_id_async(async_db, job_id)
+                    if stored_job is None:
+                        return
+                    stored_event = finished_job_event(stored_job)
+                    if stored_event is not None:
+                        yield _format_sse(stored_event)
+                        return
+                    if time.monotonic() >= deadline:
+                        return
+                    # Comment lines keep proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+def _format_sse(event: dict) -> str:
+    return f"event: {event['stage']}\ndata: {json.dumps(event, default=str)}\n\n"
+
 @interviews_router.get("/", response_model=List[InterviewOut])
 async def get_all_interviews(
     user_id: int,
-    interview_service: InterviewService = Depends(),
+    interview_service: AsyncInterviewService = Depends(),
 ):
     """
     Retrieves a list of all past interviews for the current user.
     """
-    return interview_service.get_all_interviews_for_user(user_id=user_id)
+    return await interview_service.get_all_interviews_for_user(user_id=user_id)
 
 @interviews_router.get("/{interview_id}", response_model=InterviewOut)
 async def get_interview_by_id(
     interview_id: int,
-    interview_service: InterviewService = Depends()
+    interview_service: AsyncInterviewService = Depends()
 ):
     """
     Fetch a specific interview by its ID including all related data.
     """
-    return interview_service.get_interview_by_id(interview_id=interview_id)
+    return await interview_service.get_interview_by_id(interview_id=interview_id)
 
 @interviews_router.get("/{interview_id}/next-question", response_model=Union[NextQuestionResponse, dict])
 async def get_next_question(
     interview_id: int,
-    interview_service: InterviewService = Depends()
+    interview_service: AsyncInterviewService = Depends()
 ):
     """
-    Retrieves the next unanswered question for an ongoing interview.
+    Retrieves the next unanswered question for an ongoing interview, waiting
+    briefly if it is still being generated.
     """
-    return interview_service.get_next_question(interview_id=interview_id)
+    return await interview_service.wait_for_next_question(interview_id=interview_id)
 
 
 @interviews_router.post("/{interview_id}/answer", response_model=AnswerOut)
 async def submit_answer(
     interview_id: int,
     answer_data: AnswerCreate,
-    interview_service: InterviewService = Depends()
+    background_tasks: BackgroundTasks,
+    interview_service: AsyncInterviewService = Depends()
 ):
     """
-    Submits a user's answer for a specific question.
+    Submits a user's answer for a specific question and evaluates it in the background.
     """
     return await interview_service.submit_answer(
         interview_id=interview_id,
-        answer_data=answer_data
+        answer_data=answer_data,
+        background_tasks=background_tasks
     )
 
 @interviews_router.delete("/{interview_id}", response_model=OperationResponse, status_code=status.HTTP_200_OK)
@@ -97,4 +183,18 @@ async def finish_interview(
     return await interview_service.finish_and_generate_report(
         interview_id=interview_id,
         background_tasks=background_tasks
-    )
\ No newline at end of file
+    )
+
+@interviews_router.post("/{interview_id}/finish/async", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+async def finish_interview_async(
+    interview_id: int,
+    response: Response,
+    interview_service: InterviewService = Depends()
+):
+    """
+    Queues the scoring and report generation of the interview. Poll the
+    returned job, then fetch the finished interview.
+    """
+    job = interview_service.queue_finish_interview(interview_id=interview_id)
+    response.headers["Location"] = f"/api/v2/jobs/{job.id}"
+    return job
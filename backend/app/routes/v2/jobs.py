@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemes.job_schemes import JobOut
+from app.services.job_service import job_queue, get_job_by_id_async
+from app.core.config import get_settings
+from app.core.db import get_async_db
+
+
+jobs_router = APIRouter(
+    prefix="/jobs",
+    tags=["api_v2", "Jobs"]
+)
+
+
+@jobs_router.get("/{job_id}", response_model=JobOut)
+async def get_job(
+    job_id: int,
+    wait: float = 0,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Returns the status of a background job. With `wait` (seconds), the request
+    is held until the job finishes or the time runs out, instead of polling.
+    """
+    if wait > 0:
+        return await job_queue.wait(db, job_id=job_id, timeout=min(wait, get_settings().JOB_WAIT_MAX_SECONDS))
+    job = await get_job_by_id_async(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job Not Found")
+    return job
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: str | None = None
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,160 @@
+import time
+import asyncio
+from typing import List, Union
+
+from fastapi import Depends, HTTPException, status, BackgroundTasks
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import InterviewStatus
+from app.models.db_schemes import Interview, Question, Answer
+from app.schemes.answers_schemes import AnswerCreate
+from app.schemes.questions_schemes import QuestionOut, NextQuestionResponse
+from app.services import question_service, answer_service
+from app.services.interview_service import (
+    _question_streams, evaluate_answer_in_background, INTERVIEW_OUT_LOADING
+)
+from app.services.write_service import write_coordinator
+from app.core.config import get_settings
+from app.core.db import get_async_db
+
+# How often a wait re-reads an interview whose questions another process is generating
+GENERATION_POLL_SECONDS = 0.5
+
+
+class AsyncInterviewService:
+    """
+    The interview reads and answer writes behind the interactive routes, on an
+    `AsyncSession`. Waiting on SQLite then only holds up the request itself
+    instead of the whole event loop.
+
+    Both API versions answer questions through this service. Nothing is lazy
+    loaded in async code, so every relationship a response needs is loaded up front.
+    """
+
+    def __init__(self, db: AsyncSession = Depends(get_async_db)):
+        self.db = db
+
+    async def _get_interview(self, interview_id: int, *options) -> Interview:
+        result = await self.db.execute(select(Interview).options(*options).where(Interview.id == interview_id))
+        interview = result.scalars().first()
+        if not interview:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview Not Found")
+        return interview
+
+    async def get_interview_by_id(self, interview_id: int) -> Interview:
+        return await self._get_interview(interview_id, *INTERVIEW_OUT_LOADING)
+
+    async def get_all_interviews_for_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[Interview]:
+        result = await self.db.execute(
+            select(Interview).options(*INTERVIEW_OUT_LOADING).where(
+                Interview.user_id == user_id
+            ).order_by(Interview.created_at).offset(skip).limit(limit)
+        )
+        return result.unique().scalars().all()
+
+    async def get_next_question(self, interview_id: int) -> Union[NextQuestionResponse, dict]:
+        """
+        Fetches the next unanswered question for an ongoing interview.
+        """
+        response, _ = await self._next_question(interview_id)
+        return response
+
+    async def _next_question(self, interview_id: int) -> tuple:
+        """The next-question response, and whether the interview's questions are still being generated."""
+        db_interview = await self._get_interview(interview_id)
+        generating = db_interview.expected_questions is not None
+
+        if db_interview.status == InterviewStatus.COMPLETED.value:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This interview has already been completed.")
+
+        next_question = await question_service.get_next_unanswered_question_async(db=self.db, interview_id=interview_id)
+
+        if not next_question:
+            if generating:
+                return {"message": "The next question is still being generated. Please try again shortly."}, generating
+            return {"message": "All questions have been answered. Please finish the interview."}, generating
+
+        if generating:
+            # While streaming, the number of questions asked for rather than saved so far
+            total_questions = db_interview.expected_questions
+        else:
+            total_questions = await self.db.scalar(
+                select(func.count(Question.id)).where(Question.interview_id == interview_id)
+            )
+
+        return {
+            "question": QuestionOut.model_validate(next_question),
+            "total_questions": total_questions
+        }, generating
+
+    async def wait_for_next_question(self, interview_id: int) -> Union[NextQuestionResponse, dict]:
+        """
+        Like `get_next_question`, but when the next question is still being
+        generated, waits for it up to QUESTION_STREAMING_WAIT_SECONDS.
+        """
+        deadline = time.monotonic() + get_settings().QUESTION_STREAMING_WAIT_SECONDS
+        while True:
+            response, generating = await self._next_question(interview_id)
+            remaining = deadline - time.monotonic()
+            if "question" in response or not generating or remaining <= 0:
+                return response
+
+            stream = _question_streams.get(interview_id)
+            if stream is not None:
+                await stream.wait_for_change(timeout=remaining)
+            else:
+                # Generated by another process, nothing to wake us up
+                await asyncio.sleep(min(GENERATION_POLL_SECONDS, remaining))
+            self.db.expire_all()
+
+    async def submit_answer(self, interview_id: int, answer_data: AnswerCreate,
+                            background_tasks: BackgroundTasks | None = None):
+        """
+        Validates and saves an answer, then evaluates it using an AI in the background
+        so that finishing the interview only has to collect the scores.
+        """
+        db_interview = await self._get_interview(interview_id)
+
+        if db_interview.status == InterviewStatus.COMPLETED.value:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This interview has already been completed.")
+
+        db_question = await question_service.get_question_by_id_async(
+            db=self.db, question_id=answer_data.question_id, interview_id=interview_id
+        )
+
+        if not db_question:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question Not Found")
+
+        def save(db: Session) -> Answer | None:
+            # Checked in the write itself, which sees the answers committed or batched before it.
+            # Returns None rather than raising, which would fail the rest of the batch too.
+            if db.query(Answer.id).filter(Answer.question_id == answer_data.question_id).first() is not None:
+                return None
+            return answer_service.create_answer(
+                db=db,
+                question_id=answer_data.question_id,
+                user_answer=answer_data.user_answer,
+                score=None,
+                feedback=None
+            )
+
+        try:
+            db_answer = await write_coordinator.run(save)
+        except IntegrityError:
+            # Answered by a write that did not go through the writer
+            db_answer = None
+        if db_answer is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This question has already been answered.")
+
+        if background_tasks is not None and get_settings().EVALUATE_ANSWERS_ON_SUBMIT:
+            background_tasks.add_task(
+                evaluate_answer_in_background,
+                interview_id=interview_id,
+                answer_id=db_answer.id,
+                user_id=db_interview.user_id
+            )
+
+        return db_answer
@@ -7,6 +7,7 @@ from app.controllers.FileController import FileController
 
 from app.integrations.google_adk.agents import cv_parsing_agent
 from app.integrations.google_adk.client import run_agent
+from app.integrations.google_adk.scheduler import CallPriority
 
 from app.models.db_schemes import Cv, Interview
 from app.services.user_service import UserService
@@ -52,7 +53,9 @@ class CVService:
             parsed_text = await run_agent(
                 agent=cv_parsing_agent,
                 query=raw_text,
-                user_id=user_session_id
+                user_id=user_session_id,
+                # Parsing must never hold up interactive interview calls
+                priority=CallPriority.BACKGROUND
         )
 
             # Step 5: Create the final record in the database
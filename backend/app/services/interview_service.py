@@ -1,30 +1,408 @@
-import json
 import re
+import math
+import time
+import asyncio
+import logging
+from itertools import zip_longest
+from contextlib import aclosing
 
-from typing import List, Union
+from typing import Dict, List, Set
 from fastapi import Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import func
+from pydantic import ValidationError
 
 from app.integrations.google_adk.agents import (
     question_generation_agent,
+    question_generation_with_research_agent,
     answer_evaluation_agent,
     final_report_agent,
 )
 
-from app.integrations.google_adk.client import run_agent
+from app.integrations.google_adk.client import run_agent, stream_agent, prompt_budget, circuit_breaker
+from app.integrations.google_adk.breaker import ModelUnavailableError, CircuitOpenError
+from app.integrations.google_adk.budget import PromptField
+from app.integrations.google_adk.parsing import JsonArrayStreamParser, AgentOutputError, output_parser
+from app.integrations.google_adk.scheduler import CallPriority
 
 from app.controllers.FileController import FileController
+from app.controllers.UserController import UserController
 from app.models import InterviewStatus
-from app.models.db_schemes import Interview, Question, Topic, Answer
-from app.schemes.answers_schemes import AnswerCreate
+from app.models.enums.InterviewEnums import InterviewMode
+from app.models.enums.JobEnums import JobKind
+from app.models.db_schemes import Interview, Question, Topic, Answer, Cv, Job, Report
+from app.schemes.answers_schemes import AnswerEvaluationAgent
 from app.schemes.interview_schemes import InterviewCreate
-from app.schemes.questions_schemes import QuestionOut, NextQuestionResponse
+from app.schemes.questions_schemes import QuestionCreate, QuestionOutAgent
+from app.schemes.report_schemas import FinalReportOutput
 from app.services import (
     CVService, question_service, UserService,
     answer_service, ReportService, EmailService
 )
-from app.core.db import get_db
+from app.services.research_service import get_research_context
+from app.services.job_service import job_queue, current_job_id
+from app.services.progress_service import report_progress
+from app.services.question_bank_service import question_bank, ROLE_MATCH_BONUS
+from app.services.pregeneration_service import question_pregenerator, make_role_params
+from app.services.transcript_service import encode_evaluation_transcript, encode_report_transcript
+from app.services.write_service import write_coordinator
+from app.core.config import get_settings
+from app.core.db import get_db, SessionLocal
+
+logger = logging.getLogger('uvicorn.error')
+
+def _model_unavailable(message: str, error: Exception, job_id: int | None = None) -> HTTPException:
+    """A 503 telling the client when to retry and, if the work was queued, which job to poll."""
+    detail = {"message": message} if job_id is None else {"message": message, "job_id": job_id}
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(math.ceil(max(getattr(error, "retry_after", 0), 1)))}
+    )
+
+
+# interview_id -> answer evaluations still running in the background
+_pending_evaluations: Dict[int, Set[asyncio.Task]] = {}
+
+
+async def evaluate_answer_in_background(interview_id: int, answer_id: int, user_id: int):
+    """
+    Evaluates a single submitted answer and stores its score and feedback.
+
+    Runs after the response has been sent, so it works on its own session.
+    A failure only leaves the answer unscored; finishing the interview will
+    evaluate it again.
+    """
+    task = asyncio.current_task()
+    _pending_evaluations.setdefault(interview_id, set()).add(task)
+
+    db = SessionLocal()
+    try:
+        db_answer = db.query(Answer).options(
+            joinedload(Answer.question)
+        ).filter(Answer.id == answer_id).first()
+
+        if db_answer is None or db_answer.score is not None:
+            return
+
+        await evaluate_answers(db=db, user_id=user_id, db_answers=[db_answer])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Background evaluation of answer {answer_id} failed: {e}")
+    finally:
+        db.close()
+        pending = _pending_evaluations.get(interview_id)
+        if pending is not None:
+            pending.discard(task)
+            if not pending:
+                del _pending_evaluations[interview_id]
+
+
+async def wait_for_pending_evaluations(interview_id: int, timeout: float):
+    """Waits, up to `timeout` seconds, for the background evaluations of an interview."""
+    pending = _pending_evaluations.get(interview_id)
+    if pending:
+        await asyncio.wait(set(pending), timeout=timeout)
+
+
+async def evaluate_answers(db: Session, user_id: int, db_answers: List[Answer]):
+    """
+    Calls the AI agent to evaluate the answers, split into chunks that run concurrently.
+    Updates the answer records in the database safely using a dictionary lookup.
+
+    A chunk that fails is retried on its own; if it still fails, the other
+    chunks' scores are kept and the error is raised.
+    """
+    chunk_size = max(get_settings().EVALUATION_CHUNK_SIZE, 1)
+    chunks = [db_answers[i:i + chunk_size] for i in range(0, len(db_answers), chunk_size)]
+
+    results = await asyncio.gather(
+        *[_evaluate_chunk(user_id=user_id, db_answers=chunk) for chunk in chunks],
+        return_exceptions=True
+    )
+
+    answers_map = {answer.question_id: answer for answer in db_answers}
+    errors = []
+
+    for result in results:
+        if isinstance(result, BaseException):
+            errors.append(result)
+            continue
+
+        for evaluation in result:
+            q_id = evaluation.get("question_id")
+            if q_id in answers_map:
+                db_answer_to_update = answers_map[q_id]
+                db_answer_to_update.score = evaluation.get("score")
+                db_answer_to_update.feedback = evaluation.get("feedback")
+                db.add(db_answer_to_update)
+            else:
+                print(f"Warning: AI returned evaluation for unknown question_id: {q_id}")
+
+    if errors:
+        raise errors[0]
+
+
+async def _evaluate_chunk(user_id: int, db_answers: List[Answer]) -> List[dict]:
+    """Evaluates one chunk of answers, retrying it alone when the call fails or its JSON is beyond repair."""
+    transcript_for_ai = prompt_budget.fit(
+        agent_name=answer_evaluation_agent.name,
+        fields=[PromptField("transcript", encode_evaluation_transcript(db_answers), is_json=True)]
+    )["transcript"]
+    retries = get_settings().EVALUATION_CHUNK_RETRIES
+
+    for attempt in range(retries + 1):
+        try:
+            evaluations_json = await run_agent(
+                agent=answer_evaluation_agent,
+                query=transcript_for_ai,
+                user_id=user_id
+            )
+            return output_parser.parse(
+                answer_evaluation_agent.name, evaluations_json, AnswerEvaluationAgent
+            ).model_dump()["answers"]
+        except Exception as e:
+            # An open circuit will not close within the retry delays
+            if attempt == retries or isinstance(e, CircuitOpenError):
+                raise
+            if isinstance(e, AgentOutputError):
+                output_parser.record_recall(answer_evaluation_agent.name)
+            logger.warning(f"Evaluation chunk failed (attempt {attempt + 1}), retrying: {e}")
+            await asyncio.sleep(0.5 * (attempt + 1))
+
+
+class _QuestionStream:
+    """
+    An interview whose questions this process is still generating and saving.
+    Whether an interview is still being generated is persisted on its
+    `expected_questions`; this only wakes up the requests waiting for a question.
+    """
+
+    def __init__(self, expected: int, saved: int = 0):
+        self.expected = expected
+        self.saved = saved
+        self.task: asyncio.Task | None = None
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+# interview_id -> question generation still streaming into the interview
+_question_streams: Dict[int, _QuestionStream] = {}
+
+
+def clear_interrupted_question_streams() -> int:
+    """
+    Marks the interviews whose question streams the last shutdown interrupted
+    as fully generated, so they can be answered and finished with the
+    questions they got. Returns how many there were.
+    """
+    db = SessionLocal()
+    try:
+        cleared = db.query(Interview).filter(Interview.expected_questions != None).update(
+            {Interview.expected_questions: None}, synchronize_session=False
+        )
+        db.commit()
+        return cleared
+    finally:
+        db.close()
+
+_generation_stats = {
+    "interviews": 0, "streamed": 0,
+    "first_question_seconds": 0.0, "max_first_question_seconds": 0.0, "all_questions_seconds": 0.0,
+}
+
+
+def _record_question_generation(first_question_seconds: float, all_questions_seconds: float, streamed: bool):
+    _generation_stats["interviews"] += 1
+    _generation_stats["streamed"] += int(streamed)
+    _generation_stats["first_question_seconds"] += first_question_seconds
+    _generation_stats["all_questions_seconds"] += all_questions_seconds
+    _generation_stats["max_first_question_seconds"] = max(
+        _generation_stats["max_first_question_seconds"], first_question_seconds
+    )
+
+
+def question_generation_stats() -> dict:
+    """Returns the time from the start request to the first, and to the last, saved question."""
+    interviews = _generation_stats["interviews"]
+    return {
+        "interviews": interviews,
+        "streamed": _generation_stats["streamed"],
+        "generating": len(_question_streams),
+        "avg_time_to_first_question_seconds": _generation_stats["first_question_seconds"] / interviews if interviews else 0.0,
+        "max_time_to_first_question_seconds": _generation_stats["max_first_question_seconds"],
+        "avg_time_to_all_questions_seconds": _generation_stats["all_questions_seconds"] / interviews if interviews else 0.0,
+    }
+
+
+async def _stream_questions_into_interview(interview_id: int, stream: _QuestionStream, generation_agent,
+                                           query: str, user_id: int, started: float):
+    """
+    Saves each question as soon as it is parsed from the streamed model output.
+    Runs on its own session; a failure part-way only leaves the interview shorter.
+    Once it ends, the interview is no longer marked as being generated.
+    """
+    db = SessionLocal()
+    first_question_seconds = None
+    try:
+        interview_service = build_interview_service(db)
+        db_interview = db.query(Interview).filter(Interview.id == interview_id).first()
+        parser = JsonArrayStreamParser()
+        topic_cache = {}
+        chunks = []
+        streamed = 0
+        # The interview may already hold questions from the bank, the model can repeat them
+        seen = {_question_key(question.content) for question in db_interview.questions}
+
+        def save(question_data: dict):
+            nonlocal first_question_seconds, streamed
+            key = _question_key(question_data["content"])
+            if key in seen:
+                return
+            seen.add(key)
+            interview_service._add_questions(db_interview, [question_data], topic_cache, first_order=stream.saved + 1)
+            db.commit()
+            stream.saved += 1
+            streamed += 1
+            if first_question_seconds is None:
+                first_question_seconds = time.perf_counter() - started
+                report_progress("first_question_ready")
+            stream.notify()
+
+        # Closed as soon as the interview is full, which gives the model call's slot back
+        async with aclosing(stream_agent(agent=generation_agent, query=query, user_id=user_id)) as model_stream:
+            async for chunk in model_stream:
+                chunks.append(chunk)
+                for item in parser.feed(chunk):
+                    try:
+                        question_data = QuestionCreate.model_validate(item).model_dump()
+                    except ValidationError as e:
+                        logger.warning(f"Skipping an invalid streamed question of interview {interview_id}: {e}")
+                        continue
+                    save(question_data)
+                    if stream.saved >= stream.expected:
+                        break
+                if stream.saved >= stream.expected:
+                    break
+
+        if streamed == 0:
+            # Nothing came out item by item, try repairing the output as a whole
+            questions = output_parser.parse(generation_agent.name, "".join(chunks), QuestionOutAgent)
+            for question in questions.questions[:stream.expected - stream.saved]:
+                save(question.model_dump())
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Streaming the questions of interview {interview_id} failed after {stream.saved}: {e}")
+    finally:
+        try:
+            db.query(Interview).filter(Interview.id == interview_id).update(
+                {Interview.expected_questions: None}, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Could not mark the questions of interview {interview_id} as generated: {e}")
+        db.close()
+        del _question_streams[interview_id]
+        stream.notify()
+        if first_question_seconds is not None:
+            _record_question_generation(first_question_seconds, time.perf_counter() - started, streamed=True)
+
+
+QUESTION_TYPE_SHARDS = ("TECHNICAL", "BEHAVIORAL", "SITUATIONAL")
+
+
+def _build_question_prompt(question_query: dict, n_questions: int | None = None,
+                           focus: str | None = None, research: str | None = None) -> str:
+    """
+    Builds the question generation prompt, optionally narrowed to one shard's
+    focus and carrying research done ahead of time.
+    """
+    question_prompt = f"""
+        Generate interview questions based on the following information:
+
+        - Job Title: {question_query['job_title']}
+        - Job Description: "{question_query['job_description']}"
+        - Skills to Focus On: {question_query['skills_to_foucs']}
+        - Candidate CV (JSON): {question_query['parsed_cv_json']}
+        - Number of Questions to Generate: {n_questions or question_query['n_questions']}
+        """
+    if question_query.get("avoid_questions"):
+        question_prompt += f"- Do not repeat these questions, they are already asked: {question_query['avoid_questions']}\n"
+    if focus in QUESTION_TYPE_SHARDS:
+        question_prompt += f"- Only generate questions of type: {focus}\n"
+    elif focus:
+        question_prompt += f"- Only generate questions about the skill: {focus}\n"
+    if research:
+        question_prompt += f"\n        Research Context:\n        {research}\n"
+    return question_prompt
+
+
+def _plan_question_shards(strategy: str, n_questions: int, skills: List[str]) -> List[tuple]:
+    """
+    Splits `n_questions` into (focus, count) shards, by question type or by skill.
+    Returns an empty list when sharding is disabled or there is nothing to split on.
+    """
+    if strategy == "type":
+        focuses = list(QUESTION_TYPE_SHARDS)
+    elif strategy == "skill":
+        focuses = list(dict.fromkeys(skill.strip() for skill in skills if skill.strip()))
+    else:
+        return []
+
+    focuses = focuses[:n_questions]
+    if len(focuses) < 2:
+        return []
+
+    base, extra = divmod(n_questions, len(focuses))
+    return [(focus, base + (1 if i < extra else 0)) for i, focus in enumerate(focuses)]
+
+
+def _question_key(content: str) -> str:
+    return re.sub(r"[\W_]+", " ", content.lower()).strip()
+
+
+def _merge_question_shards(shard_questions: List[List[dict]], limit: int) -> List[dict]:
+    """
+    Interleaves the shards so the interview alternates focus, dropping duplicate
+    questions. Order numbers are assigned from the merged position later on.
+    """
+    merged = []
+    seen = set()
+    for round_questions in zip_longest(*shard_questions):
+        for question in round_questions:
+            if not question or not question.get("content"):
+                continue
+            key = _question_key(question["content"])
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(question)
+    return merged[:limit]
+
+
+# Loader strategies by use. INTERVIEW_OUT_LOADING loads everything InterviewOut serializes,
+# in the same number of queries however many interviews, questions or topics there are.
+# INTERVIEW_ROW_LOADING is for the checks that only read the interview's own columns.
+INTERVIEW_OUT_LOADING = (
+    joinedload(Interview.cvs),
+    joinedload(Interview.report),
+    joinedload(Interview.user),
+    selectinload(Interview.questions).selectinload(Question.topics),
+    selectinload(Interview.questions).selectinload(Question.answer),
+)
+INTERVIEW_ROW_LOADING = ()
+
 
 class InterviewService:
     def __init__(
@@ -48,170 +426,371 @@ class InterviewService:
         """
         Orchestrates validation, AI question generation, and saving a new interview.
         """
-        user = self.user_service.get_user_by_id(user_id=interview_data.user_id)
+        cv = self._validate_interview_request(interview_data)
+        report_progress("cv_loaded", cv_id=cv.id)
 
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        started = time.perf_counter()
+        n_questions = interview_data.mode.get_question_count()
+        # Questions generated ahead of time for this role, else past questions from the bank
+        ready_questions = await self._take_pregenerated(interview_data, n_questions) \
+            or await self._take_from_question_bank(interview_data, n_questions)
 
-        cv = self.cv_service.get_cv_by_id_and_user(cv_id=interview_data.cv_id, user_id=interview_data.user_id)
-        if not cv:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found for this user")
+        if len(ready_questions) == n_questions:
+            # Nothing is left for the model to generate
+            db_interview = await self._save_new_interview(interview_data, ready_questions)
+            elapsed = time.perf_counter() - started
+            _record_question_generation(elapsed, elapsed, streamed=False)
+            return db_interview
 
         question_query ={
             "job_title": interview_data.job_title,
             "job_description": interview_data.job_description,
-            "n_questions": interview_data.mode.get_question_count(),
+            "n_questions": n_questions - len(ready_questions),
             "parsed_cv_json": cv.raw_text,
-            "skills_to_foucs": interview_data.skills_to_foucs
+            "skills_to_foucs": interview_data.skills_to_foucs,
+            "avoid_questions": [question["content"] for question in ready_questions],
         }
 
-        question_prompt = f"""
-        Generate interview questions based on the following information:
-
-        - Job Title: {question_query['job_title']}
-        - Job Description: "{question_query['job_description']}"
-        - Skills to Focus On: {question_query['skills_to_foucs']}
-        - Candidate CV (JSON): {question_query['parsed_cv_json']}
-        - Number of Questions to Generate: {question_query['n_questions']}
-        """
-        
-        questions_json = await run_agent(
-            agent=question_generation_agent,
-            query=question_prompt,
-            user_id=interview_data.user_id
+        generation_agent, question_query, research, shards = await self._prepare_question_generation(
+            question_query, user_id=interview_data.user_id
         )
-        
-        questions_list = json.loads(questions_json).get("questions", [])
-        
+
+        if get_settings().QUESTION_STREAMING and not shards:
+            return await self._start_streamed_interview(
+                interview_data, generation_agent, question_query, research, started, ready_questions
+            )
+
+        generation_error = None
+        try:
+            questions_list = await self._generate_questions(
+                generation_agent, question_query, research, shards, user_id=interview_data.user_id
+            )
+        except Exception as e:
+            logger.warning(f"Question generation failed: {e}")
+            generation_error, questions_list = e, []
+
+        if questions_list:
+            report_progress("questions_generated", questions=len(questions_list))
+            questions_list = _merge_question_shards([ready_questions, questions_list], limit=n_questions)
+        else:
+            # Degraded mode: keep the questions already in hand, fill the rest with ones asked for similar roles
+            reused = await self._reuse_past_questions(interview_data, n_questions - len(ready_questions))
+            report_progress("questions_reused", questions=len(reused))
+            questions_list = _merge_question_shards([ready_questions, reused], limit=n_questions)
+
         if not questions_list:
+            if isinstance(generation_error, ModelUnavailableError):
+                raise _model_unavailable("Questions cannot be generated right now, please try again later.", generation_error)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate questions")
 
 
-        db_interview = self._create_interview_record_with_questions(interview_data, questions_list)
-        
-        self.db.commit()
-        self.db.refresh(db_interview)
+        db_interview = await self._save_new_interview(interview_data, questions_list)
+
+        elapsed = time.perf_counter() - started
+        _record_question_generation(elapsed, elapsed, streamed=False)
         return db_interview
 
-    def get_next_question(self, interview_id: int) -> Union[NextQuestionResponse, dict]:
+    async def _start_streamed_interview(self, interview_data: InterviewCreate, generation_agent,
+                                        question_query: dict, research: str | None, started: float,
+                                        ready_questions: List[dict]) -> Interview:
         """
-        Fetches the next unanswered question for an ongoing interview.
+        Creates the interview right away, with the questions that are already
+        available, and returns it once its first question is saved. A background
+        task saves the other questions as the model writes them.
         """
-        db_interview = self.get_interview_by_id(interview_id) # Uses internal helper
+        expected = len(ready_questions) + question_query["n_questions"]
+        db_interview = await self._save_new_interview(interview_data, ready_questions, expected_questions=expected)
+        interview_id = db_interview.id
 
-        if db_interview.status == InterviewStatus.COMPLETED.value:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This interview has already been completed.")
-        
-        next_question = question_service.get_next_unanswered_question(db=self.db, interview_id=interview_id)
+        stream = _QuestionStream(expected=expected, saved=len(ready_questions))
+        _question_streams[interview_id] = stream
+        stream.task = asyncio.create_task(_stream_questions_into_interview(
+            interview_id=interview_id,
+            stream=stream,
+            generation_agent=generation_agent,
+            query=_build_question_prompt(question_query, research=research),
+            user_id=interview_data.user_id,
+            started=started
+        ))
 
-        if not next_question:
-            
-            return {"message": "All questions have been answered. Please finish the interview."}
-        
-        question_out = QuestionOut.model_validate(next_question)
-        
-        return {
-            "question": question_out,
-            "total_questions": len(db_interview.questions)
-        }
+        # The first question must come within the generator's timeout
+        deadline = time.monotonic() + circuit_breaker.timeout_for(generation_agent.name)
+        while stream.saved == 0 and not stream.task.done() and time.monotonic() < deadline:
+            await stream.wait_for_change(timeout=1)
+
+        if stream.saved == 0:
+            stream.task.cancel()
+            await asyncio.gather(stream.task, return_exceptions=True)
+
+            past_questions = await self._reuse_past_questions(interview_data, question_query["n_questions"])
+            if not past_questions:
+                self.db.delete(db_interview)
+                self.db.commit()
+                raise _model_unavailable(
+                    "Questions cannot be generated right now, please try again later.",
+                    ModelUnavailableError(f"{generation_agent.name} streamed no question")
+                )
+            self._add_questions(db_interview, past_questions, topic_cache={})
+            self.db.commit()
+            report_progress("questions_reused", questions=len(past_questions))
+
+        self.db.expire(db_interview)
+        return self.get_interview_by_id(interview_id)
+
+    async def _take_pregenerated(self, interview_data: InterviewCreate, n_questions: int) -> List[dict]:
+        """Returns the questions pre-generated after the CV upload, when they were for this role."""
+        settings = get_settings()
+        if not settings.QUESTION_PREGENERATION:
+            return []
+
+        questions = await question_pregenerator.take(
+            user_id=interview_data.user_id,
+            cv_id=interview_data.cv_id,
+            params=make_role_params(
+                interview_data.job_title, interview_data.job_description, interview_data.skills_to_foucs
+            ),
+            timeout=settings.QUESTION_PREGENERATION_WAIT_SECONDS
+        )
+        if questions:
+            report_progress("questions_pregenerated", questions=len(questions))
+        return questions[:n_questions]
 
-    async def submit_answer(self, interview_id: int, answer_data: AnswerCreate):
+    async def _take_from_question_bank(self, interview_data: InterviewCreate, n_questions: int) -> List[dict]:
         """
-        Validates, evaluates an answer using an AI, and saves it to the database.
+        Fills up to QUESTION_BANK_MAX_SHARE of the interview with past questions
+        relevant to the role that the user was not asked yet.
         """
-        db_interview = self.get_interview_by_id(interview_id)
-        
-        if db_interview.status == InterviewStatus.COMPLETED.value:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="This interview has already been completed.")
-        
-        
-        db_question = question_service.get_question_by_id(db=self.db, question_id=answer_data.question_id, interview_id=interview_id)
-        
-        if not db_question:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question Not Found")
-        if db_question.answer is not None:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="This question has already been answered.")
-        
-        db_answer = answer_service.create_answer(
-            db=self.db,
-            question_id=answer_data.question_id,
-            user_answer=answer_data.user_answer,
-            score=None,
-            feedback=None
+        settings = get_settings()
+        if not settings.QUESTION_BANK_ENABLED:
+            return []
+
+        bank_questions = await question_bank.retrieve(
+            job_title=interview_data.job_title,
+            n_questions=math.floor(n_questions * settings.QUESTION_BANK_MAX_SHARE),
+            user_id=interview_data.user_id,
+            job_description=interview_data.job_description,
+            skills=interview_data.skills_to_foucs
         )
+        if bank_questions:
+            report_progress("questions_from_bank", questions=len(bank_questions))
+        return bank_questions
 
-        self.db.commit()
-        self.db.refresh(db_answer)
+    async def _reuse_past_questions(self, interview_data: InterviewCreate, n_questions: int) -> List[dict]:
+        """
+        Picks questions generated for earlier interviews for the same or similar
+        roles, for when the model is unavailable.
+        """
+        # Any question asked for the same job title qualifies, a repeat beats no interview
+        return await question_bank.retrieve(
+            job_title=interview_data.job_title,
+            n_questions=n_questions,
+            job_description=interview_data.job_description,
+            skills=interview_data.skills_to_foucs,
+            min_similarity=ROLE_MATCH_BONUS
+        )
 
-        return db_answer
-    
-    async def _evaluate_answers(self, user_id: int, db_answers: List[Answer]):
+    def queue_new_interview(self, interview_data: InterviewCreate) -> Job:
         """
-        Prepares the context and calls the AI agent to evaluate all answers in a single batch.
-        Updates the answer records in the database safely using a dictionary lookup.
+        Validates the request and queues the question generation as a background job.
+        The job's result holds the new interview's id.
         """
-        transcript_for_ai = [
-            {
-                "question_id": answer.question_id,
-                "question_text": answer.question.content,
-                "user_answer": answer.user_answer,
-                "max_score": answer.question.max_score,
-                "type": answer.question.type,
+        self._validate_interview_request(interview_data)
+        return job_queue.enqueue(
+            self.db, kind=JobKind.START_INTERVIEW.value, payload=interview_data.model_dump(mode="json")
+        )
 
+    def _validate_interview_request(self, interview_data: InterviewCreate) -> Cv:
+        """Checks that the user and their CV exist, returns the CV."""
+        user = self.user_service.get_user_by_id(user_id=interview_data.user_id)
 
-            }
-            
-            for answer in db_answers
-        ]
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+        cv = self.cv_service.get_cv_by_id_and_user(cv_id=interview_data.cv_id, user_id=interview_data.user_id)
+        if not cv:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found for this user")
+        return cv
+
+    async def _prepare_question_generation(self, question_query: dict, user_id: int) -> tuple:
+        """
+        Picks the generator agent, fits the prompt fields to its budget and
+        plans the shards. Returns (agent, fitted question_query, research, shards).
 
-        evaluations_json = await run_agent(
-            agent=answer_evaluation_agent,
-            query=json.dumps(transcript_for_ai),
-            user_id=user_id
+        With RESEARCH_CACHE_ENABLED the role research is fetched (usually from
+        the cache) once up front and shared by every call, instead of each
+        generator running the researcher as a tool.
+        """
+        settings = get_settings()
+
+        generation_agent = question_generation_agent
+        research = None
+        if settings.RESEARCH_CACHE_ENABLED:
+            try:
+                research = await get_research_context(
+                    job_title=question_query["job_title"],
+                    job_description=question_query["job_description"],
+                    user_id=user_id
+                )
+                report_progress("research_done")
+            except Exception as e:
+                # The questions are still worth generating without the research
+                logger.warning(f"Role research failed, generating without it: {e}")
+            generation_agent = question_generation_with_research_agent
+
+        # The CV and the job description are the parts that can blow up the prompt
+        fitted = prompt_budget.fit(
+            agent_name=generation_agent.name,
+            fields=[
+                PromptField("research", research, priority=1),
+                PromptField("parsed_cv_json", question_query["parsed_cv_json"], priority=2, is_json=True),
+                PromptField("job_description", question_query["job_description"], priority=3),
+            ],
+            overhead=_build_question_prompt({**question_query, "parsed_cv_json": "", "job_description": ""})
         )
+        research = fitted["research"] or None
+        question_query = {
+            **question_query,
+            "parsed_cv_json": fitted["parsed_cv_json"],
+            "job_description": fitted["job_description"],
+        }
 
-        evaluated_answers = json.loads(evaluations_json).get("answers", [])
+        shards = []
+        if question_query["n_questions"] >= settings.QUESTION_GENERATION_SHARD_THRESHOLD:
+            shards = _plan_question_shards(
+                strategy=settings.QUESTION_GENERATION_SHARDING,
+                n_questions=question_query["n_questions"],
+                skills=question_query["skills_to_foucs"] or []
+            )
+        return generation_agent, question_query, research, shards
 
-        answers_map = {answer.question_id: answer for answer in db_answers}
+    async def generate_questions(self, question_query: dict, user_id: int,
+                                 priority: CallPriority = CallPriority.INTERACTIVE) -> List[dict]:
+        """
+        Generates the questions `question_query` asks for, with the role research,
+        the prompt budget and the shards an interview start would use.
+        """
+        generation_agent, question_query, research, shards = await self._prepare_question_generation(
+            question_query, user_id=user_id
+        )
+        return await self._generate_questions(
+            generation_agent, question_query, research, shards, user_id=user_id, priority=priority
+        )
 
-        for evaluation in evaluated_answers:
-            q_id = evaluation.get("question_id")
-            if q_id in answers_map:
-                db_answer_to_update = answers_map[q_id]
-                db_answer_to_update.score = evaluation.get("score")
-                db_answer_to_update.feedback = evaluation.get("feedback")
-                self.db.add(db_answer_to_update) 
-            else:
-                print(f"Warning: AI returned evaluation for unknown question_id: {q_id}")
+    async def _generate_questions(self, generation_agent, question_query: dict, research: str | None,
+                                  shards: List[tuple], user_id: int,
+                                  priority: CallPriority = CallPriority.INTERACTIVE) -> List[dict]:
+        """
+        Generates the questions in one call, or in concurrent shards for large
+        interviews when QUESTION_GENERATION_SHARDING is enabled.
+        """
+        if not shards:
+            questions_json = await run_agent(
+                agent=generation_agent,
+                query=_build_question_prompt(question_query, research=research),
+                user_id=user_id,
+                priority=priority
+            )
+            try:
+                return output_parser.parse(generation_agent.name, questions_json, QuestionOutAgent).model_dump()["questions"]
+            except AgentOutputError as e:
+                logger.warning(str(e))
+                return []
+
+        results = await asyncio.gather(
+            *[
+                run_agent(
+                    agent=generation_agent,
+                    query=_build_question_prompt(
+                        question_query, n_questions=count, focus=focus, research=research
+                    ),
+                    user_id=user_id,
+                    priority=priority
+                )
+                for focus, count in shards
+            ],
+            return_exceptions=True
+        )
+
+        shard_questions = []
+        for (focus, _), result in zip(shards, results):
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                shard_questions.append(
+                    output_parser.parse(generation_agent.name, result, QuestionOutAgent).model_dump()["questions"]
+                )
+            except Exception as e:
+                # A failed shard only makes the interview shorter
+                logger.warning(f"Question generation shard '{focus}' failed: {e}")
 
+        return _merge_question_shards(shard_questions, limit=question_query["n_questions"])
 
-    async def finish_and_generate_report(self, interview_id: int, background_tasks: BackgroundTasks) -> Interview:
+    async def _evaluate_answers(self, user_id: int, db_answers: List[Answer]):
+        """
+        Evaluates the given answers with the AI agent in the request's session.
+        """
+        await evaluate_answers(db=self.db, user_id=user_id, db_answers=db_answers)
+
+
+    async def finish_and_generate_report(self, interview_id: int, background_tasks: BackgroundTasks,
+                                         defer_on_outage: bool = True) -> Interview:
         """
         Finishes an interview, calculates the score, generates a report, and saves it.
+
+        When a model call fails and `defer_on_outage` is set, the rest of the
+        work is queued as a job and a 503 carrying the job id is raised.
         """
         db_interview = self.get_interview_by_id(interview_id)
         
         if db_interview.report is not None:
             return db_interview # Already finished, just return the result
 
+        if db_interview.expected_questions is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Questions are still being generated for this interview.")
+
+        # Most answers were already evaluated when they were submitted,
+        # give the evaluations still running a chance to land first.
+        await wait_for_pending_evaluations(
+            interview_id=interview_id, timeout=get_settings().EVALUATION_WAIT_SECONDS
+        )
+        self.db.expire_all()
+        db_interview = self.get_interview_by_id(interview_id)
+
         db_answers = answer_service.get_all_answers_for_interview(db=self.db, interview_id=interview_id)
         
         if len(db_answers) != len(db_interview.questions):
              raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Not all questions have been answered yet!")
         
-        _ = await self._evaluate_answers(
-            user_id=db_interview.user_id,
-            db_answers=db_answers
-        )
-        
+        # Only the answers that are still unscored go to the model
+        unscored_answers = [answer for answer in db_answers if answer.score is None]
+        if unscored_answers:
+            try:
+                await self._evaluate_answers(
+                    user_id=db_interview.user_id,
+                    db_answers=unscored_answers
+                )
+            except Exception as e:
+                if defer_on_outage and not isinstance(e, HTTPException):
+                    raise self._defer_finish(interview_id, e)
+                # Keep the chunks that did succeed so a retry only redoes the rest
+                self.db.commit()
+                raise
+        report_progress("answers_evaluated", answers=len(db_answers), evaluated_now=len(unscored_answers))
+
         average_score = self._calculate_final_score(db_answers)
+        report_progress("score_computed", final_score=average_score)
 
         report_input_data ={
             "user_name": db_interview.user.name,
             "job_title": db_interview.job_title,
             "average_score": average_score,
-            "interview_transcript": db_interview.questions,
+            "interview_transcript": encode_report_transcript(db_interview.questions),
         }
+        report_input_data["interview_transcript"] = prompt_budget.fit(
+            agent_name=final_report_agent.name,
+            fields=[PromptField("transcript", report_input_data["interview_transcript"], is_json=True)],
+            overhead=f"{report_input_data['user_name']} {report_input_data['job_title']}"
+        )["transcript"]
 
         report_prompt = f"""
         - User Name: {report_input_data['user_name']}
@@ -219,13 +798,25 @@ class InterviewService:
         - Average Score: {report_input_data['average_score']}
         - Interview Transcript: {report_input_data['interview_transcript']}
         """
-        agent_response = await run_agent(
-            agent=final_report_agent,
-            query=report_prompt,
-            user_id=db_interview.user_id,  
-        )
+        try:
+            agent_response = await run_agent(
+                agent=final_report_agent,
+                query=report_prompt,
+                user_id=db_interview.user_id,
+            )
+        except Exception as e:
+            if defer_on_outage:
+                raise self._defer_finish(interview_id, e)
+            raise
 
-        report_contents = json.loads(agent_response)
+        try:
+            report_contents = output_parser.parse(
+                final_report_agent.name, agent_response, FinalReportOutput
+            ).model_dump(mode="json")
+        except AgentOutputError as e:
+            logger.warning(str(e))
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate the report.")
+        report_progress("report_written", decision=report_contents.get("final_decision"))
 
         report_path = self.file_controller.get_interview_report_path(
             user_id=db_interview.user_id, interview_id=interview_id
@@ -235,56 +826,112 @@ class InterviewService:
         # with open(report_path, "w+") as report_file:
         #     report_file.write(report_content)
 
-        self._update_interview_as_completed(db_interview, average_score, report_contents.get("final_decision"))
-
         background_tasks.add_task(
             self.email_service.send_email,
             user_email=db_interview.user.email,
             subject=report_contents.get("email_subject"),
             body=report_contents.get("email_body")
         )
-        
-        report = self.report_service.create_report(
-            interview = db_interview,
-            report_content = report_content,
-            file_path=report_path,
-            sent_to_email=True,
-            strengths=report_contents.get("strengths", []) or [],
-            areas_for_improvement=report_contents.get("areas_for_improvement", []) or []
-        )
+        report_progress("email_queued")
+
+        # The scores are this session's own writes, the completion goes through the shared writer
+        self.db.commit()
+
+        def complete_with_report(db: Session) -> Report:
+            interview = db.get(Interview, interview_id)
+            build_interview_service(db)._update_interview_as_completed(
+                interview, average_score, report_contents.get("final_decision")
+            )
+            return ReportService(db=db).create_report(
+                interview = interview,
+                report_content = report_content,
+                file_path=report_path,
+                sent_to_email=True,
+                strengths=report_contents.get("strengths", []) or [],
+                areas_for_improvement=report_contents.get("areas_for_improvement", []) or []
+            )
+
+        report = await write_coordinator.run(complete_with_report)
         if not report:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to generate the report.")
-        
-        self.db.flush()
-        self.db.commit()
-        self.db.refresh(db_interview)
 
-        return db_interview
+        self.db.expire_all()
+        return self.get_interview_by_id(interview_id)
+
+    def queue_finish_interview(self, interview_id: int) -> Job:
+        """
+        Queues the scoring and report generation of an interview as a background job,
+        or returns the one already queued or running for it.
+        """
+        self.get_interview_by_id(interview_id, loading=INTERVIEW_ROW_LOADING)
+        return job_queue.enqueue_once(
+            self.db, kind=JobKind.FINISH_INTERVIEW.value, payload={"interview_id": interview_id}
+        )
+
+    def _defer_finish(self, interview_id: int, error: Exception) -> HTTPException:
+        """
+        Keeps the evaluations done so far, queues the finish as a job that retries
+        until the model is back, and returns the 503 to answer with. Repeated
+        attempts during an outage all get the same job.
+        """
+        self.db.commit()
+        job = job_queue.enqueue_once(
+            self.db, kind=JobKind.FINISH_INTERVIEW.value, payload={"interview_id": interview_id}
+        )
+        logger.warning(f"Finishing interview {interview_id} deferred to job {job.id}: {error}")
+        return _model_unavailable(
+            "The report cannot be generated right now, it will be generated in the background.",
+            error,
+            job_id=job.id
+        )
 
-    def get_interview_by_id(self, interview_id: int) -> Interview:
+    def get_interview_by_id(self, interview_id: int, loading: tuple = INTERVIEW_OUT_LOADING) -> Interview:
         """Internal helper to fetch an interview and handle 'Not Found' error."""
-        interview = self.db.query(Interview).options(
-            joinedload(Interview.cvs),
-            joinedload(Interview.report),
-            joinedload(Interview.user)
-        ).filter(Interview.id == interview_id).first()
+        interview = self.db.query(Interview).options(*loading).filter(Interview.id == interview_id).first()
 
         if not interview:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interview Not Found")
         return interview
     
     def get_all_interviews_for_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.db.query(Interview).filter(Interview.user_id == user_id).offset(skip).limit(limit).all()
+        return self.db.query(Interview).options(*INTERVIEW_OUT_LOADING).filter(
+            Interview.user_id == user_id
+        ).order_by(Interview.created_at).offset(skip).limit(limit).all()
     
     def delete_interview_by_id(self, interview_id: int):
         
         db_interview = self.get_interview_by_id(interview_id=interview_id)
-        
+
+        stream = _question_streams.get(interview_id)
+        if stream is not None and stream.task is not None:
+            stream.task.cancel()
+
         self.db.delete(db_interview)
         self.db.commit()
 
         return {"interview_id":interview_id}
 
+    async def _save_new_interview(self, interview_data: InterviewCreate, questions: List[dict],
+                                  expected_questions: int | None = None) -> Interview:
+        """
+        Commits the interview and its questions through the shared writer, returns it in this session.
+        Inside a job, the interview's id is recorded on the job in the same commit.
+        `expected_questions` marks an interview whose other questions are still to be streamed in.
+        """
+        job_id = current_job_id.get()
+
+        def create(db: Session) -> int:
+            db_interview = build_interview_service(db)._create_interview_record_with_questions(interview_data, questions)
+            db_interview.expected_questions = expected_questions
+            db.flush()
+            if job_id is not None:
+                db.query(Job).filter(Job.id == job_id).update(
+                    {Job.result: {"interview_id": db_interview.id}}, synchronize_session=False
+                )
+            return db_interview.id
+
+        return self.get_interview_by_id(await write_coordinator.run(create))
+
     def _create_interview_record_with_questions(self, interview_data: InterviewCreate, questions: list[str]) -> Interview:
         """Creates the parent Interview and its child Question records."""
         db_interview = Interview(
@@ -296,14 +943,19 @@ class InterviewService:
             skills_to_foucs=interview_data.skills_to_foucs,
             mode=interview_data.mode
         )
-        topic_cache = {}
+        self._add_questions(db_interview, questions, topic_cache={})
+
+        self.db.add(db_interview)
+        return db_interview
 
+    def _add_questions(self, db_interview: Interview, questions: List[dict], topic_cache: dict, first_order: int = 1):
+        """Appends Question records, numbered from `first_order`, with their topics."""
         for i, question_data in enumerate(questions):
             new_question = Question(
                 content=question_data.get("content"),
                 max_score=question_data.get("max_score"),
                 type=question_data.get("type"),
-                order=i + 1,
+                order=first_order + i,
             )
 
             topics = question_data.get("topics", [])
@@ -313,9 +965,6 @@ class InterviewService:
             new_question.topics = topic_objects
 
             db_interview.questions.append(new_question)
-
-        self.db.add(db_interview)
-        return db_interview
     
     def _get_or_create_topics(self, topic_names: List[str], cache: dict) -> List[Topic]:
         """
@@ -412,4 +1061,114 @@ class InterviewService:
         percentage = (total_earned / total_possible) * 100
         final_score = (percentage / 10)
         
-        return round(final_score, 2)
\ No newline at end of file
+        return round(final_score, 2)
+
+
+def build_interview_service(db: Session, email_service: EmailService | None = None) -> InterviewService:
+    """
+    Wires an InterviewService by hand, for work that runs outside a request.
+    The email service is only needed to finish an interview.
+    """
+    file_controller = FileController(user_controller=UserController())
+    user_service = UserService(db=db)
+    return InterviewService(
+        db=db,
+        file_controller=file_controller,
+        cv_service=CVService(db=db, file_controller=file_controller, user_service=user_service),
+        user_service=user_service,
+        report_service=ReportService(db=db),
+        email_service=email_service,
+    )
+
+
+async def speculate_interview_questions(user_id: int, cv_id: int, job_title: str | None = None,
+                                        job_description: str | None = None, skills_to_foucs: List[str] | None = None,
+                                        mode: InterviewMode | None = None) -> bool:
+    """
+    Starts generating the questions of the interview a user is expected to
+    start with a new CV: for the declared role, else the role of their last
+    interview. Returns False when there is no role to go on or no budget left.
+    """
+    db = SessionLocal()
+    try:
+        if not job_title:
+            last_interview = db.query(Interview).filter(
+                Interview.user_id == user_id
+            ).order_by(Interview.created_at.desc(), Interview.id.desc()).first()
+            if last_interview is None:
+                return False
+            job_title = last_interview.job_title
+            job_description = last_interview.job_description
+            skills_to_foucs = last_interview.skills_to_foucs
+            mode = mode or last_interview.mode
+        cv = db.query(Cv).filter(Cv.id == cv_id, Cv.user_id == user_id).first()
+        if cv is None:
+            return False
+        parsed_cv_json = cv.raw_text
+    finally:
+        db.close()
+
+    question_query = {
+        "job_title": job_title,
+        "job_description": job_description,
+        # Enough for the longest interview of the mode, a shorter one takes the first questions
+        "n_questions": InterviewMode(mode or InterviewMode.MEDIUM).get_max_question_count(),
+        "parsed_cv_json": parsed_cv_json,
+        "skills_to_foucs": skills_to_foucs,
+    }
+    return question_pregenerator.start(
+        user_id=user_id,
+        cv_id=cv_id,
+        params=make_role_params(job_title, job_description, skills_to_foucs),
+        generate=lambda: _pregenerate_questions(question_query, user_id=user_id)
+    )
+
+
+async def _pregenerate_questions(question_query: dict, user_id: int) -> List[dict]:
+    db = SessionLocal()
+    try:
+        # Speculative work must never hold up the interactive calls
+        return await build_interview_service(db).generate_questions(
+            question_query, user_id=user_id, priority=CallPriority.BACKGROUND
+        )
+    finally:
+        db.close()
+
+
+@job_queue.handler(JobKind.START_INTERVIEW.value)
+async def start_interview_job(payload: dict) -> dict:
+    db = SessionLocal()
+    try:
+        # A retry of a job whose interview was already saved, e.g. before a crash, returns that interview
+        job = db.get(Job, current_job_id.get()) if current_job_id.get() is not None else None
+        interview_id = (job.result or {}).get("interview_id") if job is not None else None
+        if interview_id is not None and db.get(Interview, interview_id) is not None:
+            return {"interview_id": interview_id}
+
+        interview_service = build_interview_service(db)
+        db_interview = await interview_service.start_new_interview(InterviewCreate(**payload))
+        return {"interview_id": db_interview.id}
+    finally:
+        db.close()
+
+
+@job_queue.handler(JobKind.FINISH_INTERVIEW.value)
+async def finish_interview_job(payload: dict) -> dict:
+    db = SessionLocal()
+    try:
+        interview_service = build_interview_service(db, email_service=EmailService())
+        background_tasks = BackgroundTasks()
+        db_interview = await interview_service.finish_and_generate_report(
+            interview_id=payload["interview_id"],
+            background_tasks=background_tasks,
+            defer_on_outage=False
+        )
+        # There is no response to send first, the email goes out right away.
+        # The report is already saved, so a failed email must not retry the job.
+        try:
+            await background_tasks()
+        except Exception as e:
+            logger.warning(f"Sending the report email of interview {db_interview.id} failed: {e}")
+        return {"interview_id": db_interview.id}
+    finally:
+        db.close()
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.db_schemes import Job
+from app.models.enums.JobEnums import JobStatus
+from app.core.config import get_settings
+from app.core.db import SessionLocal
+from app.services.progress_service import progress_broker, current_progress
+
+logger = logging.getLogger('uvicorn.error')
+
+JobHandler = Callable[[dict], Awaitable[dict]]
+
+# The id of the job running in the current task, set by the job worker
+current_job_id: ContextVar[Optional[int]] = ContextVar("current_job_id", default=None)
+
+
+def _utcnow() -> datetime:
+    # SQLite keeps no timezone, so every timestamp is stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def get_job_by_id(db: Session, job_id: int) -> Job:
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job Not Found")
+    return job
+
+
+async def get_job_by_id_async(db: AsyncSession, job_id: int) -> Optional[Job]:
+    return await db.get(Job, job_id)
+
+
+def finished_job_event(job: Job) -> Optional[dict]:
+    """The terminal progress event of a finished job, as stored. None while it is queued or running."""
+    if job.status in (JobStatus.QUEUED.value, JobStatus.RUNNING.value):
+        return None
+    return {"job_id": job.id, "stage": job.status.value, "result": job.result, "error": job.error}
+
+
+class JobQueue:
+    """
+    A durable job queue stored in the jobs table, worked by a pool of asyncio
+    workers inside the API process.
+
+    Handlers are registered per job kind and receive the job's JSON payload.
+    A handler that raises is retried with exponential backoff up to the
+    job's max attempts, except for client errors (HTTPException below 500),
+    which fail the job right away. Jobs left running by a previous process
+    are queued again on start.
+    """
+
+    def __init__(self, workers: int, max_attempts: int, backoff_seconds: float, poll_interval: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_interval = poll_interval
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._finished: Dict[int, Set[asyncio.Event]] = {}
+        self._counts = defaultdict(int)
+
+    def handler(self, kind: str):
+        """Registers the decorated coroutine as the handler of `kind` jobs."""
+        def register(fn: JobHandler) -> JobHandler:
+            self._handlers[kind] = fn
+            return fn
+        return register
+
+    def enqueue(self, db: Session, kind: str, payload: dict) -> Job:
+        """Stores a new job and wakes an idle worker. Commits the session."""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for {kind} jobs")
+
+        job = Job(kind=kind, payload=payload, status=JobStatus.QUEUED.value,
+                  attempts=0, max_attempts=self.max_attempts)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self._counts["enqueued"] += 1
+        progress_broker.open(job.id).emit("queued")
+        self._wakeup.set()
+        return job
+
+    def enqueue_once(self, db: Session, kind: str, payload: dict) -> Job:
+        """
+        Like `enqueue`, but returns the job of that kind and payload that is
+        still queued or running if there is one, e.g. a finish already deferred.
+        """
+        active_jobs = db.query(Job).filter(
+            Job.kind == kind, Job.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value])
+        ).order_by(Job.id).all()
+        for job in active_jobs:
+            if job.payload == payload:
+                return job
+        return self.enqueue(db, kind=kind, payload=payload)
+
+    async def wait(self, db: AsyncSession, job_id: int, timeout: float) -> Job:
+        """
+        Returns the job once it finished, or as it is after `timeout` seconds.
+        The job is read again every `poll_interval`, jobs worked by this
+        process also wake the waiter as soon as they finish.
+        """
+        deadline = asyncio.get_running_loop().time() + timeout
+        # Watch before reading the status, so a job finishing in between is not missed
+        event = asyncio.Event()
+        self._finished.setdefault(job_id, set()).add(event)
+        try:
+            while True:
+                job = await get_job_by_id_async(db, job_id)
+                if job is None:
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job Not Found")
+                remaining = deadline - asyncio.get_running_loop().time()
+                if finished_job_event(job) is not None or remaining <= 0:
+                    return job
+
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(self.poll_interval, remaining))
+                except asyncio.TimeoutError:
+                    pass
+                db.expire(job)
+        finally:
+            waiters = self._finished.get(job_id)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._finished[job_id]
+
+    async def start(self) -> None:
+        requeued = await asyncio.to_thread(self._requeue_interrupted)
+        if requeued:
+            logger.info(f"Resumed {requeued} jobs interrupted by the last shutdown")
+        self._tasks = [asyncio.create_task(self._work(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _requeue_interrupted(self) -> int:
+        db = SessionLocal()
+        try:
+            requeued = db.query(Job).filter(Job.status == JobStatus.RUNNING.value).update(
+                {Job.status: JobStatus.QUEUED.value, Job.run_after: None}, synchronize_session=False
+            )
+            db.commit()
+            return requeued
+        finally:
+            db.close()
+
+    async def _work(self, worker_id: int) -> None:
+        while True:
+            try:
+                # The database work of the queue runs off the event loop, it may wait for the write lock
+                job = await asyncio.to_thread(self._claim_next)
+            except Exception as e:
+                logger.warning(f"Job worker {worker_id} could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(*job)
+
+    def _claim_next(self) -> Optional[tuple]:
+        """Marks the oldest due job as running. Returns (id, kind, payload, attempts) or None."""
+        db = SessionLocal()
+        try:
+            while True:
+                job = db.query(Job).filter(
+                    Job.status == JobStatus.QUEUED.value,
+                    or_(Job.run_after.is_(None), Job.run_after <= _utcnow())
+                ).order_by(Job.id).first()
+                if job is None:
+                    return None
+                claim = (job.id, job.kind, job.payload, job.attempts + 1)
+
+                # Conditional update, another worker may have claimed it in between
+                claimed = db.query(Job).filter(
+                    Job.id == job.id, Job.status == JobStatus.QUEUED.value
+                ).update({
+                    Job.status: JobStatus.RUNNING.value,
+                    Job.attempts: Job.attempts + 1,
+                    Job.started_at: _utcnow(),
+                }, synchronize_session=False)
+                db.commit()
+                if claimed:
+                    return claim
+        finally:
+            db.close()
+
+    async def _run(self, job_id: int, kind: str, payload: dict, attempt: int) -> None:
+        handler = self._handlers.get(kind)
+        result, error, retry, retry_after = None, None, False, 0
+
+        # The handler reports its stages to this job's channel through the context
+        channel = progress_broker.open(job_id)
+        channel.emit("started", attempt=attempt)
+        token = current_progress.set(channel)
+        job_token = current_job_id.set(job_id)
+        try:
+            if handler is None:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown job kind {kind}")
+            result = await handler(payload)
+        except HTTPException as e:
+            error = str(e.detail)
+            retry = e.status_code >= 500
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            retry = True
+            # e.g. an open circuit knows when the model is worth calling again
+            retry_after = getattr(e, "retry_after", 0)
+        finally:
+            current_progress.reset(token)
+            current_job_id.reset(job_token)
+
+        final_status, delay = await asyncio.to_thread(
+            self._save_outcome, job_id, attempt, result, error, retry, retry_after
+        )
+        if final_status == JobStatus.SUCCEEDED.value:
+            self._counts["succeeded"] += 1
+            channel.emit("succeeded", result=result)
+        elif final_status == JobStatus.QUEUED.value:
+            self._counts["retried"] += 1
+            channel.emit("retrying", error=error, delay_seconds=delay)
+            logger.warning(f"Job {job_id} ({kind}) failed on attempt {attempt}, retrying in {delay:.1f}s: {error}")
+        else:
+            self._counts["failed"] += 1
+            channel.emit("failed", error=error)
+            logger.warning(f"Job {job_id} ({kind}) failed: {error}")
+
+        if final_status != JobStatus.QUEUED.value:
+            for event in self._finished.pop(job_id, ()):
+                event.set()
+
+    def _save_outcome(self, job_id: int, attempt: int, result: Optional[dict], error: Optional[str],
+                      retry: bool, retry_after: float) -> tuple:
+        """Stores how the attempt ended. Returns the job's new status and, when retried, the delay."""
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            delay = 0
+            if error is None:
+                job.status = JobStatus.SUCCEEDED.value
+                job.result = result
+                job.error = None
+                job.finished_at = _utcnow()
+            elif retry and attempt < job.max_attempts:
+                delay = max(self.backoff_seconds * 2 ** (attempt - 1), retry_after)
+                job.status = JobStatus.QUEUED.value
+                job.error = error
+                job.run_after = _utcnow() + timedelta(seconds=delay)
+            else:
+                job.status = JobStatus.FAILED.value
+                job.error = error
+                job.finished_at = _utcnow()
+            final_status = job.status
+            db.commit()
+            return final_status, delay
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {"workers": len(self._tasks), **self._counts}
+
+
+settings = get_settings()
+
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    backoff_seconds=settings.JOB_RETRY_BACKOFF_SECONDS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS
+)
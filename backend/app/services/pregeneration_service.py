@@ -0,0 +1,159 @@
+import re
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, List
+
+from app.core.config import get_settings
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def make_role_params(job_title: str, job_description: str | None, skills: List[str] | None) -> tuple:
+    """What a speculative question set depends on, normalized so equal roles compare equal."""
+    def normalize(text):
+        return re.sub(r"\s+", " ", (text or "").lower()).strip()
+    return (
+        normalize(job_title),
+        normalize(job_description),
+        tuple(sorted({normalize(skill) for skill in skills or [] if normalize(skill)})),
+    )
+
+
+class _Speculation:
+    def __init__(self, params: tuple, task: asyncio.Task):
+        self.params = params
+        self.task = task
+        self.created_at = time.monotonic()
+
+
+class QuestionPregenerator:
+    """
+    Question sets generated ahead of time, keyed by user and CV, for the
+    interview the user is expected to start next.
+
+    `start` launches the generation in the background unless the hourly
+    budget of speculative generations is spent. `take` hands the set over when
+    the interview's role matches the one it was generated for, waiting a
+    little if it is still being generated, and throws it away otherwise. A set
+    still being generated when the wait is over keeps going, for a retry.
+    Unused sets expire after `ttl_seconds`.
+    """
+
+    def __init__(self, budget_per_hour: int, ttl_seconds: float, max_sets: int):
+        self.budget_per_hour = budget_per_hour
+        self.ttl_seconds = ttl_seconds
+        self.max_sets = max_sets
+
+        self._speculations: "OrderedDict[tuple, _Speculation]" = OrderedDict()
+        self._started = deque()
+        self._stats = {
+            "started": 0, "over_budget": 0, "hits": 0, "misses": 0,
+            "discarded": 0, "expired": 0, "late": 0, "failed": 0,
+        }
+
+    def start(self, user_id: int, cv_id: int, params: tuple,
+              generate: Callable[[], Awaitable[List[dict]]]) -> bool:
+        """Starts generating a set for the user's CV. Returns False when over budget or already started."""
+        self._prune()
+        key = (user_id, cv_id)
+        existing = self._speculations.get(key)
+        if existing is not None and existing.params == params:
+            return False
+
+        now = time.monotonic()
+        while self._started and now - self._started[0] > 3600:
+            self._started.popleft()
+        if len(self._started) >= self.budget_per_hour:
+            self._stats["over_budget"] += 1
+            return False
+        self._started.append(now)
+
+        if existing is not None:
+            self._discard(key)
+        task = asyncio.create_task(generate())
+        task.add_done_callback(self._log_failure)
+        self._speculations[key] = _Speculation(params, task)
+        self._stats["started"] += 1
+
+        while len(self._speculations) > self.max_sets:
+            self._stats["expired"] += 1
+            self._discard(next(iter(self._speculations)))
+        return True
+
+    async def take(self, user_id: int, cv_id: int, params: tuple, timeout: float) -> List[dict]:
+        """
+        Returns the set generated for this user, CV and role, or an empty list.
+        The set is used once: it is removed whether it matched or not, unless
+        it was not ready within `timeout`.
+        """
+        self._prune()
+        key = (user_id, cv_id)
+        speculation = self._speculations.pop(key, None)
+        if speculation is None:
+            self._stats["misses"] += 1
+            return []
+        if speculation.params != params:
+            self._stats["discarded"] += 1
+            speculation.task.cancel()
+            return []
+
+        try:
+            questions = await asyncio.wait_for(asyncio.shield(speculation.task), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Generating the interview now is faster than waiting on a background priority call,
+            # but the set is paid for: keep it for a retry, e.g. of a start job that failed
+            self._stats["late"] += 1
+            if key not in self._speculations:
+                self._speculations[key] = speculation
+            else:
+                speculation.task.cancel()
+            return []
+        except Exception:
+            self._stats["failed"] += 1
+            return []
+
+        if not questions:
+            self._stats["failed"] += 1
+            return []
+
+        self._stats["hits"] += 1
+        return questions
+
+    def _discard(self, key: tuple) -> None:
+        speculation = self._speculations.pop(key, None)
+        if speculation is not None:
+            speculation.task.cancel()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            key for key, speculation in self._speculations.items()
+            if now - speculation.created_at > self.ttl_seconds
+        ]
+        for key in expired:
+            self._stats["expired"] += 1
+            self._discard(key)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Speculative question generation failed: {task.exception()}")
+
+    def stats(self) -> dict:
+        """Returns the speculation outcomes and the share of generated sets that were used."""
+        return {
+            "pending": len(self._speculations),
+            **self._stats,
+            "hit_rate": self._stats["hits"] / self._stats["started"] if self._stats["started"] else 0.0,
+        }
+
+
+settings = get_settings()
+
+question_pregenerator = QuestionPregenerator(
+    budget_per_hour=settings.QUESTION_PREGENERATION_BUDGET_PER_HOUR,
+    ttl_seconds=settings.QUESTION_PREGENERATION_TTL_SECONDS,
+    max_sets=settings.QUESTION_PREGENERATION_MAX_SETS
+)
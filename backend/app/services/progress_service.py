@@ -0,0 +1,143 @@
+import time
+import asyncio
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from app.core.config import get_settings
+
+TERMINAL_STAGES = ("succeeded", "failed")
+
+
+class ProgressChannel:
+    """
+    The stage events of one job. Keeps the whole history, so a client that
+    subscribes late still receives every event from the start.
+    """
+
+    def __init__(self, job_id: int, on_stage=None):
+        self.job_id = job_id
+        self.events: List[dict] = []
+        self.closed_at: Optional[float] = None
+
+        self._on_stage = on_stage
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._started = time.perf_counter()
+        self._last = self._started
+
+    def emit(self, stage: str, **data) -> None:
+        if self.closed_at is not None:
+            return
+
+        now = time.perf_counter()
+        event = {
+            "job_id": self.job_id,
+            "stage": stage,
+            "elapsed_ms": round((now - self._started) * 1000, 1),
+            "stage_ms": round((now - self._last) * 1000, 1),
+            "timestamp": time.time(),
+            **data,
+        }
+        self._last = now
+        self.events.append(event)
+        if self._on_stage:
+            self._on_stage(stage, event["stage_ms"])
+
+        if stage in TERMINAL_STAGES:
+            self.closed_at = time.monotonic()
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    async def subscribe(self, keepalive: float) -> AsyncIterator[Optional[dict]]:
+        """
+        Yields the past events, then the new ones as they happen, until the job
+        finishes. Yields None after `keepalive` seconds without an event.
+        """
+        # Snapshot and subscribe together, later events only arrive through the queue
+        queue: asyncio.Queue = asyncio.Queue()
+        history = list(self.events)
+        self._subscribers.add(queue)
+        try:
+            for event in history:
+                yield event
+            if self.closed_at is not None:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event["stage"] in TERMINAL_STAGES:
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+
+class ProgressBroker:
+    """
+    In-process registry of job progress channels. Finished channels are kept
+    for `retention_seconds` so clients can still read them, and every stage's
+    duration is aggregated for the health endpoint.
+    """
+
+    def __init__(self, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._channels: Dict[int, ProgressChannel] = {}
+        self._stage_stats = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+    def open(self, job_id: int) -> ProgressChannel:
+        """Returns the job's channel, creating it if needed."""
+        self._prune()
+        channel = self._channels.get(job_id)
+        if channel is None:
+            channel = ProgressChannel(job_id, on_stage=self._record)
+            self._channels[job_id] = channel
+        return channel
+
+    def get(self, job_id: int) -> Optional[ProgressChannel]:
+        return self._channels.get(job_id)
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, channel in self._channels.items()
+            if channel.closed_at is not None and now - channel.closed_at > self.retention_seconds
+        ]
+        for job_id in expired:
+            del self._channels[job_id]
+
+    def _record(self, stage: str, stage_ms: float) -> None:
+        stats = self._stage_stats[stage]
+        stats["count"] += 1
+        stats["total_ms"] += stage_ms
+        stats["max_ms"] = max(stats["max_ms"], stage_ms)
+
+    def stats(self) -> dict:
+        """Returns how long each stage took, on average and at most, in milliseconds."""
+        return {
+            "channels": len(self._channels),
+            "stages": {
+                stage: {
+                    "count": stats["count"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 1),
+                    "max_ms": stats["max_ms"],
+                }
+                for stage, stats in self._stage_stats.items()
+            },
+        }
+
+
+progress_broker = ProgressBroker(retention_seconds=get_settings().PROGRESS_RETENTION_SECONDS)
+
+# The channel of the job running in the current task, set by the job worker
+current_progress: ContextVar[Optional[ProgressChannel]] = ContextVar("current_progress", default=None)
+
+
+def report_progress(stage: str, **data) -> None:
+    """Emits a stage event for the job being worked, a no-op outside of jobs."""
+    channel = current_progress.get()
+    if channel is not None:
+        channel.emit(stage, **data)
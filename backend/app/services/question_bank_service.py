@@ -0,0 +1,266 @@
+import re
+import math
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import get_settings
+from app.core.db import SessionLocal
+from app.models.db_schemes import Interview, Question
+
+logger = logging.getLogger('uvicorn.error')
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset("""
+    a an and are as at be by can do does for from how i if in is it its of on or tell that the this to
+    was we what when where which who why will with would you your about describe explain give time
+""".split())
+
+# Relevance added to questions already asked for the same job title,
+# enough on its own to pass the default similarity
+ROLE_MATCH_BONUS = 0.4
+# At most this share of the picked questions may share a topic, or a type
+MAX_TOPIC_SHARE = 0.4
+MAX_TYPE_SHARE = 0.7
+# The vectors are rebuilt with the current idf once the bank grew by this share since the last rebuild
+REBUILD_GROWTH = 0.1
+SYNC_BATCH_SIZE = 500
+
+
+def _tokenize(text: str) -> List[str]:
+    return [
+        token.rstrip(".") for token in _TOKEN.findall((text or "").lower())
+        if token not in _STOPWORDS and len(token.rstrip(".")) > 1
+    ]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[\W_]+", " ", (text or "").lower()).strip()
+
+
+class _Entry:
+    """One distinct question of the bank, however many interviews asked it."""
+
+    def __init__(self, question: dict, terms: Counter):
+        self.question = question
+        self.terms = terms
+        self.job_titles: Set[str] = set()
+        self.user_ids: Set[int] = set()
+        self.vector: Dict[str, float] = {}
+
+
+class QuestionBank:
+    """
+    A local TF-IDF index over the questions of past interviews and their topics.
+
+    The index is kept in memory and catches up incrementally with the questions
+    table on every lookup, reading the new rows on a worker thread. `retrieve`
+    ranks the questions by cosine similarity to the role, plus a bonus for
+    those already asked for the same job title, then picks them with maximal
+    marginal relevance so they do not repeat each other, and caps how many may
+    share a topic or a type. Questions a user was already asked are never given
+    to them again.
+
+    A new question is vectorized with the idf of the moment. The idf drifts as
+    the bank grows, so every vector is rebuilt, off the event loop, each time
+    the bank grew by REBUILD_GROWTH.
+    """
+
+    def __init__(self, min_similarity: float, diversity: float,
+                 session_factory: Callable[[], Session] = SessionLocal):
+        self.min_similarity = min_similarity
+        self.diversity = diversity
+        self._session_factory = session_factory
+
+        self._entries: List[_Entry] = []
+        self._by_key: Dict[str, int] = {}
+        self._by_title: Dict[str, Set[int]] = defaultdict(set)
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._last_question_id = 0
+        self._rebuilt_at_size = 0
+        self._sync_lock = None
+        self._stats = {"lookups": 0, "hits": 0, "served": 0, "requested": 0, "vector_rebuilds": 0}
+
+    async def sync(self) -> int:
+        """Indexes the questions saved since the last sync. Returns how many were read."""
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock:
+            rows = await asyncio.to_thread(self._read_questions, self._last_question_id)
+            # The index is only changed on the event loop, where the lookups read it
+            for row in rows:
+                self._add(*row)
+            if rows:
+                self._last_question_id = rows[-1][0]
+
+            if len(self._entries) > self._rebuilt_at_size * (1 + REBUILD_GROWTH):
+                await asyncio.to_thread(self._rebuild_vectors)
+            return len(rows)
+
+    def _read_questions(self, after_id: int) -> List[tuple]:
+        """Reads the questions saved after `after_id` as plain values, on a worker thread."""
+        rows = []
+        db = self._session_factory()
+        try:
+            while True:
+                batch = db.query(Question, Interview.job_title, Interview.user_id).join(Interview).options(
+                    selectinload(Question.topics)
+                ).filter(Question.id > after_id).order_by(Question.id).limit(SYNC_BATCH_SIZE).all()
+                if not batch:
+                    return rows
+                rows.extend(
+                    (question.id, question.content, question.max_score, question.type.name,
+                     [topic.name for topic in question.topics], job_title, user_id)
+                    for question, job_title, user_id in batch
+                )
+                after_id = batch[-1][0].id
+        finally:
+            db.close()
+
+    def _add(self, question_id: int, content: str, max_score: int, question_type: str,
+             topics: List[str], job_title: str, user_id: int) -> None:
+        key = _normalize(content)
+        index = self._by_key.get(key)
+        if index is None:
+            terms = Counter(_tokenize(content))
+            # Topics say more about a question than any single word of it
+            for topic in topics:
+                terms.update(_tokenize(topic) * 2)
+            entry = _Entry(
+                question={
+                    "content": content,
+                    "max_score": max_score,
+                    "type": question_type,
+                    "topics": topics,
+                },
+                terms=terms
+            )
+            index = len(self._entries)
+            self._entries.append(entry)
+            self._by_key[key] = index
+            for term in terms:
+                self._postings[term].add(index)
+            entry.vector = self._vectorize(terms)
+
+        entry = self._entries[index]
+        title = _normalize(job_title)
+        entry.job_titles.add(title)
+        self._by_title[title].add(index)
+        entry.user_ids.add(user_id)
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self._entries)) / (1 + len(self._postings.get(term, ())))) + 1
+
+    def _vectorize(self, terms: Counter) -> Dict[str, float]:
+        vector = {term: (1 + math.log(count)) * self._idf(term) for term, count in terms.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def _rebuild_vectors(self) -> None:
+        # Each entry's vector is swapped whole, so a lookup running meanwhile reads an old or a new one
+        size = len(self._entries)
+        for entry in self._entries[:size]:
+            entry.vector = self._vectorize(entry.terms)
+        self._rebuilt_at_size = size
+        self._stats["vector_rebuilds"] += 1
+
+    @staticmethod
+    def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+    async def retrieve(self, job_title: str, n_questions: int, user_id: Optional[int] = None,
+                       job_description: str | None = None, skills: List[str] | None = None,
+                       min_similarity: float | None = None) -> List[dict]:
+        """
+        Returns up to `n_questions` past questions relevant to the role, diverse
+        and not yet asked to `user_id`, as question dicts ready to be saved.
+        """
+        self._stats["lookups"] += 1
+        self._stats["requested"] += n_questions
+        if n_questions <= 0:
+            return []
+
+        await self.sync()
+        min_similarity = self.min_similarity if min_similarity is None else min_similarity
+
+        title = _normalize(job_title)
+        query_terms = Counter(_tokenize(job_title) * 3)
+        for skill in skills or []:
+            query_terms.update(_tokenize(skill) * 2)
+        query_terms.update(_tokenize(job_description or ""))
+        query_vector = self._vectorize(query_terms)
+
+        candidates = set()
+        for term in query_vector:
+            candidates |= self._postings.get(term, set())
+        candidates |= self._by_title.get(title, set())
+
+        relevance = {}
+        for index in candidates:
+            entry = self._entries[index]
+            if user_id is not None and user_id in entry.user_ids:
+                continue
+            score = self._cosine(query_vector, entry.vector)
+            if title in entry.job_titles:
+                score += ROLE_MATCH_BONUS
+            if score >= min_similarity:
+                relevance[index] = score
+
+        picked = self._pick_diverse(relevance, n_questions)
+        if picked:
+            self._stats["hits"] += 1
+            self._stats["served"] += len(picked)
+        return [dict(self._entries[index].question) for index in picked]
+
+    def _pick_diverse(self, relevance: Dict[int, float], n_questions: int) -> List[int]:
+        """Maximal marginal relevance under the topic and type caps."""
+        max_per_topic = max(1, math.ceil(n_questions * MAX_TOPIC_SHARE))
+        max_per_type = max(1, math.ceil(n_questions * MAX_TYPE_SHARE))
+        topic_counts, type_counts = Counter(), Counter()
+        picked: List[int] = []
+        remaining = dict(relevance)
+
+        while remaining and len(picked) < n_questions:
+            best, best_score = None, -math.inf
+            for index, score in remaining.items():
+                entry = self._entries[index]
+                if type_counts[entry.question["type"]] >= max_per_type or any(
+                    topic_counts[topic] >= max_per_topic for topic in entry.question["topics"]
+                ):
+                    continue
+                redundancy = max(
+                    (self._cosine(entry.vector, self._entries[other].vector) for other in picked), default=0.0
+                )
+                mmr = self.diversity * score - (1 - self.diversity) * redundancy
+                if mmr > best_score:
+                    best, best_score = index, mmr
+            if best is None:
+                break
+
+            picked.append(best)
+            del remaining[best]
+            question = self._entries[best].question
+            type_counts[question["type"]] += 1
+            topic_counts.update(question["topics"])
+        return picked
+
+    def stats(self) -> dict:
+        """Returns the bank size and how many of the requested questions it served."""
+        return {
+            "questions": len(self._entries),
+            **self._stats,
+            "fill_rate": self._stats["served"] / self._stats["requested"] if self._stats["requested"] else 0.0,
+        }
+
+
+settings = get_settings()
+
+question_bank = QuestionBank(
+    min_similarity=settings.QUESTION_BANK_MIN_SIMILARITY,
+    diversity=settings.QUESTION_BANK_DIVERSITY
+)
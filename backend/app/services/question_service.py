@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from app.models.db_schemes import Question
 
@@ -20,3 +22,24 @@ def get_questions_by_interview_id(db: Session, interview_id: int) -> List[Questi
         Question.interview_id == interview_id,
         Question.answer != None
     ).order_by(Question.order).all()    
+
+
+async def get_next_unanswered_question_async(db: AsyncSession, interview_id: int) -> Question | None:
+    result = await db.execute(
+        select(Question).options(
+            selectinload(Question.topics), selectinload(Question.answer)
+        ).where(
+            Question.interview_id == interview_id,
+            Question.answer == None
+        ).order_by(Question.order).limit(1)
+    )
+    return result.scalars().first()
+
+async def get_question_by_id_async(db: AsyncSession, question_id: int, interview_id: int) -> Question | None:
+    result = await db.execute(
+        select(Question).options(selectinload(Question.answer)).where(
+            Question.interview_id == interview_id,
+            Question.id == question_id
+        )
+    )
+    return result.scalars().first()
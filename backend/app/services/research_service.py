@@ -0,0 +1,63 @@
+import re
+import json
+import time
+import hashlib
+
+from app.core.config import get_settings
+from app.integrations.google_adk.agents import researcher_agent
+from app.integrations.google_adk.cache import ResponseCache
+from app.integrations.google_adk.client import run_agent
+
+settings = get_settings()
+
+# Research depends on the role only, so it is shared by every candidate
+research_cache = ResponseCache(
+    memory_size=settings.RESEARCH_CACHE_MEMORY_SIZE,
+    db_path=settings.AGENT_CACHE_DB_PATH,
+    table="research_context"
+)
+
+
+def make_research_key(job_title: str, job_description: str | None) -> str:
+    """Keys the research by the normalized job title and a hash of the description."""
+    normalized_title = re.sub(r"\s+", " ", job_title.lower()).strip()
+    normalized_description = re.sub(r"\s+", " ", (job_description or "").lower()).strip()
+    description_hash = hashlib.sha256(normalized_description.encode("utf-8")).hexdigest()
+    return hashlib.sha256(json.dumps([normalized_title, description_hash]).encode("utf-8")).hexdigest()
+
+
+async def get_research_context(job_title: str, job_description: str | None, user_id: int) -> str:
+    """
+    Returns the research summary for a role, running `researcher_agent` and its
+    `google_search` tool only when the role is not in the cache yet.
+    """
+    key = make_research_key(job_title, job_description)
+
+    cached_research = await research_cache.get(key, researcher_agent.name)
+    if cached_research is not None:
+        return cached_research
+
+    research_prompt = f"""
+        Research interview questions for the following role:
+
+        - Job Title: {job_title}
+        - Job Description: "{job_description}"
+        """
+
+    started = time.perf_counter()
+    research = await run_agent(agent=researcher_agent, query=research_prompt, user_id=user_id)
+
+    if research:
+        await research_cache.set(
+            key,
+            researcher_agent.name,
+            research,
+            ttl=settings.RESEARCH_CACHE_TTL_SECONDS,
+            elapsed=time.perf_counter() - started
+        )
+    return research
+
+
+def research_stats() -> dict:
+    """Returns the research cache hit rate and the time it saved."""
+    return research_cache.stats()
@@ -0,0 +1,71 @@
+import re
+import json
+from typing import Any, Iterable, List
+
+from app.models.db_schemes import Answer, Question
+
+
+def _clean_text(text: str | None) -> str | None:
+    """Collapses whitespace runs, which cost tokens and carry no meaning for the model."""
+    if text is None:
+        return None
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _compact_number(value: float | None) -> float | int | None:
+    """Drops the `.0` of whole numbers, e.g. max scores stored as floats."""
+    if value is not None and float(value).is_integer():
+        return int(value)
+    return value
+
+
+def _type_name(question: Question) -> str | None:
+    question_type = question.type
+    return getattr(question_type, "value", question_type)
+
+
+def _dumps(items: List[dict]) -> str:
+    """Minified JSON: no indentation, no spaces, no escaped unicode and no null fields."""
+    return json.dumps(
+        [{key: value for key, value in item.items() if value is not None} for item in items],
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+
+
+def encode_evaluation_transcript(db_answers: Iterable[Answer]) -> str:
+    """
+    Encodes the answers to evaluate for `answer_evaluation_agent`.
+
+    Only carries what the evaluation needs: the question id to map the scores
+    back, the question, the answer, its max score and its type.
+    """
+    return _dumps([
+        {
+            "question_id": answer.question_id,
+            "question_text": _clean_text(answer.question.content),
+            "user_answer": _clean_text(answer.user_answer),
+            "max_score": _compact_number(answer.question.max_score),
+            "type": _type_name(answer.question),
+        }
+        for answer in db_answers
+    ])
+
+
+def encode_report_transcript(questions: Iterable[Question]) -> str:
+    """
+    Encodes the full interview transcript for `final_report_agent`: every
+    question in order with the answer, its score and the evaluator's feedback.
+    """
+    items: List[dict[str, Any]] = []
+    for question in sorted(questions, key=lambda q: q.order):
+        answer = question.answer
+        items.append({
+            "question": _clean_text(question.content),
+            "type": _type_name(question),
+            "max_score": _compact_number(question.max_score),
+            "answer": _clean_text(answer.user_answer) if answer else None,
+            "score": _compact_number(answer.score) if answer else None,
+            "feedback": _clean_text(answer.feedback) if answer else None,
+        })
+    return _dumps(items)
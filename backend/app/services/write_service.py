@@ -0,0 +1,153 @@
+import time
+import asyncio
+import logging
+from typing import Callable, List, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.core.db import engine
+
+logger = logging.getLogger('uvicorn.error')
+
+T = TypeVar("T")
+
+
+class WriteCoordinator:
+    """
+    The writer the request-path writes go through: answers, new interviews and
+    finished interviews with their reports. SQLite takes one writer at a time,
+    so rather than every request committing on its own and waiting for the
+    lock, writes are queued here and one task commits them in batches:
+    the writes queued while the previous batch was committing, up to
+    `max_batch`, share a transaction and a single commit. Under concurrent
+    writes, the writer can also wait `window_ms` for more to join a batch.
+
+    A write is a function of a Session that adds its rows and returns what its
+    caller needs; it runs on a worker thread, and its result or exception goes
+    back to that caller only. If a batch fails, its writes are redone in a
+    transaction each, so a bad write fails alone. Returned objects are
+    detached but keep their loaded attributes.
+
+    It is not the only writer: background work (streamed questions, answer
+    scores, jobs) commits on its own sessions and waits for the lock as usual,
+    so a write here cannot assume nothing else changed the rows it checks;
+    constraints in the schema have the last word.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], window_ms: float, max_batch: int):
+        self._session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._queue = None
+        self._task = None
+        self._stats = {"writes": 0, "failed_writes": 0, "commits": 0, "failed_batches": 0, "largest_batch": 0}
+        self._commit_seconds = 0.0
+
+    async def run(self, write: Callable[[Session], T]) -> T:
+        """Queues `write` for the next batch and returns its result once committed."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((write, future))
+        return await future
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._write_batches())
+
+    async def stop(self) -> None:
+        """Commits what is still queued, then stops the writer."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _write_batches(self) -> None:
+        last_batch_size = 0
+        while True:
+            batch = [await self._queue.get()]
+            if self.window > 0 and last_batch_size > 1:
+                # Writes are coming in concurrently, give the next ones a moment to join
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                # Callers that gave up before their write started don't get written
+                pending = [(write, future) for write, future in batch if not future.cancelled()]
+                if pending:
+                    results = await asyncio.to_thread(self._commit_batch, [write for write, _ in pending])
+                    for (_, future), (ok, value) in zip(pending, results):
+                        if future.done():
+                            continue
+                        if ok:
+                            future.set_result(value)
+                        else:
+                            future.set_exception(value)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                last_batch_size = len(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _commit_batch(self, writes: List[Callable[[Session], T]]) -> List[tuple]:
+        """Runs the writes in one transaction. Returns an (ok, result or exception) pair per write."""
+        started = time.perf_counter()
+        session = self._session_factory()
+        try:
+            results = []
+            for write in writes:
+                results.append((True, write(session)))
+                # The next write of the batch must see this one, e.g. a topic it created
+                session.flush()
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            if len(writes) == 1:
+                self._stats["failed_writes"] += 1
+                return [(False, e)]
+            self._stats["failed_batches"] += 1
+            logger.warning(f"A batch of {len(writes)} writes failed, writing them one by one: {e}")
+            results = None
+        finally:
+            session.close()
+
+        if results is None:
+            return [self._commit_batch([write])[0] for write in writes]
+
+        self._stats["writes"] += len(writes)
+        self._stats["commits"] += 1
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], len(writes))
+        self._commit_seconds += time.perf_counter() - started
+        return results
+
+    def stats(self) -> dict:
+        """Returns the write and commit counters, with the average batch size and commit time."""
+        commits = self._stats["commits"]
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            **self._stats,
+            "avg_batch_size": self._stats["writes"] / commits if commits else 0.0,
+            "avg_commit_ms": self._commit_seconds / commits * 1000 if commits else 0.0,
+        }
+
+
+settings = get_settings()
+
+# Objects a write returns are read by its caller after the commit
+WriterSession = sessionmaker(autoflush=False, autocommit=False, expire_on_commit=False, bind=engine)
+
+write_coordinator = WriteCoordinator(
+    session_factory=WriterSession,
+    window_ms=settings.GROUP_COMMIT_WINDOW_MS,
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH
+)
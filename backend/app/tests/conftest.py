@@ -1,6 +1,9 @@
+import pytest
 import pytest_asyncio
 import httpx
+from contextlib import contextmanager
 from typing import AsyncGenerator, Dict
+from sqlalchemy import event
 from app.main import app 
 
 # This dictionary will act as a simple in-memory cache to share data between tests
@@ -28,3 +31,25 @@ def test_user_payload() -> Dict:
         "email": f"testuser_{timestamp}@example.com",
         "name": "Test User"
     }
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Counts the SQL statements an engine runs, used as
+    `with count_queries(engine) as counter:`, the count ends up in `counter["queries"]`.
+    """
+    @contextmanager
+    def counting(engine):
+        counter = {"queries": 0}
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            counter["queries"] += 1
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+    return counting
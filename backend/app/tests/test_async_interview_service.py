@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.db_schemes import Base, User, Cv, Interview, Question, Answer
+from app.models.enums.InterviewEnums import InterviewMode, InterviewStatus
+from app.models.enums.QuestionEnums import QuestionType
+from app.schemes.answers_schemes import AnswerCreate
+from app.services import async_interview_service, interview_service
+from app.services.async_interview_service import AsyncInterviewService
+from app.services.write_service import WriteCoordinator
+
+
+@pytest.mark.asyncio
+async def test_answering_an_interview_through_the_async_service(tmp_path, monkeypatch):
+    """
+    Each question should be served in order and answered once, even when
+    submitted twice at the same time, until all of them are answered.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/interviews.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    with Session() as db:
+        user = User(email="candidate@example.com", name="Candidate")
+        interview = Interview(user=user, cvs=Cv(user=user, raw_text="{}", file_path="", file_name="cv.pdf"),
+                              job_title="Backend Engineer", mode=InterviewMode.EASY)
+        for order in (1, 2):
+            interview.questions.append(Question(content=f"Question {order}", order=order,
+                                                type=QuestionType.TECHNICAL, max_score=10))
+        db.add(interview)
+        db.commit()
+        interview_id = interview.id
+        first_id, second_id = [question.id for question in interview.questions]
+
+    write_coordinator = WriteCoordinator(session_factory=Session, window_ms=0, max_batch=64)
+    monkeypatch.setattr(async_interview_service, "write_coordinator", write_coordinator)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/interviews.db")
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def next_question():
+        async with AsyncSessionLocal() as db:
+            return await AsyncInterviewService(db).get_next_question(interview_id)
+
+    async def submit(question_id):
+        async with AsyncSessionLocal() as db:
+            return await AsyncInterviewService(db).submit_answer(
+                interview_id, AnswerCreate(question_id=question_id, user_answer="I would measure first.")
+            )
+
+    try:
+        response = await next_question()
+        assert (response["question"].id, response["total_questions"]) == (first_id, 2)
+
+        answer = await submit(first_id)
+        assert answer.id is not None and answer.question_id == first_id
+        with pytest.raises(HTTPException) as conflict:
+            await submit(first_id)
+        assert conflict.value.status_code == 409
+        with pytest.raises(HTTPException) as missing:
+            await submit(second_id + 1)
+        assert missing.value.status_code == 404
+
+        assert (await next_question())["question"].id == second_id
+        # Both pass the reads, only the first write gets in
+        results = await asyncio.gather(submit(second_id), submit(second_id), return_exceptions=True)
+        assert results[0].question_id == second_id
+        assert isinstance(results[1], HTTPException) and results[1].status_code == 409
+        assert (await next_question()) == {"message": "All questions have been answered. Please finish the interview."}
+
+        with Session() as db:
+            assert db.query(Answer).count() == 2
+            db.get(Interview, interview_id).status = InterviewStatus.COMPLETED
+            db.commit()
+        with pytest.raises(HTTPException) as completed:
+            await next_question()
+        assert completed.value.status_code == 400
+    finally:
+        await write_coordinator.stop()
+        await async_engine.dispose()
+        engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_an_interview_still_being_generated_is_read_from_the_database(tmp_path, monkeypatch):
+    """
+    Whether an interview's questions are still being generated should come from
+    the interview itself, so any process can tell, wait for the next question
+    and refuse to finish it, until the generation ends or is cleared at startup.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/interviews.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    monkeypatch.setattr(interview_service, "SessionLocal", Session)
+    with Session() as db:
+        user = User(email="candidate@example.com", name="Candidate")
+        interview = Interview(user=user, cvs=Cv(user=user, raw_text="{}", file_path="", file_name="cv.pdf"),
+                              job_title="Backend Engineer", mode=InterviewMode.EASY, expected_questions=3)
+        interview.questions.append(Question(content="Question 1", order=1, type=QuestionType.TECHNICAL,
+                                            max_score=10, answer=Answer(user_answer="Answer")))
+        db.add(interview)
+        db.commit()
+        interview_id = interview.id
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/interviews.db")
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+    def save_the_next_question():
+        with Session() as db:
+            db.add(Question(interview_id=interview_id, content="Question 2", order=2,
+                            type=QuestionType.TECHNICAL, max_score=10))
+            db.commit()
+
+    try:
+        async with AsyncSessionLocal() as db:
+            assert (await AsyncInterviewService(db).get_next_question(interview_id)) == {
+                "message": "The next question is still being generated. Please try again shortly."
+            }
+        with Session() as db, pytest.raises(HTTPException) as generating:
+            await interview_service.build_interview_service(db).finish_and_generate_report(interview_id, None)
+        assert generating.value.status_code == 400
+
+        # Saved by a stream this process does not know about
+        asyncio.get_running_loop().call_later(0.2, save_the_next_question)
+        async with AsyncSessionLocal() as db:
+            response = await AsyncInterviewService(db).wait_for_next_question(interview_id)
+        assert (response["question"].content, response["total_questions"]) == ("Question 2", 3)
+
+        assert interview_service.clear_interrupted_question_streams() == 1
+        with Session() as db:
+            assert db.get(Interview, interview_id).expected_questions is None
+    finally:
+        await async_engine.dispose()
+        engine.dispose()
@@ -0,0 +1,131 @@
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+
+from app.integrations.google_adk import client
+from app.integrations.google_adk.agents import answer_evaluation_agent
+from app.integrations.google_adk.backends import FakeBackend
+from app.integrations.google_adk.breaker import CircuitBreaker, CircuitOpenError, AgentTimeoutError, HALF_OPEN
+from app.integrations.google_adk.scheduler import AgentScheduler
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = dict(failure_threshold=1, reset_seconds=0.05, default_timeout=1, timeouts={}, hedge_delays={})
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+async def open_circuit(breaker: CircuitBreaker, agent_name: str) -> None:
+    async def failing():
+        raise RuntimeError("model down")
+
+    with pytest.raises(RuntimeError):
+        await breaker.call(agent_name, failing)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(agent_name, failing)
+    await asyncio.sleep(0.06)
+
+
+@pytest.mark.asyncio
+async def test_a_cancelled_probe_lets_the_next_call_probe():
+    """
+    A half-open probe whose caller is cancelled should not keep the circuit
+    rejecting every call.
+    """
+    breaker = make_breaker()
+    await open_circuit(breaker, "agent")
+
+    async def hanging():
+        await asyncio.sleep(10)
+
+    async def answering():
+        return "response"
+
+    probe = asyncio.create_task(breaker.call("agent", hanging))
+    await asyncio.sleep(0.01)
+    assert breaker.stats()["agent"]["state"] == HALF_OPEN
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+
+    assert await breaker.call("agent", answering) == "response"
+    assert breaker.stats()["agent"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_an_abandoned_or_slow_stream_releases_its_probe(monkeypatch):
+    """
+    A streamed probe that the consumer stops reading, or that runs past the
+    agent's timeout, should not leave the circuit stuck half open.
+    """
+    breaker = make_breaker(timeouts={answer_evaluation_agent.name: 0.2})
+    monkeypatch.setattr(client, "circuit_breaker", breaker)
+    monkeypatch.setattr(client, "model_backend", FakeBackend(latency_ms=0))
+    query = '[{"question_id": 1, "max_score": 10}, {"question_id": 2, "max_score": 10}]'
+
+    await open_circuit(breaker, answer_evaluation_agent.name)
+    stream = client.stream_agent(answer_evaluation_agent, query, user_id=1)
+    await anext(stream)
+    await stream.aclose()
+    assert [chunk async for chunk in client.stream_agent(answer_evaluation_agent, query, user_id=1)]
+    assert breaker.stats()[answer_evaluation_agent.name]["calls"] == 3
+
+    monkeypatch.setattr(client, "model_backend", FakeBackend(latency_ms=2000, distribution="fixed"))
+    with pytest.raises(AgentTimeoutError):
+        async for _ in client.stream_agent(answer_evaluation_agent, query, user_id=1):
+            pass
+    assert breaker.stats()[answer_evaluation_agent.name]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_time_queued_for_a_slot_is_not_a_timeout():
+    """
+    A call that waits longer than its timeout for a scheduler slot, then gets
+    a quick answer, should succeed and not count against the circuit.
+    """
+    breaker = make_breaker(default_timeout=0.05)
+
+    @asynccontextmanager
+    async def busy_slot():
+        await asyncio.sleep(0.1)
+        yield
+
+    async def answering():
+        return "response"
+
+    assert await breaker.call("agent", answering, admission=busy_slot) == "response"
+    assert breaker.stats()["agent"]["timeouts"] == 0
+    assert breaker.stats()["agent"]["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_a_hedge_needs_a_free_slot_of_its_own():
+    """
+    A hedge should only run on a slot that is free right away, skipped
+    otherwise, and give its slot back however it ends.
+    """
+    breaker = make_breaker(hedge_delays={"agent": 0.01})
+    scheduler = AgentScheduler(max_concurrency=2)
+    attempts = 0
+
+    async def slow():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def call():
+        return await breaker.call(
+            "agent", slow,
+            admission=lambda: scheduler.slot("agent"),
+            hedge_admission=lambda: scheduler.try_slot("agent")
+        )
+
+    assert await call() == "response"
+    assert (attempts, breaker.stats()["agent"]["hedges"]) == (2, 1)
+    assert scheduler.stats()["in_flight"] == 0
+
+    # Two calls take both slots, neither can hedge
+    attempts = 0
+    assert await asyncio.gather(call(), call()) == ["response", "response"]
+    assert (attempts, breaker.stats()["agent"]["hedges_skipped"]) == (2, 2)
+    assert scheduler.stats()["in_flight"] == 0
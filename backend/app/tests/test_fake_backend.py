@@ -0,0 +1,72 @@
+import json
+import pytest
+
+from app.integrations.google_adk.agents import (
+    question_generation_agent, answer_evaluation_agent, final_report_agent
+)
+from app.integrations.google_adk.backends import FakeBackend, FakeModelError, ModelBackend
+from app.integrations.google_adk.parsing import AgentOutputParser
+from app.schemes.answers_schemes import AnswerEvaluationAgent
+from app.schemes.questions_schemes import QuestionOutAgent
+from app.schemes.report_schemas import FinalReportOutput
+
+GENERATION_QUERY = "Job Title: Backend Engineer\nNumber of Questions to Generate: 4"
+
+
+def test_a_backend_must_implement_run():
+    class Incomplete(ModelBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.asyncio
+async def test_responses_are_schema_valid_and_deterministic():
+    """
+    The same seed, agent and query should give the same response, one that
+    the agent's output schema accepts.
+    """
+    backend = FakeBackend(latency_ms=0, seed=7)
+
+    questions = await backend.run(question_generation_agent, GENERATION_QUERY, user_id="1")
+    assert questions == await FakeBackend(latency_ms=0, seed=7).run(
+        question_generation_agent, GENERATION_QUERY, user_id="1"
+    )
+    assert len(QuestionOutAgent.model_validate_json(questions).questions) == 4
+
+    transcript = json.dumps([{"question_id": 3, "max_score": 5}, {"question_id": 4, "max_score": 10}])
+    evaluations = AnswerEvaluationAgent.model_validate_json(
+        await backend.run(answer_evaluation_agent, transcript, user_id="1")
+    )
+    assert [answer.question_id for answer in evaluations.answers] == [3, 4]
+    assert evaluations.answers[0].score <= 5
+
+    FinalReportOutput.model_validate_json(await backend.run(final_report_agent, "User Name: Sam", user_id="1"))
+    assert backend.stats()["calls"] == {"GeneratorAgent": 1, "answer_evaluation_agent": 1, "final_report_agent": 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_the_run_response_in_chunks():
+    backend = FakeBackend(latency_ms=0, seed=7)
+
+    chunks = [chunk async for chunk in backend.stream(question_generation_agent, GENERATION_QUERY, user_id="1")]
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == await backend.run(question_generation_agent, GENERATION_QUERY, user_id="1")
+
+
+@pytest.mark.asyncio
+async def test_errors_and_malformed_responses_are_simulated():
+    failing = FakeBackend(latency_ms=0, error_rate=1.0)
+    with pytest.raises(FakeModelError):
+        await failing.run(question_generation_agent, GENERATION_QUERY, user_id="1")
+    assert failing.stats()["errors"] == {"GeneratorAgent": 1}
+
+    # Fenced or truncated output, which the output parser still gets the questions out of
+    malformed = await FakeBackend(latency_ms=0, malformed_rate=1.0).run(
+        question_generation_agent, GENERATION_QUERY, user_id="1"
+    )
+    with pytest.raises(ValueError):
+        QuestionOutAgent.model_validate_json(malformed)
+    assert AgentOutputParser().parse(question_generation_agent.name, malformed, QuestionOutAgent).questions
@@ -0,0 +1,178 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.db_schemes import Base, Job, User, Cv, Interview
+from app.models.enums.InterviewEnums import InterviewMode
+from app.models.enums.JobEnums import JobKind, JobStatus
+from app.services import job_service, interview_service
+from app.services.job_service import JobQueue, current_job_id
+
+
+@pytest.fixture
+def Session(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/jobs.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, bind=engine)
+    # The workers open their own sessions
+    monkeypatch.setattr(job_service, "SessionLocal", Session)
+    yield Session
+    engine.dispose()
+
+
+@pytest.fixture
+def job_queue():
+    job_queue = JobQueue(workers=1, max_attempts=3, backoff_seconds=0, poll_interval=0.01)
+
+    @job_queue.handler("echo")
+    async def echo(payload: dict) -> dict:
+        return payload
+
+    calls = []
+
+    @job_queue.handler("flaky")
+    async def flaky(payload: dict) -> dict:
+        # Fails on the first attempt, then succeeds
+        calls.append(payload)
+        if len(calls) == 1:
+            raise RuntimeError("model down")
+        return {"ok": True}
+
+    @job_queue.handler("invalid")
+    async def invalid(payload: dict) -> dict:
+        raise HTTPException(status_code=404, detail="Interview Not Found")
+
+    return job_queue
+
+
+async def work_one(job_queue: JobQueue):
+    """Claims and runs the next due job, like a worker would."""
+    job = await asyncio.to_thread(job_queue._claim_next)
+    assert job is not None
+    await job_queue._run(*job)
+
+
+def test_enqueue_and_claim(Session, job_queue):
+    """
+    A job should be stored as queued, and be claimed once, oldest first.
+    """
+    with Session() as db:
+        first = job_queue.enqueue(db, kind="echo", payload={"n": 1})
+        second = job_queue.enqueue(db, kind="echo", payload={"n": 2})
+        assert (first.status, first.attempts, first.max_attempts) == (JobStatus.QUEUED, 0, 3)
+        with pytest.raises(ValueError):
+            job_queue.enqueue(db, kind="unknown", payload={})
+
+        assert job_queue._claim_next() == (first.id, "echo", {"n": 1}, 1)
+        assert job_queue._claim_next() == (second.id, "echo", {"n": 2}, 1)
+        assert job_queue._claim_next() is None
+
+        db.refresh(first)
+        assert first.status == JobStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_but_client_errors_are_not(Session, job_queue):
+    with Session() as db:
+        invalid_id = job_queue.enqueue(db, kind="invalid", payload={}).id
+        flaky_id = job_queue.enqueue(db, kind="flaky", payload={}).id
+
+    await work_one(job_queue)
+    with Session() as db:
+        job = db.get(Job, invalid_id)
+        assert (job.status, job.attempts, job.error) == (JobStatus.FAILED, 1, "Interview Not Found")
+
+    await work_one(job_queue)
+    with Session() as db:
+        job = db.get(Job, flaky_id)
+        assert (job.status, job.attempts, job.error) == (JobStatus.QUEUED, 1, "RuntimeError: model down")
+
+    await work_one(job_queue)
+    with Session() as db:
+        job = db.get(Job, flaky_id)
+        assert (job.status, job.attempts, job.result) == (JobStatus.SUCCEEDED, 2, {"ok": True})
+    assert job_queue.stats()["retried"] == 1
+
+
+def test_interrupted_jobs_are_requeued(Session, job_queue):
+    """
+    Jobs left running by a process that stopped should be queued again.
+    """
+    with Session() as db:
+        job_id = job_queue.enqueue(db, kind="echo", payload={}).id
+    job_queue._claim_next()
+
+    assert job_queue._requeue_interrupted() == 1
+    assert job_queue._claim_next() == (job_id, "echo", {}, 2)
+
+
+@pytest.mark.asyncio
+async def test_wait_sees_jobs_finished_elsewhere_and_forgets_the_job_when_it_gives_up(Session, job_queue, tmp_path):
+    """
+    A job finished by another process should end the wait on the next poll,
+    and a wait that times out should leave nothing behind.
+    """
+    with Session() as db:
+        waiting_id = job_queue.enqueue(db, kind="echo", payload={"n": 1}).id
+        finished_id = job_queue.enqueue(db, kind="echo", payload={"n": 2}).id
+
+    def finish_elsewhere():
+        with Session() as db:
+            db.get(Job, finished_id).status = JobStatus.SUCCEEDED.value
+            db.commit()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/jobs.db")
+    try:
+        async with async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)() as db:
+            assert (await job_queue.wait(db, waiting_id, timeout=0.01)).status == JobStatus.QUEUED
+
+            asyncio.get_running_loop().call_later(0.05, finish_elsewhere)
+            assert (await job_queue.wait(db, finished_id, timeout=5)).status == JobStatus.SUCCEEDED
+    finally:
+        await async_engine.dispose()
+    assert job_queue._finished == {}
+
+
+@pytest.mark.asyncio
+async def test_a_retried_start_job_returns_the_interview_it_already_saved(Session, monkeypatch):
+    """
+    A start job that saved its interview but did not finish, e.g. the process
+    stopped, should return that interview on its next attempt.
+    """
+    monkeypatch.setattr(interview_service, "SessionLocal", Session)
+    with Session() as db:
+        user = User(email="user@example.com", name="User")
+        interview = Interview(user=user, cvs=Cv(user=user, raw_text="{}", file_path="", file_name="cv.pdf"),
+                              job_title="Backend Engineer", mode=InterviewMode.EASY)
+        db.add(interview)
+        db.flush()
+        job = Job(kind=JobKind.START_INTERVIEW.value, payload={}, status=JobStatus.RUNNING.value,
+                  attempts=1, max_attempts=3, result={"interview_id": interview.id})
+        db.add(job)
+        db.commit()
+        interview_id, job_id = interview.id, job.id
+
+    token = current_job_id.set(job_id)
+    try:
+        # An empty payload would fail validation if the job started over
+        assert await interview_service.start_interview_job({}) == {"interview_id": interview_id}
+    finally:
+        current_job_id.reset(token)
+
+
+def test_enqueue_once_returns_the_active_job(Session, job_queue):
+    """
+    A job that is still queued or running should be returned instead of a
+    duplicate, a finished one should not.
+    """
+    with Session() as db:
+        first = job_queue.enqueue_once(db, kind="echo", payload={"interview_id": 1})
+        assert job_queue.enqueue_once(db, kind="echo", payload={"interview_id": 1}).id == first.id
+        assert job_queue.enqueue_once(db, kind="echo", payload={"interview_id": 2}).id != first.id
+
+        first.status = JobStatus.SUCCEEDED.value
+        db.commit()
+        assert job_queue.enqueue_once(db, kind="echo", payload={"interview_id": 1}).id != first.id
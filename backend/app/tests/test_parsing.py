@@ -0,0 +1,49 @@
+import json
+import pytest
+
+from app.integrations.google_adk.parsing import (
+    AgentOutputParser, AgentOutputError, JsonArrayStreamParser, repair_json
+)
+from app.schemes.questions_schemes import QuestionOutAgent
+
+QUESTION = {"content": "How do you profile a slow endpoint?", "max_score": 8, "type": "technical", "topics": ["Python"]}
+
+
+def test_stream_parser_yields_items_as_they_complete():
+    """
+    Each question should come out of the stream as soon as its object is closed.
+    """
+    text = json.dumps({"questions": [QUESTION, QUESTION]})
+    parser = JsonArrayStreamParser()
+
+    first = parser.feed(text[:len(text) // 2 + 20])
+    rest = parser.feed(text[len(text) // 2 + 20:])
+
+    assert first == [QUESTION]
+    assert rest == [QUESTION]
+
+
+def test_truncated_json_is_closed():
+    assert json.loads(repair_json('{"a": [1, 2, {"b": "xy')) == {"a": [1, 2, {"b": "xy"}]}
+    assert json.loads(repair_json('{"a": [1, 2,], "c": tr')) == {"a": [1, 2]}
+
+
+def test_fenced_and_truncated_outputs_are_saved():
+    """
+    Fenced output should be repaired and truncated output should keep its complete items.
+    """
+    output_parser = AgentOutputParser()
+    complete = json.dumps({"questions": [QUESTION, QUESTION]})
+
+    fenced = output_parser.parse("agent", f"```json\n{complete}\n```", QuestionOutAgent)
+    truncated = output_parser.parse("agent", complete[:-40], QuestionOutAgent)
+
+    assert len(fenced.questions) == 2
+    assert len(truncated.questions) == 1
+    assert truncated.questions[0].type == "TECHNICAL"
+
+    with pytest.raises(AgentOutputError):
+        output_parser.parse("agent", "Sorry, I cannot help with that.", QuestionOutAgent)
+
+    stats = output_parser.stats()["agent"]
+    assert (stats["repaired"], stats["salvaged"], stats["failed"]) == (1, 1, 1)
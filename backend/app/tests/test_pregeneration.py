@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+
+from app.services.pregeneration_service import QuestionPregenerator, make_role_params
+
+QUESTIONS = [{"content": "How do you profile a slow endpoint?", "max_score": 8, "type": "technical", "topics": []}]
+ROLE = make_role_params("Backend Engineer", "Build APIs.", ["Python", "SQL"])
+
+
+def generator(delay: float = 0):
+    async def generate():
+        await asyncio.sleep(delay)
+        return QUESTIONS
+    return generate
+
+
+@pytest.mark.asyncio
+async def test_a_set_for_the_same_role_is_taken_once():
+    pregenerator = QuestionPregenerator(budget_per_hour=10, ttl_seconds=60, max_sets=10)
+
+    assert pregenerator.start(1, 1, ROLE, generator())
+    # The same role compares equal however it is written
+    same_role = make_role_params(" backend  engineer", "build apis.", ["sql", "python"])
+    assert not pregenerator.start(1, 1, same_role, generator())
+
+    assert await pregenerator.take(1, 1, same_role, timeout=1) == QUESTIONS
+    assert await pregenerator.take(1, 1, same_role, timeout=1) == []
+    assert (pregenerator.stats()["hits"], pregenerator.stats()["misses"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_a_set_for_another_role_is_discarded():
+    pregenerator = QuestionPregenerator(budget_per_hour=10, ttl_seconds=60, max_sets=10)
+    pregenerator.start(1, 1, ROLE, generator(delay=1))
+    task = pregenerator._speculations[(1, 1)].task
+
+    assert await pregenerator.take(1, 1, make_role_params("Data Engineer", None, None), timeout=1) == []
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert pregenerator.stats()["discarded"] == 1
+    assert pregenerator.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_starts_over_the_hourly_budget_are_refused():
+    pregenerator = QuestionPregenerator(budget_per_hour=2, ttl_seconds=60, max_sets=10)
+
+    assert [pregenerator.start(user_id, 1, ROLE, generator()) for user_id in (1, 2, 3)] == [True, True, False]
+    assert pregenerator.stats()["over_budget"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unused_sets_expire():
+    pregenerator = QuestionPregenerator(budget_per_hour=10, ttl_seconds=0.05, max_sets=10)
+    pregenerator.start(1, 1, ROLE, generator())
+    await asyncio.sleep(0.1)
+
+    assert await pregenerator.take(1, 1, ROLE, timeout=1) == []
+    assert pregenerator.stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_a_late_set_is_kept_for_a_retry():
+    """
+    A set still being generated when the interview starts should keep going,
+    and be handed to the next start for the same role.
+    """
+    pregenerator = QuestionPregenerator(budget_per_hour=10, ttl_seconds=60, max_sets=10)
+    pregenerator.start(1, 1, ROLE, generator(delay=0.1))
+
+    assert await pregenerator.take(1, 1, ROLE, timeout=0.01) == []
+    assert await pregenerator.take(1, 1, ROLE, timeout=1) == QUESTIONS
+    assert (pregenerator.stats()["late"], pregenerator.stats()["hits"]) == (1, 1)
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.db_schemes import Base, User, Cv, Interview, Question, Answer, Report, Topic
+from app.models.enums.InterviewEnums import InterviewMode
+from app.models.enums.QuestionEnums import QuestionType
+from app.schemes.interview_schemes import InterviewOut
+from app.services.interview_service import build_interview_service
+from app.services.async_interview_service import AsyncInterviewService
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = f"{tmp_path}/queries.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    # A user with a one-question interview, another with five ten-question interviews
+    topics = [Topic(name="sql"), Topic(name="python"), Topic(name="teamwork")]
+    for email, n_interviews, n_questions in [("small@example.com", 1, 1), ("large@example.com", 5, 10)]:
+        user = User(email=email, name=email)
+        cv = Cv(user=user, raw_text="{}", file_path="", file_name="cv.pdf")
+        for _ in range(n_interviews):
+            report = Report(content="Report", file_path="", strengths=[], areas_for_improvement=[])
+            interview = Interview(user=user, cvs=cv, job_title="Backend Engineer", mode=InterviewMode.HARD,
+                                  status="COMPLETED", report=report)
+            for order in range(1, n_questions + 1):
+                interview.questions.append(Question(
+                    content=f"Question {order}", order=order, type=QuestionType.TECHNICAL, max_score=10,
+                    topics=topics[order % 3:], answer=Answer(user_answer="Answer", score=7)
+                ))
+            session.add(interview)
+    session.commit()
+    session.close()
+    engine.dispose()
+    return path
+
+
+def interview_ids(engine, email):
+    with sessionmaker(bind=engine)() as session:
+        user = session.query(User).filter(User.email == email).one()
+        return user.id, [interview.id for interview in session.query(Interview).filter(Interview.user_id == user.id)]
+
+
+def test_interview_serialization_query_count_does_not_grow_with_its_size(db_path, count_queries):
+    """
+    Serializing an interview, or a user's interviews, should take as many
+    queries for five ten-question interviews as for a single one-question one.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    Session = sessionmaker(autoflush=False, bind=engine)
+
+    counts = {}
+    for email in ("small@example.com", "large@example.com"):
+        user_id, ids = interview_ids(engine, email)
+        with Session() as session, count_queries(engine) as get_one:
+            InterviewOut.model_validate(build_interview_service(session).get_interview_by_id(ids[0]))
+        with Session() as session, count_queries(engine) as get_all:
+            interviews = build_interview_service(session).get_all_interviews_for_user(user_id)
+            assert len([InterviewOut.model_validate(interview) for interview in interviews]) == len(ids)
+        counts[email] = (get_one["queries"], get_all["queries"])
+
+    assert counts["large@example.com"] == counts["small@example.com"]
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_interview_serialization_query_count_does_not_grow_with_its_size(db_path, count_queries):
+    """
+    The same holds for the async service behind the v2 read routes.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Session = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+    counts = {}
+    try:
+        for email in ("small@example.com", "large@example.com"):
+            user_id, ids = interview_ids(engine, email)
+            async with Session() as session:
+                with count_queries(async_engine.sync_engine) as get_one:
+                    InterviewOut.model_validate(await AsyncInterviewService(session).get_interview_by_id(ids[0]))
+            async with Session() as session:
+                with count_queries(async_engine.sync_engine) as get_all:
+                    interviews = await AsyncInterviewService(session).get_all_interviews_for_user(user_id)
+                    assert len([InterviewOut.model_validate(interview) for interview in interviews]) == len(ids)
+            counts[email] = (get_one["queries"], get_all["queries"])
+    finally:
+        engine.dispose()
+        # aiosqlite connections run on their own threads, which would keep the test run alive
+        await async_engine.dispose()
+
+    assert counts["large@example.com"] == counts["small@example.com"]
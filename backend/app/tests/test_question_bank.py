@@ -0,0 +1,170 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.models.db_schemes import Base, User, Cv, Interview, Question, Topic
+from app.models.enums.InterviewEnums import InterviewMode
+from app.models.enums.QuestionEnums import QuestionType
+from app.schemes.interview_schemes import InterviewCreate
+from app.services import interview_service
+from app.services.interview_service import build_interview_service
+from app.services.question_bank_service import QuestionBank
+
+
+@pytest.fixture
+def Session(tmp_path):
+    # The bank reads on a worker thread, which an in-memory database would not be shared with
+    engine = create_engine(f"sqlite:///{tmp_path}/bank.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(Session):
+    session = Session()
+    yield session
+    session.close()
+
+
+def add_interview(db, user, job_title, questions):
+    interview = Interview(user_id=user.id, cv_id=1, job_title=job_title, mode=list(InterviewMode)[0])
+    db.add(interview)
+    db.flush()
+    for order, (content, topic_name, question_type) in enumerate(questions, start=1):
+        topic = db.query(Topic).filter(Topic.name == topic_name).first() or Topic(name=topic_name)
+        db.add(Question(interview_id=interview.id, content=content, order=order,
+                        type=question_type, max_score=10, topics=[topic]))
+    db.commit()
+
+
+@pytest.mark.asyncio
+async def test_retrieves_relevant_diverse_questions_not_asked_to_the_user(db, Session):
+    """
+    Questions for the role should come back without near duplicates, capped
+    per topic, and never to the user who was already asked them.
+    """
+    alice, bob = User(email="alice@example.com"), User(email="bob@example.com")
+    db.add_all([alice, bob])
+    db.commit()
+
+    add_interview(db, alice, "Backend Engineer", [
+        ("How do you index a slow SQL query?", "SQL", QuestionType.TECHNICAL),
+        ("How do you index a slow SQL query in Postgres?", "SQL", QuestionType.TECHNICAL),
+        ("How do you find which SQL query is slow?", "SQL", QuestionType.TECHNICAL),
+        ("How do you design a REST API for Python services?", "Python", QuestionType.TECHNICAL),
+        ("Describe a conflict with a teammate.", "Teamwork", QuestionType.BEHAVIORAL),
+    ])
+    add_interview(db, alice, "Pastry Chef", [
+        ("How do you temper chocolate?", "Baking", QuestionType.TECHNICAL),
+    ])
+
+    question_bank = QuestionBank(min_similarity=0.35, diversity=0.7, session_factory=Session)
+    questions = await question_bank.retrieve(
+        job_title="Backend Engineer", n_questions=3, user_id=bob.id, skills=["SQL", "Python"]
+    )
+
+    contents = [question["content"] for question in questions]
+    assert len(contents) == 3
+    assert "How do you temper chocolate?" not in contents
+    assert sum(question["topics"] == ["SQL"] for question in questions) <= 2
+    assert not {"How do you index a slow SQL query?", "How do you index a slow SQL query in Postgres?"} <= set(contents)
+
+    assert await question_bank.retrieve(job_title="Backend Engineer", n_questions=3, user_id=alice.id) == []
+
+    # New interviews are picked up incrementally
+    add_interview(db, bob, "Pastry Chef", [("How do you laminate dough?", "Pastry", QuestionType.TECHNICAL)])
+    chef_questions = await question_bank.retrieve(job_title="Pastry Chef", n_questions=2, user_id=None)
+    assert {question["content"] for question in chef_questions} == {
+        "How do you temper chocolate?", "How do you laminate dough?"
+    }
+
+
+@pytest.mark.asyncio
+async def test_vectors_are_rebuilt_only_as_the_bank_grows(db, Session):
+    """
+    New questions are vectorized as they come in, and every vector is rebuilt
+    with the current idf once the bank grew by a tenth.
+    """
+    user = User(email="alice@example.com")
+    db.add(user)
+    db.commit()
+    add_interview(db, user, "Backend Engineer", [
+        (f"How would you scale service number {i}?", "Scaling", QuestionType.TECHNICAL) for i in range(20)
+    ])
+
+    question_bank = QuestionBank(min_similarity=0.35, diversity=0.7, session_factory=Session)
+    assert await question_bank.sync() == 20
+    assert question_bank.stats()["vector_rebuilds"] == 1
+
+    add_interview(db, user, "Backend Engineer", [("How do you cache reads?", "Caching", QuestionType.TECHNICAL)])
+    assert await question_bank.sync() == 1
+    assert question_bank.stats()["vector_rebuilds"] == 1
+    assert question_bank._entries[-1].vector
+
+    add_interview(db, user, "Backend Engineer", [
+        ("How do you shard writes?", "Scaling", QuestionType.TECHNICAL),
+        ("How do you roll back a deploy?", "Operations", QuestionType.TECHNICAL),
+    ])
+    await question_bank.sync()
+    assert question_bank.stats()["vector_rebuilds"] == 2
+    assert all(entry.vector == question_bank._vectorize(entry.terms) for entry in question_bank._entries)
+
+
+@pytest.mark.asyncio
+async def test_bank_questions_survive_a_generation_failure(db, monkeypatch):
+    """
+    When the model fails, the interview should keep the questions already taken
+    from the bank and only fill the rest with reused ones.
+    """
+    bank_questions = [
+        {"content": f"Bank question {i}", "max_score": 10, "type": QuestionType.TECHNICAL, "topics": []}
+        for i in range(2)
+    ]
+    reused_questions = [
+        {"content": f"Reused question {i}", "max_score": 10, "type": QuestionType.BEHAVIORAL, "topics": []}
+        for i in range(2)
+    ]
+    asked_for = []
+    saved = []
+
+    async def take_from_question_bank(interview_data, n_questions):
+        return bank_questions
+
+    async def no_pregenerated(interview_data, n_questions):
+        return []
+
+    async def prepare(question_query, user_id):
+        return None, question_query, None, None
+
+    async def generation_fails(*args, **kwargs):
+        raise RuntimeError("the model is down")
+
+    async def reuse_past_questions(interview_data, n_questions):
+        asked_for.append(n_questions)
+        return reused_questions[:n_questions]
+
+    async def save_new_interview(interview_data, questions, expected_questions=None):
+        saved.extend(questions)
+        return questions
+
+    service = build_interview_service(db)
+    monkeypatch.setattr(InterviewMode, "get_question_count", lambda mode: 4)
+    monkeypatch.setattr(service, "_validate_interview_request", lambda interview_data: Cv(id=1, raw_text="{}"))
+    monkeypatch.setattr(service, "_take_pregenerated", no_pregenerated)
+    monkeypatch.setattr(service, "_take_from_question_bank", take_from_question_bank)
+    monkeypatch.setattr(service, "_prepare_question_generation", prepare)
+    monkeypatch.setattr(service, "_generate_questions", generation_fails)
+    monkeypatch.setattr(service, "_reuse_past_questions", reuse_past_questions)
+    monkeypatch.setattr(service, "_save_new_interview", save_new_interview)
+    monkeypatch.setattr(interview_service, "get_settings", lambda: get_settings().model_copy(update={"QUESTION_STREAMING": False}))
+
+    await service.start_new_interview(InterviewCreate(
+        user_id=1, cv_id=1, job_title="Backend Engineer", mode=InterviewMode.EASY
+    ))
+
+    assert asked_for == [2]
+    assert {question["content"] for question in saved} == {
+        "Bank question 0", "Bank question 1", "Reused question 0", "Reused question 1"
+    }
@@ -0,0 +1,62 @@
+import json
+import types
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.db_schemes import Base, User, Cv, Interview
+from app.models.enums.InterviewEnums import InterviewMode
+from app.services import interview_service
+
+
+@pytest.mark.asyncio
+async def test_the_model_stream_is_closed_once_the_interview_is_full(tmp_path, monkeypatch):
+    """
+    Once the expected number of questions is saved, the rest of the model
+    output should not be read, and the interview should no longer be marked
+    as being generated.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/interviews.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    monkeypatch.setattr(interview_service, "SessionLocal", Session)
+    with Session() as db:
+        user = User(email="candidate@example.com", name="Candidate")
+        interview = Interview(user=user, cvs=Cv(user=user, raw_text="{}", file_path="", file_name="cv.pdf"),
+                              job_title="Backend Engineer", mode=InterviewMode.EASY, expected_questions=2)
+        db.add(interview)
+        db.commit()
+        interview_id = interview.id
+
+    pulled = []
+    closed = []
+
+    async def stream_agent(agent, query, user_id):
+        try:
+            yield "["
+            for i in range(5):
+                pulled.append(i)
+                question = {"content": f"Question {i}", "max_score": 10, "type": "TECHNICAL", "topics": ["sql"]}
+                yield json.dumps(question) + ("," if i < 4 else "]")
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(interview_service, "stream_agent", stream_agent)
+    stream = interview_service._QuestionStream(expected=2)
+    interview_service._question_streams[interview_id] = stream
+
+    try:
+        await interview_service._stream_questions_into_interview(
+            interview_id, stream, types.SimpleNamespace(name="generator"), query="", user_id=1, started=0.0
+        )
+
+        assert stream.saved == 2
+        assert pulled == [0, 1]
+        assert closed == [True]
+        with Session() as db:
+            saved = db.get(Interview, interview_id)
+            assert [question.content for question in saved.questions] == ["Question 0", "Question 1"]
+            assert saved.expected_questions is None
+    finally:
+        interview_service._question_streams.pop(interview_id, None)
+        engine.dispose()
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+
+from app.integrations.google_adk.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced():
+    """
+    Concurrent callers with the same key should share a single call.
+    """
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "response"
+
+    results = await asyncio.gather(*[single_flight.do("key", call) for _ in range(5)])
+
+    assert results == ["response"] * 5
+    assert calls == 1
+    assert single_flight.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    """
+    A caller that disconnects should not kill the call the others are waiting on.
+    """
+    single_flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "response"
+
+    first = asyncio.create_task(single_flight.do("key", call))
+    second = asyncio.create_task(single_flight.do("key", call))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "response"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_a_call_after_the_sole_waiter_is_cancelled_starts_over():
+    """
+    Once its only caller gives up, the call is dropped, and the next caller for
+    the same key should get a call of its own rather than the cancelled one.
+    """
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "response"
+
+    first = asyncio.create_task(single_flight.do("key", call))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert await single_flight.do("key", call) == "response"
+    assert calls == 2
+    assert single_flight.stats()["abandoned"] == 1
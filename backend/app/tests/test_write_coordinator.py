@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.db_schemes import Base, User
+from app.services.write_service import WriteCoordinator
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_a_commit_and_a_bad_write_fails_alone(tmp_path):
+    """
+    Writes queued together should be committed in one batch, and a write that
+    fails should fail only its own caller.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/writes.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    write_coordinator = WriteCoordinator(session_factory=Session, window_ms=0, max_batch=64)
+
+    def add_user(email):
+        def write(db):
+            if email == "bad@example.com":
+                raise ValueError("bad write")
+            user = User(email=email, name=email)
+            db.add(user)
+            return user
+        return write
+
+    emails = [f"user{i}@example.com" for i in range(9)] + ["bad@example.com"]
+    results = await asyncio.gather(
+        *[write_coordinator.run(add_user(email)) for email in emails], return_exceptions=True
+    )
+    await write_coordinator.stop()
+
+    assert isinstance(results[-1], ValueError)
+    assert [user.email for user in results[:-1]] == emails[:-1]
+    assert all(user.id is not None for user in results[:-1])
+
+    with Session() as db:
+        assert db.query(User).count() == 9
+
+    stats = write_coordinator.stats()
+    assert stats["failed_batches"] == 1
+    assert stats["failed_writes"] == 1
+    assert stats["writes"] == 9